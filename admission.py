@@ -0,0 +1,236 @@
+"""
+Sidekick — Admission Control
+=========================================
+Bounds how much Gemini- and scraper-backed work is in flight, so one session
+hammering "Search" cannot take the threadpool and every model's quota:
+
+  1. classify → the middleware maps each request to a route class
+                (e.g. "ai", "suggest", "search") and a session key
+  2. admit    → a request runs at once if its class, its session and the
+                process-wide total are all under their limits; bulk classes
+                may not use the last `interactive_reserve` slots of the total
+  3. queue    → otherwise it waits in a bounded queue, highest priority first
+                (interactive before bulk), up to the class's `max_wait`
+  4. shed     → a session over its own limit gets 429, a full queue or an
+                expired wait gets 503, both with a Retry-After estimated from
+                recent service times
+
+All bookkeeping happens on the event loop, so no locks are needed; counters
+can still be read from worker threads (see `busy()`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class RouteClass:
+    name: str
+    limit: int                # concurrent requests across all sessions
+    per_session: int          # concurrent requests per session
+    priority: int = 0         # lower is served first when slots free up
+    interactive: bool = True  # bulk classes leave the reserved headroom alone
+    queue_limit: int = 32     # waiters allowed for this class
+    session_queue: int = 1    # waiters allowed per session on top of per_session
+    max_wait: float = 10.0    # seconds before a queued request is shed
+
+
+class Rejected(Exception):
+    def __init__(self, status: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("rc", "session", "future", "key")
+
+    def __init__(self, rc: RouteClass, session: str, future: asyncio.Future, seq: int):
+        self.rc = rc
+        self.session = session
+        self.future = future
+        self.key = (rc.priority, seq)
+
+
+class AdmissionController:
+    def __init__(self, classes: List[RouteClass], total_limit: int, interactive_reserve: int = 0):
+        self.classes = {rc.name: rc for rc in classes}
+        self.total_limit = total_limit
+        self.interactive_reserve = interactive_reserve
+        self._total = 0
+        self._inflight: Dict[str, int] = {name: 0 for name in self.classes}
+        self._session_inflight: Dict[Tuple[str, str], int] = {}
+        self._session_waiting: Dict[Tuple[str, str], int] = {}
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._service_ewma: Dict[str, float] = {name: 1.0 for name in self.classes}
+        self._counters: Dict[str, Dict[str, int]] = {
+            name: {"admitted": 0, "queued": 0, "rejected_429": 0, "rejected_503": 0, "timed_out": 0}
+            for name in self.classes
+        }
+
+    # ── limits ───────────────────────────────
+    def _fits(self, rc: RouteClass, session: str) -> bool:
+        total_cap = self.total_limit - (0 if rc.interactive else self.interactive_reserve)
+        return (self._total < total_cap
+                and self._inflight[rc.name] < rc.limit
+                and self._session_inflight.get((rc.name, session), 0) < rc.per_session)
+
+    def _take(self, rc: RouteClass, session: str) -> None:
+        self._total += 1
+        self._inflight[rc.name] += 1
+        key = (rc.name, session)
+        self._session_inflight[key] = self._session_inflight.get(key, 0) + 1
+        self._counters[rc.name]["admitted"] += 1
+
+    def retry_after(self, rc: RouteClass) -> int:
+        queued = sum(1 for w in self._waiters if w.rc is rc)
+        estimate = self._service_ewma[rc.name] * (queued + 1) / max(rc.limit, 1)
+        return int(min(60, max(1, math.ceil(estimate))))
+
+    # ── acquire / release ────────────────────
+    async def acquire(self, name: str, session: str) -> float:
+        """Wait for a slot; returns the admission time (pass it to release). Raises Rejected."""
+        rc = self.classes[name]
+        if self._fits(rc, session):
+            self._take(rc, session)
+            return time.monotonic()
+
+        counters = self._counters[name]
+        skey = (name, session)
+        if self._session_inflight.get(skey, 0) >= rc.per_session and self._session_waiting.get(skey, 0) >= rc.session_queue:
+            counters["rejected_429"] += 1
+            raise Rejected(429, f"Too many concurrent {name} requests for this session.", self.retry_after(rc))
+        if sum(1 for w in self._waiters if w.rc is rc) >= rc.queue_limit:
+            counters["rejected_503"] += 1
+            raise Rejected(503, f"Server busy ({name}); try again shortly.", self.retry_after(rc))
+
+        waiter = _Waiter(rc, session, asyncio.get_running_loop().create_future(), next(self._seq))
+        self._waiters.append(waiter)
+        self._session_waiting[skey] = self._session_waiting.get(skey, 0) + 1
+        counters["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=rc.max_wait)
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                waiter.future.cancel()
+                counters["timed_out"] += 1
+                raise Rejected(503, f"Server busy ({name}); queued request expired.", self.retry_after(rc))
+        except asyncio.CancelledError:
+            # Client went away while queued: give the slot back if it was already handed over.
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(name, session, time.monotonic())
+            else:
+                waiter.future.cancel()
+            raise
+        finally:
+            self._forget(waiter)
+        return time.monotonic()
+
+    def try_acquire(self, name: str, session: str) -> Optional[float]:
+        """Take a slot only if one is free right now (no queueing); admission time or None."""
+        rc = self.classes[name]
+        if not self._fits(rc, session):
+            return None
+        self._take(rc, session)
+        return time.monotonic()
+
+    def release(self, name: str, session: str, admitted_at: float) -> None:
+        rc = self.classes[name]
+        self._total -= 1
+        self._inflight[name] -= 1
+        key = (name, session)
+        left = self._session_inflight.get(key, 1) - 1
+        if left > 0:
+            self._session_inflight[key] = left
+        else:
+            self._session_inflight.pop(key, None)
+        elapsed = time.monotonic() - admitted_at
+        self._service_ewma[name] = 0.8 * self._service_ewma[name] + 0.2 * elapsed
+        self._dispatch()
+
+    def _forget(self, waiter: _Waiter) -> None:
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+            skey = (waiter.rc.name, waiter.session)
+            left = self._session_waiting.get(skey, 1) - 1
+            if left > 0:
+                self._session_waiting[skey] = left
+            else:
+                self._session_waiting.pop(skey, None)
+
+    def _dispatch(self) -> None:
+        for waiter in sorted(self._waiters, key=lambda w: w.key):
+            if waiter.future.done():
+                continue
+            if self._fits(waiter.rc, waiter.session):
+                self._take(waiter.rc, waiter.session)
+                waiter.future.set_result(None)
+
+    # ── introspection ────────────────────────
+    def busy(self, name: Optional[str] = None) -> int:
+        """Requests in flight (for one class, or in total); safe to read from any thread."""
+        return self._total if name is None else self._inflight.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "total": self._total,
+            "total_limit": self.total_limit,
+            "interactive_reserve": self.interactive_reserve,
+            "classes": {
+                name: {
+                    "inflight": self._inflight[name],
+                    "waiting": sum(1 for w in self._waiters if w.rc is rc),
+                    "limit": rc.limit,
+                    "per_session": rc.per_session,
+                    "avg_service_s": round(self._service_ewma[name], 3),
+                    **self._counters[name],
+                }
+                for name, rc in self.classes.items()
+            },
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware: hold each classified request until the controller admits it.
+
+    `classify(scope)` returns (class name, session key) or None for requests
+    that are not admission-controlled. The slot is held until the response
+    (including a streamed body) has been sent.
+    """
+
+    def __init__(self, app, controller: AdmissionController,
+                 classify: Callable[[Dict[str, Any]], Optional[Tuple[str, str]]]):
+        self.app = app
+        self.controller = controller
+        self.classify = classify
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route = self.classify(scope)
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+        name, session = route
+        try:
+            admitted_at = await self.controller.acquire(name, session)
+        except Rejected as r:
+            response = JSONResponse({"detail": r.detail}, status_code=r.status,
+                                    headers={"Retry-After": str(r.retry_after)})
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(name, session, admitted_at)
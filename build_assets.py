@@ -0,0 +1,250 @@
+"""
+Sidekick — Static Asset Build
+=========================================
+Prepares the dashboard's static files for long-lived caching:
+
+  1. fingerprint → every file under static/ is copied to static/dist/ as
+                   name.<sha1:10>.ext, so its URL changes whenever its bytes do
+  2. images      → with Pillow installed: resized renditions (backgrounds at
+                   640/1280/1920 px wide, logos at 64 px tall) plus WebP and,
+                   when the Pillow build supports it, AVIF variants
+  3. precompress → .br (brotli, optional) and .gz next to every text asset
+  4. index.html  → rewritten into static/dist/index.html: /static/… references
+                   point at fingerprinted files, CSS backgrounds get an
+                   image-set() with AVIF/WebP, and window.SK_ASSETS maps
+                   original paths to optimised URLs for main.js
+  5. manifest    → static/dist/manifest.json, original path → renditions
+
+The server serves static/dist/ with immutable cache headers and picks the
+precompressed file matching Accept-Encoding. Run after editing anything in
+static/ or index.html (run.sh does this on start; unchanged inputs are skipped):
+
+    python build_assets.py [--force]
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import gzip
+import hashlib
+import io
+import json
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import quote, unquote
+
+try:
+    import brotli
+    _BROTLI_OK = True
+except ImportError:
+    _BROTLI_OK = False
+
+try:
+    from PIL import Image, features
+    _PIL_OK = True
+    _AVIF_OK = bool(features.check("avif"))
+except ImportError:
+    _PIL_OK = False
+    _AVIF_OK = False
+
+ROOT = Path(__file__).parent
+STATIC_DIR = ROOT / "static"
+DIST_DIR = STATIC_DIR / "dist"
+INDEX_HTML = ROOT / "index.html"
+URL_PREFIX = "/static/dist/"
+
+TEXT_SUFFIXES = {".js", ".css", ".html", ".svg", ".json", ".txt"}
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+# First matching rule wins; "default" is the rendition referenced from index.html.
+RESIZE_RULES = [
+    ("bg*.png", {"widths": (640, 1280, 1920), "default": 1920}),
+    ("images/logos/*", {"height": 64}),
+]
+WEBP_QUALITY = 80
+AVIF_QUALITY = 55
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()[:10]
+
+
+def _dist_name(rel: str, data: bytes, suffix: Optional[str] = None, tag: str = "") -> str:
+    p = Path(rel)
+    stem = p.stem.replace(" ", "-") + (f"-{tag}" if tag else "")
+    return (p.parent / f"{stem}.{fingerprint(data)}{suffix or p.suffix}").as_posix()
+
+
+def _emit(name: str, data: bytes) -> str:
+    """Write one dist file (plus .br/.gz for text) and return its URL."""
+    out = DIST_DIR / name
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_bytes(data)
+    if out.suffix in TEXT_SUFFIXES:
+        _precompress(out, data)
+    return URL_PREFIX + quote(name)
+
+
+def _precompress(path: Path, data: bytes) -> None:
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if _BROTLI_OK:
+        variants[".br"] = brotli.compress(data, quality=11)
+    for ext, blob in variants.items():
+        if len(blob) < len(data) * 0.9:
+            path.with_name(path.name + ext).write_bytes(blob)
+
+
+def _encode(img, fmt: str) -> bytes:
+    buf = io.BytesIO()
+    if fmt == "PNG":
+        img.save(buf, "PNG", optimize=True)
+    elif fmt == "WEBP":
+        img.save(buf, "WEBP", quality=WEBP_QUALITY, method=6)
+    else:
+        img.save(buf, "AVIF", quality=AVIF_QUALITY)
+    return buf.getvalue()
+
+
+def _renditions(img, rel: str, data: bytes, resized: bool) -> Dict[str, Any]:
+    """One entry per format for this image (already resized when `resized`)."""
+    entry = {"width": img.width, "height": img.height}
+    if rel.lower().endswith(".png"):
+        blob = _encode(img, "PNG")
+        if not resized and len(blob) >= len(data):
+            blob = data
+    else:
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, "JPEG", quality=85, optimize=True, progressive=True)
+        blob = buf.getvalue()
+    tag = f"{img.width}w"
+    entry["file"] = _emit(_dist_name(rel, blob, tag=tag), blob)
+    entry["bytes"] = len(blob)
+    webp = _encode(img, "WEBP")
+    entry["webp"] = _emit(_dist_name(rel, webp, ".webp", tag), webp)
+    if _AVIF_OK:
+        avif = _encode(img, "AVIF")
+        entry["avif"] = _emit(_dist_name(rel, avif, ".avif", tag), avif)
+    return entry
+
+
+def _build_image(rel: str, data: bytes) -> Dict[str, Any]:
+    rule = next((r for pattern, r in RESIZE_RULES if fnmatch.fnmatch(rel, pattern)), {})
+    img = Image.open(io.BytesIO(data))
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA")
+    sizes: Dict[str, Dict[str, Any]] = {}
+    if "widths" in rule:
+        for w in rule["widths"]:
+            if w < img.width:
+                resized = img.resize((w, round(img.height * w / img.width)), Image.LANCZOS)
+                sizes[str(w)] = _renditions(resized, rel, data, resized=True)
+        default = sizes.get(str(rule.get("default", 0)))
+        entry = dict(default) if default else _renditions(img, rel, data, resized=False)
+    elif "height" in rule and img.height > rule["height"]:
+        h = rule["height"]
+        entry = _renditions(img.resize((round(img.width * h / img.height), h), Image.LANCZOS), rel, data, resized=True)
+    else:
+        entry = _renditions(img, rel, data, resized=False)
+    if sizes:
+        entry["sizes"] = sizes
+    entry["original_bytes"] = len(data)
+    return entry
+
+
+def build_manifest() -> Dict[str, Dict[str, Any]]:
+    manifest: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(STATIC_DIR.rglob("*")):
+        if not path.is_file() or DIST_DIR in path.parents:
+            continue
+        rel = path.relative_to(STATIC_DIR).as_posix()
+        data = path.read_bytes()
+        if _PIL_OK and path.suffix.lower() in IMAGE_SUFFIXES:
+            manifest[rel] = _build_image(rel, data)
+        else:
+            manifest[rel] = {"file": _emit(_dist_name(rel, data), data), "bytes": len(data), "original_bytes": len(data)}
+    return manifest
+
+
+_STATIC_REF_RE = re.compile(r"/static/([^\"')\s?]+)(\?[^\"')\s]*)?")
+_BACKGROUND_RE = re.compile(r"(background-image\s*:)([^;]*url\(['\"]?/static/[^;]*);")
+
+
+def _image_set(entry: Dict[str, Any]) -> str:
+    parts = []
+    if entry.get("avif"):
+        parts.append(f'url("{entry["avif"]}") type("image/avif")')
+    if entry.get("webp"):
+        parts.append(f'url("{entry["webp"]}") type("image/webp")')
+    mime = "image/png" if entry["file"].endswith(".png") else "image/jpeg"
+    parts.append(f'url("{entry["file"]}") type("{mime}")')
+    return "image-set(" + ", ".join(parts) + ")"
+
+
+def rewrite_index(html: str, manifest: Dict[str, Dict[str, Any]]) -> str:
+    """Point /static/… references at dist files and expose the image map to main.js."""
+
+    def modern_background(m: re.Match) -> str:
+        # Plain url() first for old browsers, then an image-set() override they ignore.
+        decl = m.group(0)
+        upgraded = m.group(2)
+        for ref in _STATIC_REF_RE.finditer(m.group(2)):
+            entry = manifest.get(ref.group(1))
+            if entry and entry.get("webp"):
+                upgraded = re.sub(r"url\(['\"]?" + re.escape(ref.group(0)) + r"['\"]?\)", _image_set(entry), upgraded)
+        return decl if upgraded == m.group(2) else f"{decl}\n            {m.group(1)}{upgraded};"
+
+    html = _BACKGROUND_RE.sub(modern_background, html)
+    html = _STATIC_REF_RE.sub(lambda m: manifest[m.group(1)]["file"] if m.group(1) in manifest else m.group(0), html)
+
+    assets = {f"/static/{rel}": e.get("webp") or e["file"]
+              for rel, e in manifest.items() if Path(rel).suffix.lower() in IMAGE_SUFFIXES}
+    script = f"<script>window.SK_ASSETS = {json.dumps(assets, separators=(',', ':'))};</script>\n"
+    return html.replace("</head>", script + "</head>", 1)
+
+
+def inputs_digest() -> str:
+    """Hash of everything the build reads, so unchanged inputs can skip the (slow) image work."""
+    h = hashlib.sha1(Path(__file__).read_bytes())
+    h.update(f"pil={_PIL_OK} avif={_AVIF_OK} br={_BROTLI_OK}".encode())
+    for path in sorted([INDEX_HTML, *STATIC_DIR.rglob("*")]):
+        if path.is_file() and DIST_DIR not in path.parents:
+            h.update(path.as_posix().encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def build(force: bool = False) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Rebuild static/dist; returns the manifest, or None when the inputs are unchanged."""
+    digest = inputs_digest()
+    stamp = DIST_DIR / ".inputs"
+    if not force and stamp.is_file() and stamp.read_text() == digest:
+        return None
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    DIST_DIR.mkdir(parents=True)
+    manifest = build_manifest()
+    html = rewrite_index(INDEX_HTML.read_text(encoding="utf-8"), manifest)
+    index = DIST_DIR / "index.html"
+    index.write_text(html, encoding="utf-8")
+    _precompress(index, html.encode("utf-8"))
+    (DIST_DIR / "manifest.json").write_text(json.dumps(manifest, indent=1))
+    stamp.write_text(digest)
+    return manifest
+
+
+if __name__ == "__main__":
+    import sys
+
+    if not _PIL_OK:
+        print("Pillow not installed: images are fingerprinted but not resized or converted (pip install Pillow).")
+    manifest = build(force="--force" in sys.argv)
+    if manifest is None:
+        print(f"{DIST_DIR} is up to date (use --force to rebuild).")
+        sys.exit(0)
+    before = sum(e["original_bytes"] for e in manifest.values())
+    after = sum(e["bytes"] for e in manifest.values())
+    for rel, e in manifest.items():
+        best = e.get("webp") or e["file"]
+        size = (DIST_DIR / unquote(best[len(URL_PREFIX):])).stat().st_size
+        print(f"  {rel:<36} {e['original_bytes']:>9,} B → {size:>9,} B  {best}")
+    print(f"Built {len(manifest)} assets into {DIST_DIR} ({before:,} B originals, {after:,} B fallback renditions)")
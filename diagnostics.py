@@ -0,0 +1,166 @@
+"""
+Sidekick — Runtime Diagnostics
+=========================================
+Finds event-loop stalls and CPU hot spots in the running server without a debugger:
+
+  • StallWatchdog     → a heartbeat coroutine ticks on the event loop; a monitor
+                        thread notices when a tick is late by more than
+                        `threshold` seconds and logs the requests in flight
+                        plus the loop thread's current stack (once per stall)
+  • RequestTracker    → ASGI middleware recording which routes are executing,
+                        so a stall report names the offending handler
+  • sample_profile()  → time-boxed sampling profiler over every thread;
+                        returns collapsed stacks ("frame;frame;frame count"),
+                        the input format of flamegraph.pl / speedscope
+
+Everything is standard library (sys._current_frames); the overhead is one
+timer tick per `interval` on the loop and nothing at all while not profiling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import itertools
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Deque, Dict, List, Optional
+
+# Frames whose presence at the top of a stack means the thread is parked, not working.
+_IDLE_FUNCTIONS = {
+    "wait", "select", "poll", "epoll", "kqueue", "_worker", "get", "accept",
+    "sleep", "_wait_for_tstate_lock", "read", "readinto", "recv", "recv_into",
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+
+
+def _collapsed(frame) -> List[str]:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class StallWatchdog:
+    def __init__(self, threshold: float = 0.25, interval: float = 0.05, keep: int = 50):
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls: Deque[Dict[str, Any]] = collections.deque(maxlen=keep)
+        self._active: Dict[int, Dict[str, Any]] = {}
+        self._ids = itertools.count()
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    # ── lifecycle (call from the event loop) ──
+    def start(self) -> None:
+        if self._monitor is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._heartbeat = asyncio.get_running_loop().create_task(self._beat())
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._monitor.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        self._monitor = None
+
+    async def _beat(self) -> None:
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    # ── request tracking ──────────────────────
+    def enter(self, method: str, path: str) -> int:
+        rid = next(self._ids)
+        self._active[rid] = {"method": method, "path": path, "started": time.monotonic()}
+        return rid
+
+    def leave(self, rid: int) -> None:
+        self._active.pop(rid, None)
+
+    # ── monitor thread ────────────────────────
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            lag = time.monotonic() - beat
+            if lag < self.threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            now = time.monotonic()
+            stall = {
+                "at": time.time(),
+                "lag_ms": round(lag * 1000),
+                "routes": [f"{r['method']} {r['path']} ({(now - r['started']) * 1000:.0f} ms)"
+                           for r in list(self._active.values())],
+                "stack": traceback.format_stack(frame) if frame is not None else [],
+            }
+            self.stalls.append(stall)
+            print(f"⚠ Event loop blocked for {stall['lag_ms']} ms+ while serving: "
+                  f"{', '.join(stall['routes']) or 'no request'}\n" + "".join(stall["stack"][-12:]))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "threshold_ms": round(self.threshold * 1000),
+            "running": self._monitor is not None,
+            "current_lag_ms": round((time.monotonic() - self._last_beat) * 1000),
+            "stalls": list(self.stalls),
+        }
+
+
+class RequestTracker:
+    """ASGI middleware: register each HTTP request with the watchdog while it runs."""
+
+    def __init__(self, app, watchdog: StallWatchdog):
+        self.app = app
+        self.watchdog = watchdog
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rid = self.watchdog.enter(scope.get("method", ""), scope.get("path", ""))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.watchdog.leave(rid)
+
+
+def sample_profile(seconds: float, interval: float = 0.005, include_idle: bool = False) -> str:
+    """Sample every thread's stack for `seconds`; return collapsed stacks, hottest first.
+
+    Each line is "thread;outer_frame;...;inner_frame count". Parked threads
+    (blocked in select/wait/sleep) are skipped unless `include_idle`.
+    """
+    me = threading.get_ident()
+    counts: Dict[str, int] = collections.Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for tid, frame in sys._current_frames().items():
+            if tid == me:
+                continue
+            if not include_idle and frame.f_code.co_name in _IDLE_FUNCTIONS:
+                continue
+            stack = [names.get(tid, f"thread-{tid}")] + _collapsed(frame)
+            counts[";".join(s.replace(" ", "_") for s in stack)] += 1
+        time.sleep(interval)
+    return "".join(f"{stack} {n}\n" for stack, n in sorted(counts.items(), key=lambda kv: -kv[1]))
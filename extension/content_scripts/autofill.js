@@ -306,12 +306,8 @@ function syncApplicationLog() {
     }).catch(e => console.error("Sidekick Tracker Sync Failed", e));
 }
 
-async function runVibeCheck(profileData) {
-    if (!profileData.gemini_key) {
-        console.warn("Sidekick: No Gemini Key available for ATS Vibe Check.");
-        return;
-    }
-
+// Every AI call on a page sends the same JD text, so the server digests it once and reuses it.
+function getJobDescriptionText() {
     // Attempt to scrape job description text from common ATS container classes
     let jdText = "";
     const jdContainers = document.querySelectorAll('.job-description, .posting-requirements, [data-automation="jobDescription"]');
@@ -321,29 +317,97 @@ async function runVibeCheck(profileData) {
         // Fallback: just grab all body text and truncate it to avoid massive payload
         jdText = document.body.innerText.substring(0, 5000);
     }
+    return jdText;
+}
 
-    if (!jdText || jdText.length < 100) return;
+// Parts requested up front come back on a single NDJSON stream from /api/ai/bundle,
+// and the widget / buttons pick their part up from here. Only the analysis is
+// requested on page load; the other parts cost a Gemini call each, so they are
+// fetched when the user asks for them.
+const skBundle = { requested: new Set(), parts: {}, waiters: {} };
 
-    try {
-        // We need the session_id to properly route the request to the proxy
-        const result = await chrome.storage.local.get(["session_id"]);
-        const sid = result.session_id || "demo-session";
+function settleBundlePart(name, data) {
+    skBundle.parts[name] = data;
+    (skBundle.waiters[name] || []).forEach(resolve => resolve(data));
+    delete skBundle.waiters[name];
+}
 
-        const response = await fetch(`http://localhost:8000/api/ai/analyze-job/${sid}`, {
+function waitForBundlePart(name) {
+    if (name in skBundle.parts) return Promise.resolve(skBundle.parts[name]);
+    return new Promise(resolve => (skBundle.waiters[name] = skBundle.waiters[name] || []).push(resolve));
+}
+
+async function fetchPageBundle(sid, jdText, profileData, parts) {
+    parts.forEach(p => skBundle.requested.add(p));
+    try {
+        const response = await fetch(`http://localhost:8000/api/ai/bundle/${sid}`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                job_description: jdText,
-                profile_data: profileData
-            })
+            body: JSON.stringify({ job_description: jdText, profile_data: profileData, parts: parts })
         });
+        if (!response.ok || !response.body) throw new Error(`HTTP ${response.status}`);
 
-        if (response.ok) {
-            const analysis = await response.json();
-            injectVibeCheckWidget(analysis);
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = "";
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffered += decoder.decode(value, { stream: true });
+            let newline;
+            while ((newline = buffered.indexOf("\n")) >= 0) {
+                const line = buffered.slice(0, newline).trim();
+                buffered = buffered.slice(newline + 1);
+                if (!line) continue;
+                const msg = JSON.parse(line);
+                // A failed part carries a placeholder payload; settle it as null so the single endpoint is retried.
+                if (msg.part) settleBundlePart(msg.part, msg.ok ? msg.data : null);
+            }
         }
     } catch (e) {
-        console.error("Sidekick Vibe Check failed:", e);
+        console.error("Sidekick AI bundle failed:", e);
+    }
+    // Parts the stream never delivered resolve to null; callers then use the single endpoint.
+    parts.forEach(p => { if (!(p in skBundle.parts)) settleBundlePart(p, null); });
+}
+
+// Bundled part if this page requested it, otherwise (or if the bundle failed) the single endpoint.
+async function getAiPart(name, path, body) {
+    if (skBundle.requested.has(name)) {
+        const bundled = await waitForBundlePart(name);
+        if (bundled) return bundled;
+    }
+    const result = await chrome.storage.local.get(["session_id"]);
+    const res = await fetch(`http://localhost:8000/api/ai/${path}/${result.session_id || "demo"}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    });
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    return res.json();
+}
+
+async function runVibeCheck(profileData) {
+    if (!profileData.gemini_key) {
+        console.warn("Sidekick: No Gemini Key available for ATS Vibe Check.");
+        return;
+    }
+
+    const jdText = getJobDescriptionText();
+
+    if (!jdText || jdText.length < 100) return;
+
+    // We need the session_id to properly route the request to the proxy
+    const result = await chrome.storage.local.get(["session_id"]);
+    const sid = result.session_id || "demo-session";
+
+    fetchPageBundle(sid, jdText, profileData, ["analysis"]);
+
+    try {
+        const analysis = await getAiPart("analysis", "analyze-job", { job_description: jdText, profile_data: profileData });
+        injectVibeCheckWidget(analysis);
+    } catch (err) {
+        console.error("Sidekick: ATS Vibe Check failed:", err);
     }
 }
 
@@ -425,13 +489,7 @@ function injectVibeCheckWidget(analysis) {
         out.innerText = "Generating 5 highly probable technical questions based on the JD...";
 
         try {
-            const result = await chrome.storage.local.get(["session_id"]);
-            const res = await fetch(`http://localhost:8000/api/ai/interview-prep/${result.session_id || "demo"}`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ job_description: document.body.innerText.substring(0, 5000) })
-            });
-            const data = await res.json();
+            const data = await getAiPart("interview_prep", "interview-prep", { job_description: getJobDescriptionText() });
             out.innerHTML = data.questions.map((q, i) => `<strong style="color: #818cf8;">Q${i + 1}: ${q.question}</strong><br><span style="color:#94a3b8">${q.answer_guide}</span><br><br>`).join('');
             e.target.innerText = "Prep Interview";
         } catch (err) { out.innerText = "Error generating prep."; e.target.innerText = "Error"; }
@@ -455,17 +513,11 @@ function injectCoverLetterButton(textarea, profileData) {
         btn.innerText = "Writing...";
 
         try {
-            const result = await chrome.storage.local.get(["session_id"]);
-            const res = await fetch(`http://localhost:8000/api/ai/generate-text/${result.session_id || "demo"}`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    prompt_context: 'Cover Letter',
-                    job_description: document.body.innerText.substring(0, 5000),
-                    profile_data: profileData
-                })
+            const data = await getAiPart("cover_letter", "generate-text", {
+                prompt_context: 'Cover Letter',
+                job_description: getJobDescriptionText(),
+                profile_data: profileData
             });
-            const data = await res.json();
             textarea.value = data.text;
             triggerEvents(textarea);
             btn.innerText = "✨ Written ✨";
@@ -484,17 +536,11 @@ async function generateTextFeature(buttonEl, contextType) {
 
     try {
         const profileData = await chrome.storage.local.get(null);
-        const result = await chrome.storage.local.get(["session_id"]);
-        const res = await fetch(`http://localhost:8000/api/ai/generate-text/${result.session_id || "demo"}`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                prompt_context: contextType,
-                job_description: document.body.innerText.substring(0, 5000),
-                profile_data: profileData
-            })
+        const data = await getAiPart(contextType.toLowerCase().replace(' ', '_'), "generate-text", {
+            prompt_context: contextType,
+            job_description: getJobDescriptionText(),
+            profile_data: profileData
         });
-        const data = await res.json();
         out.innerText = data.text;
         buttonEl.innerText = `Generate ${contextType.split(' ')[1]}`;
     } catch (err) { out.innerText = "Error generating text."; buttonEl.innerText = "Error"; }
@@ -0,0 +1,346 @@
+"""
+Sidekick — Adaptive Search Fan-out Planner
+=========================================
+A live search fans out over (source × title variant) branches, and each
+branch pages deeper one fetch at a time. Instead of a fixed number of pages
+per branch, `FanoutPlanner.run()` spends a request budget where it pays:
+
+  1. history   → `YieldStats` keeps decayed per-(source, title rank, page depth)
+                 counts of fetches, raw listings, new unique listings and latency
+  2. score     → next page of a branch = expected unique jobs per fetch (+ an
+                 exploration bonus for little-seen branches), discounted by latency
+  3. dispatch  → the best-scoring branches get the free slots, one page in flight
+                 per branch, with a courtesy delay between pages of the same branch
+  4. stop      → a branch ends on an empty page, a page with too few new jobs, or
+                 history saying its next page is not worth a request; the whole run
+                 ends at the target count or when the budget is spent
+  5. probe     → a branch history rules out still gets its page with probability
+                 `probe_rate`, so a source that recovers is noticed; history also
+                 ages with wall-clock time, not just with new observations
+
+Pages served from the page cache cost no upstream request and do not count
+against the budget. Pages that say nothing about yield (errors, non-200
+responses, cached dead ends) end the branch without touching the history. `simulate_fanout.py` replays the planner offline.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import math
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# fetch_page(branch, depth) → (items, served_from_cache); items is None when the
+# page is unusable (error, non-200, cached dead end) and must not count as zero yield.
+FetchPage = Callable[["Branch", int], Tuple[Optional[List[Dict[str, Any]]], bool]]
+
+
+class Branch:
+    """One (source, title variant) pair and its progress in the current run."""
+
+    __slots__ = ("source", "title", "rank", "max_depth", "depth", "fetches", "raw", "unique",
+                 "done", "stop_reason", "ready_at")
+
+    def __init__(self, source: str, title: str, rank: int = 0, max_depth: int = 5):
+        self.source = source
+        self.title = title
+        self.rank = rank          # 0 = the user's own title, 1.. = generated variants
+        self.max_depth = max_depth
+        self.depth = 0            # next page to fetch
+        self.fetches = 0
+        self.raw = 0
+        self.unique = 0
+        self.done = False
+        self.stop_reason = ""
+        self.ready_at = 0.0
+
+    def stop(self, reason: str) -> None:
+        self.done = True
+        self.stop_reason = reason
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "title": self.title,
+            "pages": self.depth,
+            "raw": self.raw,
+            "unique": self.unique,
+            "stopped": self.stop_reason or "open",
+        }
+
+    def __repr__(self) -> str:
+        return f"Branch({self.source!r}, {self.title!r}, rank={self.rank}, depth={self.depth})"
+
+
+class YieldStats:
+    """Decayed yield/latency history per (source, title rank, page depth).
+
+    `store` is anything with `.get(key, default)` and `.update_item(key, fn, default)`
+    — a state-backend namespace in the server, so every worker shares the history.
+    Older observations are multiplied by `decay` on each new one and halve in
+    weight every `half_life` seconds, so the estimates follow sources whose
+    result volume drifts, and a key nobody fetches any more drifts back to the prior.
+    """
+
+    def __init__(
+        self,
+        store,
+        decay: float = 0.95,
+        prior_weight: float = 2.0,
+        prior_unique: float = 6.0,
+        prior_latency: float = 1.5,
+        half_life: float = 3 * 86400,
+    ):
+        self.store = store
+        self.decay = decay
+        self.half_life = half_life
+        self.prior_weight = prior_weight
+        self.prior_unique = prior_unique
+        self.prior_latency = prior_latency
+
+    @staticmethod
+    def key(source: str, rank: int, depth: int) -> str:
+        return f"{source}|t{rank}|p{depth}"
+
+    def _aged(self, s: Optional[Dict[str, float]], now: float) -> Dict[str, float]:
+        """The record with every count scaled down by the time since it was last updated."""
+        if not s:
+            return {"n": 0.0, "raw": 0.0, "unique": 0.0, "lat_n": 0.0, "lat": 0.0}
+        elapsed = max(0.0, now - s.get("updated_at", now))
+        f = 0.5 ** (elapsed / self.half_life) if self.half_life > 0 else 1.0
+        return {k: s[k] * f for k in ("n", "raw", "unique", "lat_n", "lat")}
+
+    def record(self, source: str, rank: int, depth: int, raw: int, unique: int,
+               latency: Optional[float]) -> None:
+        """Add one fetch. `latency` is None for cache hits (they say nothing about upstream speed)."""
+        d = self.decay
+
+        def add(cur):
+            now = time.time()
+            cur = self._aged(cur, now)
+            out = {
+                "updated_at": now,
+                "n": cur["n"] * d + 1,
+                "raw": cur["raw"] * d + raw,
+                "unique": cur["unique"] * d + unique,
+                "lat_n": cur["lat_n"] * d,
+                "lat": cur["lat"] * d,
+            }
+            if latency is not None:
+                out["lat_n"] += 1
+                out["lat"] += latency
+            return out
+
+        self.store.update_item(self.key(source, rank, depth), add, default=None)
+
+    def estimate(self, source: str, rank: int, depth: int) -> Tuple[float, float, float]:
+        """(expected unique per fetch, expected latency, effective observations).
+
+        With no history the prior shrinks with depth: later pages of a search
+        usually carry fewer new listings than the first.
+        """
+        s = self._aged(self.store.get(self.key(source, rank, depth)), time.time())
+        n = s["n"]
+        w = self.prior_weight
+        prior_u = self.prior_unique / (1 + depth)
+        mean_u = (s["unique"] + prior_u * w) / (n + w)
+        mean_lat = (s["lat"] + self.prior_latency * w) / (s["lat_n"] + w)
+        return mean_u, mean_lat, n
+
+    def snapshot(self, keys: Iterable[str]) -> List[Dict[str, Any]]:
+        """Readable rows (yield, duplicate rate, latency) for the given stat keys."""
+        rows = []
+        for key in keys:
+            s = self.store.get(key)
+            if not s or not s.get("n"):
+                continue
+            s = self._aged(s, time.time())
+            source, rank, depth = key.rsplit("|", 2)
+            rows.append({
+                "source": source,
+                "title_rank": int(rank[1:]),
+                "depth": int(depth[1:]),
+                "fetches": round(s["n"], 2),
+                "unique_per_fetch": round(s["unique"] / s["n"], 2),
+                "duplicate_rate": round(1 - s["unique"] / s["raw"], 3) if s["raw"] else None,
+                "latency_s": round(s["lat"] / s["lat_n"], 3) if s["lat_n"] else None,
+            })
+        rows.sort(key=lambda r: (r["source"], r["title_rank"], r["depth"]))
+        return rows
+
+
+class FanoutPlanner:
+    def __init__(
+        self,
+        stats: YieldStats,
+        fetch_budget: int = 40,
+        target: int = 100,
+        parallelism: int = 8,
+        min_unique_per_fetch: float = 2.0,
+        exploration: float = 2.0,
+        latency_scale: float = 2.0,
+        page_delay: float = 0.5,
+        min_history: float = 3.0,
+        probe_rate: float = 0.1,
+    ):
+        self.stats = stats
+        self.fetch_budget = fetch_budget
+        self.target = target
+        self.parallelism = max(1, parallelism)
+        self.min_unique_per_fetch = min_unique_per_fetch
+        self.exploration = exploration
+        self.latency_scale = latency_scale
+        self.page_delay = page_delay
+        self.min_history = min_history
+        self.probe_rate = probe_rate
+
+    def _score(self, branch: Branch, total_fetches: int) -> Tuple[float, float, float, float]:
+        """(ranking score, expected unique yield, optimistic yield, observations) for the branch's next page."""
+        mean_u, mean_lat, n = self.stats.estimate(branch.source, branch.rank, branch.depth)
+        bonus = self.exploration * math.sqrt(math.log(total_fetches + 2) / (n + 1))
+        optimistic = mean_u + bonus
+        return optimistic / (1 + mean_lat / self.latency_scale), mean_u, optimistic, n
+
+    def run(
+        self,
+        branches: List[Branch],
+        fetch_page: FetchPage,
+        key: Callable[[Dict[str, Any]], str] = lambda item: item.get("link", ""),
+        should_stop: Optional[Callable[[], bool]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """Fetch pages until `target` unique items or the budget is reached.
+
+        Items whose `key` is empty are kept but never count as duplicates.
+        `on_progress(unique_items, upstream_fetches)` fires after every page.
+        """
+        seen = set()
+        items: List[Dict[str, Any]] = []
+        counts = {"fetches": 0, "cached": 0}   # upstream requests spent / cache hits
+        probes: Dict[Tuple[int, int], bool] = {}   # (branch, depth) → won the exploration draw
+        stop_reason = ""
+
+        def timed_fetch(branch: Branch, depth: int):
+            started = time.monotonic()
+            try:
+                page, from_cache = fetch_page(branch, depth)
+                return page, from_cache, time.monotonic() - started, None
+            except Exception as e:
+                return None, False, time.monotonic() - started, e
+
+        def absorb(b: Branch, result) -> None:
+            page, from_cache, latency, error = result
+            depth = b.depth
+            counts["cached" if from_cache else "fetches"] += 1
+            fresh = 0
+            for item in page or []:
+                k = key(item)
+                if k and k in seen:
+                    continue
+                if k:
+                    seen.add(k)
+                items.append(item)
+                fresh += 1
+            b.depth += 1
+            b.fetches += 1
+            b.raw += len(page or [])
+            b.unique += fresh
+            if not from_cache:
+                b.ready_at = time.monotonic() + self.page_delay
+            if error is not None:
+                print(f"Fan-out branch error ({b.source}, {b.title!r}, page {depth}): {error}")
+                b.stop("error")
+                return
+            if page is None:
+                b.stop("unavailable")
+                if on_progress:
+                    on_progress(len(items), counts["fetches"])
+                return
+            self.stats.record(b.source, b.rank, depth, len(page), fresh, None if from_cache else latency)
+            if not page:
+                b.stop("exhausted")
+            elif fresh < self.min_unique_per_fetch:
+                b.stop("low_yield")
+            if on_progress:
+                on_progress(len(items), counts["fetches"])
+
+        in_flight: Dict[concurrent.futures.Future, Branch] = {}
+        expected: Dict[concurrent.futures.Future, float] = {}   # predicted new jobs per in-flight page
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            while True:
+                if should_stop and should_stop():
+                    stop_reason = "cancelled"
+                    break
+                if len(items) >= self.target:
+                    stop_reason = "target"
+                    break
+
+                now = time.monotonic()
+                busy = set(in_flight.values())
+                spent = counts["fetches"]
+                candidates = []
+                for b in branches:
+                    if b.done or b in busy:
+                        continue
+                    if b.depth >= b.max_depth:
+                        b.stop("max_depth")
+                        continue
+                    score, mean_u, optimistic, n = self._score(b, spent + counts["cached"])
+                    if n >= self.min_history and optimistic < self.min_unique_per_fetch:
+                        # One draw per page, so a skipped branch is re-tested on later runs.
+                        probe = probes.setdefault((id(b), b.depth), random.random() < self.probe_rate)
+                        if not probe:
+                            b.stop("history")
+                            continue
+                    candidates.append((score, mean_u, b))
+                candidates.sort(key=lambda c: c[0], reverse=True)
+
+                next_ready = None
+                for _, mean_u, b in candidates:
+                    # Every in-flight page may still cost a request, so it is reserved against the budget.
+                    if len(in_flight) >= self.parallelism or spent + len(in_flight) >= self.fetch_budget:
+                        break
+                    # Pages already in flight are expected to cover the rest of the target.
+                    if in_flight and len(items) + sum(expected.values()) >= self.target:
+                        break
+                    if b.ready_at > now:
+                        next_ready = b.ready_at if next_ready is None else min(next_ready, b.ready_at)
+                        continue
+                    future = executor.submit(timed_fetch, b, b.depth)
+                    in_flight[future] = b
+                    expected[future] = mean_u
+
+                if not in_flight:
+                    if next_ready is not None:
+                        time.sleep(max(0.0, next_ready - time.monotonic()))
+                        continue
+                    stop_reason = "budget" if spent >= self.fetch_budget else "exhausted"
+                    break
+
+                timeout = None if next_ready is None else max(0.0, next_ready - time.monotonic())
+                done, _ = concurrent.futures.wait(list(in_flight), timeout=timeout,
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    expected.pop(future, None)
+                    absorb(in_flight.pop(future), future.result())
+
+            # Pages already requested are paid for; keep their jobs unless the run was cancelled.
+            for future, b in in_flight.items():
+                if stop_reason == "cancelled":
+                    future.cancel()
+                else:
+                    absorb(b, future.result())
+
+        for b in branches:
+            if not b.done and not b.stop_reason:
+                b.stop_reason = stop_reason
+        return {
+            "items": items,
+            "fetches": counts["fetches"],
+            "cached_fetches": counts["cached"],
+            "budget": self.fetch_budget,
+            "target": self.target,
+            "stopped": stop_reason,
+            "branches": [b.summary() for b in branches],
+        }
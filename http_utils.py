@@ -0,0 +1,255 @@
+"""
+Sidekick — Response Encoding Helpers
+=========================================
+  • FastJSONResponse      → orjson when installed, compact stdlib json otherwise
+  • etag_json_response()  → strong ETag + If-None-Match → 304 for polled endpoints
+  • CompressionMiddleware → brotli/gzip for buffered responses above a size threshold
+  • PrecompressedStaticFiles → serves build_assets.py output: .br/.gz siblings picked by
+                              Accept-Encoding, immutable caching for fingerprinted names
+
+Both orjson and brotli are optional; without them the helpers fall back to
+the standard library (json, gzip) with identical behaviour on the wire.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import re
+import stat
+from typing import Any, Iterable
+
+import anyio
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from fastapi.staticfiles import StaticFiles
+
+try:
+    import orjson
+    _ORJSON_OK = True
+except ImportError:
+    _ORJSON_OK = False
+
+try:
+    import brotli
+    _BROTLI_OK = True
+except ImportError:
+    _BROTLI_OK = False
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/javascript", "application/x-ndjson",
+    "text/", "image/svg+xml",
+)
+
+# Appended inside the quotes of an ETag when the body is compressed, so each
+# encoded representation keeps a distinct strong validator.
+_ENCODING_SUFFIX = {"br": "-br", "gzip": "-gz"}
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    if _ORJSON_OK:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        c = candidate.strip()
+        if c.startswith("W/"):
+            c = c[2:]
+        c = c.strip('"')
+        for suffix in _ENCODING_SUFFIX.values():
+            if c.endswith(suffix):
+                c = c[: -len(suffix)]
+                break
+        if c == bare:
+            return True
+    return False
+
+
+def etag_json_response(request: Request, payload: Any) -> Response:
+    """Serialise once, hash the bytes, and answer 304 when the client already has them.
+
+    `Cache-Control: no-cache` makes browsers revalidate every poll, which is
+    exactly the case this is for: a repeat poll costs one hash and ~200 bytes.
+    """
+    body = dumps_bytes(payload)
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    inm = request.headers.get("if-none-match")
+    if inm and _etag_matches(inm, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _accepted_encodings(accept_encoding: str) -> dict:
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        bits = part.strip().split(";q=")
+        name = bits[0].strip()
+        try:
+            q = float(bits[1]) if len(bits) > 1 else 1.0
+        except ValueError:
+            q = 0.0
+        if name:
+            offered[name] = q
+    return offered
+
+
+def _pick_encoding(accept_encoding: str) -> str:
+    offered = _accepted_encodings(accept_encoding)
+    if _BROTLI_OK and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return ""
+
+
+class CompressionMiddleware:
+    """ASGI middleware: compress complete (non-streaming) responses above `minimum_size`.
+
+    Streaming responses (more than one body chunk) pass through untouched so
+    NDJSON/event streams still reach the client incrementally.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for k, v in scope.get("headers", []):
+            if k == b"accept-encoding":
+                accept = v.decode("latin-1")
+                break
+        encoding = _pick_encoding(accept)
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def wrapped_send(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = _Headers(start_message.get("headers", []))
+            if (message.get("more_body", False)
+                    or start_message["status"] in (204, 206, 304)
+                    or headers.get("content-encoding")
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            headers.add_vary()
+            if len(body) < self.minimum_size:
+                start_message["headers"] = headers.raw
+                await send(start_message)
+                await send(message)
+                return
+
+            if encoding == "br":
+                compressed = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                compressed = gzip.compress(body, compresslevel=self.gzip_level)
+            headers.set("content-encoding", encoding)
+            headers.set("content-length", str(len(compressed)))
+            etag = headers.get("etag")
+            if etag and etag.endswith('"') and not etag.startswith("W/"):
+                headers.set("etag", etag[:-1] + _ENCODING_SUFFIX[encoding] + '"')
+            start_message["headers"] = headers.raw
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, wrapped_send)
+
+
+class _Headers:
+    """Tiny mutable view over ASGI raw header pairs."""
+
+    def __init__(self, raw: Iterable[tuple]):
+        self.raw = [(k, v) for k, v in raw]
+
+    def get(self, name: str, default: str = "") -> str:
+        key = name.lower().encode("latin-1")
+        for k, v in self.raw:
+            if k.lower() == key:
+                return v.decode("latin-1")
+        return default
+
+    def set(self, name: str, value: str) -> None:
+        key = name.lower().encode("latin-1")
+        self.raw = [(k, v) for k, v in self.raw if k.lower() != key]
+        self.raw.append((key, value.encode("latin-1")))
+
+    def add_vary(self) -> None:
+        vary = self.get("vary")
+        if "accept-encoding" not in vary.lower():
+            self.set("vary", f"{vary}, Accept-Encoding" if vary else "Accept-Encoding")
+
+
+# name.<10 hex digits>.ext, as written by build_assets.py
+_FINGERPRINTED_RE = re.compile(r"\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles for a build output directory.
+
+    Serves `file.br` / `file.gz` in place of `file` when the client accepts
+    that encoding and the sibling exists. Fingerprinted names are cached for
+    a year as immutable; anything else (index.html) must revalidate.
+    """
+
+    async def get_response(self, path: str, scope) -> Response:
+        offered = {}
+        for k, v in scope.get("headers", []):
+            if k == b"accept-encoding":
+                offered = _accepted_encodings(v.decode("latin-1"))
+                break
+        response = None
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if offered.get(encoding, 0) <= 0 or scope["method"] not in ("GET", "HEAD"):
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                response = self.file_response(full_path, stat_result, scope)
+                response.headers["content-encoding"] = encoding
+                media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                if media_type.startswith("text/") or media_type == "application/javascript":
+                    media_type += "; charset=utf-8"
+                response.headers["content-type"] = media_type
+                break
+        if response is None:
+            response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["cache-control"] = IMMUTABLE_CACHE if _FINGERPRINTED_RE.search(path) else "no-cache"
+            response.headers["vary"] = "Accept-Encoding"
+        return response
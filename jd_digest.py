@@ -0,0 +1,405 @@
+"""
+Sidekick — Job Description Digests
+=========================================
+analyze-job, interview-prep and generate-text all receive the same job
+description when a user opens a posting. Instead of shipping the raw page
+text to Gemini three times, each JD is digested once:
+
+  1. normalise + hash   → digest key (whitespace/case-insensitive)
+  2. local extraction   → title/company, stack, seniority, responsibilities, requirements
+  3. LLM fallback       → only when the page has no recognisable sections
+  4. store              → SQLite row + in-process LRU, shared by all endpoints
+
+`render()` turns a digest into the compact text block used in prompts.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+DigestBase = declarative_base()
+
+
+class DBJobDigest(DigestBase):
+    __tablename__ = "jd_digests"
+    digest_key = Column(String, primary_key=True, index=True)
+    digest_json = Column(Text, default="{}")
+    method = Column(String, default="local")
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+
+# ─────────────────────────────────────────────
+#  Local extraction vocabulary
+# ─────────────────────────────────────────────
+TECH_TERMS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Golang", "Rust", "C++", "C#", "Kotlin", "Swift",
+    "Scala", "Ruby", "PHP", "R", "SQL", "Bash", ".NET", "Node.js", "React", "Angular", "Vue", "Next.js",
+    "Django", "Flask", "FastAPI", "Spring", "Spring Boot", "Express", "Rails", "Laravel", "GraphQL",
+    "REST", "gRPC", "Microservices", "Kafka", "RabbitMQ", "Redis", "PostgreSQL", "MySQL", "MongoDB",
+    "Cassandra", "DynamoDB", "Elasticsearch", "Snowflake", "BigQuery", "Spark", "Hadoop", "Airflow",
+    "dbt", "Pandas", "NumPy", "TensorFlow", "PyTorch", "scikit-learn", "Keras", "LLM", "NLP",
+    "Computer Vision", "Machine Learning", "Deep Learning", "Generative AI", "LangChain", "MLOps",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins", "GitHub Actions",
+    "CI/CD", "Linux", "Git", "HTML", "CSS", "Tailwind", "Redux", "Android", "iOS", "Flutter",
+    "React Native", "Selenium", "Cypress", "Jest", "Power BI", "Tableau", "Excel", "Figma", "Salesforce",
+    "SAP", "Unity", "Embedded C", "Hibernate", "Microsoft Fabric", "Data Warehousing", "ETL",
+]
+
+# Most senior first: "Senior Associate" is Senior, "Lead Graduate Recruiter" is Lead.
+# Title words are trusted as they stand; in the body the same words are often
+# incidental ("graduate degree", "associate with"), so body patterns are stricter
+# and only consulted when the title and the years of experience say nothing.
+_SENIORITY_WORDS = [
+    ("Principal", r"\b(?:principal|staff|distinguished)\b"),
+    ("Senior", r"\b(?:senior|sr)\b"),
+    ("Lead", r"\b(?:lead|tech lead|team lead)\b"),
+    ("Manager", r"\b(?:manager|head of|director)\b"),
+    ("Architect", r"\barchitect\b"),
+    ("Junior", r"\b(?:junior|jr|associate)\b"),
+    ("Intern", r"\b(?:intern|internship)\b"),
+    ("Fresher", r"\b(?:fresher|entry[- ]level|graduate|trainee)\b"),
+]
+
+_BODY_SENIORITY_WORDS = [
+    ("Principal", r"\b(?:principal|staff|distinguished) (?:engineer|developer|scientist)\b"),
+    ("Senior", r"\b(?:senior|sr\.?) (?:engineer|developer|role|position|level)\b"),
+    ("Lead", r"\b(?:tech lead|team lead|lead (?:engineer|developer))\b"),
+    ("Manager", r"\b(?:engineering manager|head of engineering|director of)\b"),
+    ("Architect", r"\b(?:solutions?|software|cloud|data|enterprise|technical) architect\b"),
+    ("Junior", r"\b(?:junior|jr\.?) (?:engineer|developer|role|position|level)\b"),
+    ("Intern", r"\b(?:internship|intern (?:role|position))\b"),
+    ("Fresher", r"\b(?:freshers?|entry[- ]level|new grad(?:uate)?s?|recent graduates?|graduate (?:trainee|program(?:me)?|role|position))\b"),
+]
+
+_FLAG_PHRASES = [
+    "wear many hats", "fast-paced", "fast paced", "work hard play hard", "rockstar", "ninja",
+    "hustle", "like a family", "we are a family", "weekends", "24/7", "on-call", "immediate joiner", "unpaid", "high pressure",
+    "tight deadlines", "self-starter", "no 9-to-5",
+]
+
+# Whole phrases only: "we are a family" must not match "we are a family-owned business".
+_FLAG_PATTERNS = [(p, re.compile(rf"(?<![\w-]){re.escape(p)}s?(?![\w-])")) for p in _FLAG_PHRASES]
+
+_SECTION_PATTERNS = {
+    "responsibilities": r"responsibilit|what you('|’)?ll do|what you will do|your role|the role|duties|day to day|job description",
+    "requirements": r"requirement|qualification|what we('|’)?re looking for|must have|who you are|skills|eligibility|experience required",
+    "preferred": r"nice to have|good to have|preferred|bonus|plus points",
+}
+
+_MAX_ITEMS = 8
+_MAX_ITEM_CHARS = 160
+_EXCERPT_CHARS = 1500
+
+
+def normalize_jd(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "")).strip().lower()
+
+
+def digest_key(text: str) -> str:
+    return hashlib.sha256(normalize_jd(text).encode("utf-8")).hexdigest()
+
+
+def _term_pattern(term: str) -> re.Pattern:
+    esc = re.escape(term.lower())
+    return re.compile(rf"(?<![a-z0-9+#.]){esc}(?![a-z0-9+#])")
+
+
+_TERM_PATTERNS = [(t, _term_pattern(t)) for t in TECH_TERMS]
+
+
+# Capitalised "Go" next to list punctuation or another term ("Go and Java", "Python, Go").
+_GO_LANGUAGE_RE = re.compile(r"(?:[,/(&]|\b(?:and|or|with|in|using))\s*Go\b(?![-'’])|\bGo\s*(?:[,/)&]|and\b|or\b)")
+
+
+def _extract_stack(text: str) -> List[str]:
+    low = text.lower()
+    found = [t for t, pat in _TERM_PATTERNS if pat.search(low)]
+    # "Go" and "R" match ordinary prose; keep them only in an explicit language context.
+    if "Go" in found and "Golang" not in found and not (
+            re.search(r"\bgo(lang)?\s+(developer|engineer|programming)", low) or _GO_LANGUAGE_RE.search(text)):
+        found.remove("Go")
+    if "R" in found and not re.search(r"(?<![a-z])r\s*(programming|language|studio)|,\s*r\s*,", low):
+        found.remove("R")
+    return found
+
+
+def _first_match(words, text: str) -> str:
+    return next((label for label, pat in words if re.search(pat, text)), "")
+
+
+def _title_line(text: str) -> str:
+    """The posting's first line when it looks like a heading (the job title, usually)."""
+    first = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    first = first.strip(" #*•-")
+    if not first or len(first) > 100 or first.endswith(".") or len(first.split()) > 12:
+        return ""
+    return first
+
+
+_ROLE_WORDS_RE = re.compile(
+    r"\b(?:engineer|developer|programmer|architect|manager|analyst|scientist|designer|consultant|"
+    r"administrator|specialist|intern|lead|head|director|tester|sde|devops)s?\b", re.I)
+
+
+def _extract_title(text: str) -> Dict[str, str]:
+    """Job title and company from the heading ("Senior Engineer at Acme", "Acme | Data Analyst")."""
+    line = _title_line(text)
+    if not _ROLE_WORDS_RE.search(line):
+        line = ""
+    title, company = line, ""
+    parts = re.split(r"\s+(?:at|@)\s+|\s+[|–—-]\s+|\s*·\s*", line, maxsplit=1)
+    if len(parts) == 2:
+        left, right = (p.strip() for p in parts)
+        # Whichever side names a role is the title; the other is the company.
+        title, company = (right, left) if _ROLE_WORDS_RE.search(right) and not _ROLE_WORDS_RE.search(left) else (left, right)
+    m = re.search(r"^\s*(?:company|employer|organi[sz]ation)\s*[:\-]\s*(.{2,80})$", text, re.I | re.M)
+    if m:
+        company = m.group(1).strip()
+    return {"title": title, "company": company}
+
+
+def _extract_seniority(text: str) -> Dict[str, Any]:
+    low = text.lower()
+    years = None
+    m = re.search(r"(\d{1,2})\s*\+?\s*(?:-|–|to)?\s*(\d{1,2})?\s*\+?\s*(?:years|yrs)", low)
+    if m:
+        years = {"min": int(m.group(1)), "max": int(m.group(2)) if m.group(2) else None}
+    # Title words first, then years of experience, then the body.
+    level = _first_match(_SENIORITY_WORDS, _title_line(text).lower())
+    if not level and years:
+        lo = years["min"]
+        level = "Fresher" if lo == 0 else "Junior" if lo < 2 else "Mid" if lo < 5 else "Senior"
+    if not level:
+        level = _first_match(_BODY_SENIORITY_WORDS, low)
+    return {"level": level, "years": years}
+
+
+def _clean_item(line: str) -> str:
+    line = line.strip(" \t•·-*▪●–—>✓✔")
+    if len(line) > _MAX_ITEM_CHARS:
+        line = line[:_MAX_ITEM_CHARS].rsplit(" ", 1)[0] + " …"
+    return line
+
+
+def _extract_sections(text: str) -> Dict[str, List[str]]:
+    sections: Dict[str, List[str]] = {k: [] for k in _SECTION_PATTERNS}
+    current: Optional[str] = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        # Headings are short lines, optionally ending with ':'
+        if len(line) <= 60 and (line.endswith(":") or len(line.split()) <= 6):
+            matched = None
+            for name, pat in _SECTION_PATTERNS.items():
+                if re.search(pat, line.lower()):
+                    matched = name
+                    break
+            if matched:
+                current = matched
+                continue
+            if line.endswith(":") or (line.istitle() and len(line.split()) <= 4):
+                current = None
+                continue
+        if current and len(line) > 12 and len(sections[current]) < _MAX_ITEMS:
+            item = _clean_item(line)
+            if item and item not in sections[current]:
+                sections[current].append(item)
+    return sections
+
+
+def extract_local(text: str) -> Dict[str, Any]:
+    low = text.lower()
+    sections = _extract_sections(text)
+    return {
+        **_extract_title(text),
+        "stack": _extract_stack(text),
+        "seniority": _extract_seniority(text),
+        "responsibilities": sections["responsibilities"],
+        "requirements": sections["requirements"],
+        "preferred": sections["preferred"],
+        "language_signals": sorted({p for p, pat in _FLAG_PATTERNS if pat.search(low)}),
+    }
+
+
+_LIST_LIMITS = {"stack": 15, "responsibilities": _MAX_ITEMS, "requirements": _MAX_ITEMS, "preferred": 5,
+                "language_signals": 20}
+
+
+def _as_int(v: Any) -> Optional[int]:
+    if isinstance(v, bool):
+        return None
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _coerce_fields(d: Dict[str, Any]) -> Dict[str, Any]:
+    """Only the digest fields that have the expected shape (LLM output and old rows are not trusted)."""
+    out: Dict[str, Any] = {}
+    for name in ("title", "company", "excerpt", "method"):
+        if isinstance(d.get(name), str) and d[name].strip():
+            out[name] = d[name].strip()
+    for name, limit in _LIST_LIMITS.items():
+        items = d.get(name)
+        if isinstance(items, list):
+            items = [_clean_item(i) for i in items if isinstance(i, str) and i.strip()]
+            if items:
+                out[name] = items[:limit]
+    sen = d.get("seniority")
+    if isinstance(sen, dict):
+        level = sen.get("level") if isinstance(sen.get("level"), str) else ""
+        years = sen.get("years")
+        lo = _as_int(years.get("min")) if isinstance(years, dict) else None
+        years = {"min": lo, "max": _as_int(years.get("max"))} if lo is not None else None
+        if level or years:
+            out["seniority"] = {"level": level, "years": years}
+    return out
+
+
+def _local_is_sufficient(d: Dict[str, Any]) -> bool:
+    return bool(d["stack"]) and bool(d["responsibilities"] or d["requirements"])
+
+
+_LLM_PROMPT = """Extract a compact digest from this job description.
+Return ONLY valid JSON with exactly these keys:
+- title: (string, job title or "")
+- company: (string or "")
+- stack: (list of technologies/tools, max 15)
+- seniority: ({{"level": string, "years": {{"min": int, "max": int or null}} or null}})
+- responsibilities: (list of at most 8 short strings)
+- requirements: (list of at most 8 short strings)
+- preferred: (list of at most 5 short strings)
+- language_signals: (list of phrases hinting at workplace culture, e.g. "fast-paced", "wear many hats")
+
+Job Description:
+{jd}"""
+
+
+class JDDigestStore:
+    """Digest cache shared by every JD-consuming endpoint."""
+
+    def __init__(self, engine, llm: Optional[Callable[[str], str]] = None, max_memory_entries: int = 512):
+        DigestBase.metadata.create_all(bind=engine)
+        self._Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self._llm = llm
+        self._mem: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._max = max_memory_entries
+        self._lock = threading.Lock()
+        # One in-flight build per key, so concurrent endpoints for the same page wait instead of duplicating work.
+        self._building: Dict[str, threading.Lock] = {}
+
+    def get(self, jd_text: str) -> Dict[str, Any]:
+        key = digest_key(jd_text)
+        hit = self._from_memory(key)
+        if hit is not None:
+            return hit
+        with self._lock:
+            build_lock = self._building.setdefault(key, threading.Lock())
+        with build_lock:
+            hit = self._from_memory(key) or self._from_db(key)
+            if hit is None:
+                hit = self._build(key, jd_text)
+            self._remember(key, hit)
+        with self._lock:
+            self._building.pop(key, None)
+        return hit
+
+    def _from_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                return self._mem[key]
+        return None
+
+    def _remember(self, key: str, digest: Dict[str, Any]) -> None:
+        with self._lock:
+            self._mem[key] = digest
+            self._mem.move_to_end(key)
+            while len(self._mem) > self._max:
+                self._mem.popitem(last=False)
+
+    def _from_db(self, key: str) -> Optional[Dict[str, Any]]:
+        db = self._Session()
+        try:
+            row = db.query(DBJobDigest).filter(DBJobDigest.digest_key == key).first()
+            if not row:
+                return None
+            row.hits = (row.hits or 0) + 1
+            db.commit()
+            return json.loads(row.digest_json)
+        finally:
+            db.close()
+
+    def _build(self, key: str, jd_text: str) -> Dict[str, Any]:
+        digest = extract_local(jd_text)
+        method = "local"
+        if not _local_is_sufficient(digest) and self._llm is not None:
+            try:
+                raw = self._llm(_LLM_PROMPT.format(jd=jd_text[:8000]))
+                raw = re.sub(r'^```(?:json)?\s*', '', raw.strip())
+                raw = re.sub(r'\s*```$', '', raw).strip()
+                parsed = json.loads(raw)
+                if isinstance(parsed, dict):
+                    # Fields of the wrong shape are dropped, so the local value stands.
+                    parsed = _coerce_fields(parsed)
+                    parsed.pop("excerpt", None)
+                    parsed.pop("method", None)
+                    # Local phrase hits are exact; keep them even if the model missed some.
+                    signals = set(parsed.get("language_signals") or []) | set(digest["language_signals"])
+                    digest = {**digest, **parsed}
+                    digest["language_signals"] = sorted(signals)
+                    method = "llm"
+            except Exception as e:
+                print(f"JD digest LLM fallback failed, using local extraction: {e}")
+        if method == "local" and not _local_is_sufficient(digest):
+            # Nothing structured to go on: keep a bounded excerpt so prompts still see the posting.
+            digest["excerpt"] = re.sub(r"\s+", " ", jd_text).strip()[:_EXCERPT_CHARS]
+        digest["method"] = method
+        db = self._Session()
+        try:
+            db.merge(DBJobDigest(digest_key=key, digest_json=json.dumps(digest), method=method))
+            db.commit()
+        finally:
+            db.close()
+        return digest
+
+    @staticmethod
+    def render(digest: Dict[str, Any]) -> str:
+        """Compact text block used in prompts in place of the raw JD."""
+        digest = _coerce_fields(digest)  # rows stored before fields were checked may be malformed
+        lines = []
+        role = digest.get("title") or "Unspecified"
+        if digest.get("company"):
+            role += f" at {digest['company']}"
+        lines.append(f"Role: {role}")
+        sen = digest.get("seniority") or {}
+        if sen.get("level") or sen.get("years"):
+            yrs = sen.get("years") or {}
+            span = ""
+            if yrs.get("min") is not None:
+                span = f" ({yrs['min']}–{yrs['max']} yrs)" if yrs.get("max") else f" ({yrs['min']}+ yrs)"
+            lines.append(f"Seniority: {sen.get('level') or 'Unspecified'}{span}")
+        if digest.get("stack"):
+            lines.append("Stack: " + ", ".join(digest["stack"]))
+        for name, label in (("responsibilities", "Responsibilities"), ("requirements", "Requirements"), ("preferred", "Nice to have")):
+            items = digest.get(name) or []
+            if items:
+                lines.append(f"{label}:")
+                lines.extend(f"- {i}" for i in items)
+        if digest.get("language_signals"):
+            lines.append("Language used in the posting: " + ", ".join(f'"{p}"' for p in digest["language_signals"]))
+        if digest.get("excerpt"):
+            lines.append(f"Excerpt: {digest['excerpt']}")
+        return "\n".join(lines)
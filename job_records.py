@@ -0,0 +1,96 @@
+"""
+Sidekick — Compact Job Records
+=========================================
+Cached job lists were plain dicts of ~10 string keys each, with the same few
+values ("Not Applied", "Not disclosed", "Recently", source names, the region)
+repeated in every one. In the in-process state backend they are now stored as
+`JobRecord` objects:
+
+  • __slots__          → no per-object __dict__
+  • sys.intern()       → one shared copy of every low-cardinality value
+  • shared references  → the applied log reuses the job's own string objects
+
+The API shape is unchanged: records are converted back to dicts on read.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Fields whose values repeat across jobs and sessions (posted_at is a date, e.g. "2026-10-18").
+_INTERNED = ("location", "source", "salary", "posted", "posted_at", "status", "applied_via", "company")
+
+
+class JobRecord:
+    __slots__ = (
+        "id", "job_title", "company", "location", "source", "link",
+        "description", "salary", "posted", "posted_at", "status", "applied_via", "extra",
+    )
+
+    def __init__(self, **fields: Any):
+        extra = None
+        for name in self.__slots__:
+            if name != "extra":
+                object.__setattr__(self, name, None)
+        for k, v in fields.items():
+            if k in self.__slots__ and k != "extra":
+                if k in _INTERNED and isinstance(v, str):
+                    v = sys.intern(v)
+                object.__setattr__(self, k, v)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[k] = v
+        object.__setattr__(self, "extra", extra)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "JobRecord":
+        return cls(**d)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {}
+        for name in self.__slots__:
+            if name == "extra":
+                continue
+            v = getattr(self, name)
+            if v is not None:
+                out[name] = v
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def __repr__(self) -> str:
+        return f"JobRecord(id={self.id!r}, job_title={self.job_title!r}, source={self.source!r})"
+
+
+def pack_jobs(jobs: Optional[Iterable[Dict[str, Any]]]) -> Tuple[JobRecord, ...]:
+    """list[dict] → immutable tuple of records (what the in-process backend keeps)."""
+    if jobs is None:
+        return ()
+    return tuple(j if isinstance(j, JobRecord) else JobRecord.from_dict(j) for j in jobs)
+
+
+def unpack_jobs(records: Iterable[JobRecord]) -> List[Dict[str, Any]]:
+    """Fresh dicts on every read, so callers can never mutate the cached copy."""
+    return [r.to_dict() for r in records]
+
+
+def deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate retained size in bytes; shared objects (interned strings) count once."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += deep_sizeof(k, _seen) + deep_sizeof(v, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_sizeof(item, _seen)
+    elif hasattr(obj, "__slots__") and not isinstance(obj, (str, bytes)):
+        for name in obj.__slots__:
+            size += deep_sizeof(getattr(obj, name, None), _seen)
+    return size
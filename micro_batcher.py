@@ -0,0 +1,132 @@
+"""
+Sidekick — Cross-Request Micro-Batching
+=========================================
+Packs concurrent calls that would each cost one LLM request into one
+multi-item request, so a per-minute request quota serves several users:
+
+  1. collect  → the first caller opens a batch and waits up to `window`
+                seconds (or until `max_batch` items arrive) for company
+  2. run      → the opening caller runs `run_batch(items)` once for everyone;
+                it returns one result per item, None where an item's part
+                of the answer was missing or invalid
+  3. deliver  → each caller gets its own result; callers whose item came
+                back None re-run it alone with `run_single(item)`, in their
+                own thread
+  4. errors   → if the batch call itself fails (network, quota), every
+                caller sees that exception, as a single call would have;
+                an answer that can't be parsed (ValueError) is counted in
+                `unusable_batches` and every item re-runs single;
+                a lone item skips the batch prompt and runs single
+
+Callers block in `submit()`, so this suits handlers running on the
+threadpool (plain `def` routes and `asyncio.to_thread`).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class _Slot:
+    __slots__ = ("item", "result", "error", "retry_single", "done")
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.retry_single = False
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    def __init__(self, run_batch: Callable[[Sequence[Any]], List[Optional[Any]]],
+                 run_single: Callable[[Any], Any], window: float = 0.04, max_batch: int = 8):
+        self.run_batch = run_batch
+        self.run_single = run_single
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._cond = threading.Condition()
+        self._open: Optional[List[_Slot]] = None
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"calls": 0, "batches": 0, "batched_items": 0, "singles": 0,
+                                      "fallbacks": 0, "batch_errors": 0, "unusable_batches": 0}
+
+    def _count(self, **deltas: int) -> None:
+        with self._stats_lock:
+            for k, v in deltas.items():
+                self.stats[k] += v
+
+    def submit(self, item: Any) -> Any:
+        self._count(calls=1)
+        if self.window <= 0 or self.max_batch == 1:
+            self._count(singles=1)
+            return self.run_single(item)
+
+        slot = _Slot(item)
+        with self._cond:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = []
+            batch.append(slot)
+            if len(batch) >= self.max_batch:
+                self._open = None
+                self._cond.notify_all()
+
+        if leader:
+            deadline = time.monotonic() + self.window
+            with self._cond:
+                while self._open is batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._open = None
+                        break
+                    self._cond.wait(remaining)
+            if len(batch) == 1:
+                # Nobody joined: a plain single call is cheaper than the batch prompt.
+                self._count(singles=1)
+                return self.run_single(item)
+            self._flush(batch)
+
+        slot.done.wait()
+        if slot.error is not None:
+            raise slot.error
+        if slot.retry_single:
+            self._count(fallbacks=1)
+            return self.run_single(item)
+        return slot.result
+
+    def _flush(self, batch: List[_Slot]) -> None:
+        self._count(batches=1, batched_items=len(batch))
+        try:
+            results = self.run_batch([s.item for s in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"batch returned {len(results)} results for {len(batch)} items")
+        except ValueError:
+            self._count(unusable_batches=1)
+            results = [None] * len(batch)
+        except Exception as e:
+            self._count(batch_errors=1)
+            for s in batch:
+                s.error = e
+                s.done.set()
+            return
+        for s, r in zip(batch, results):
+            if r is None:
+                s.retry_single = True
+            else:
+                s.result = r
+            s.done.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        batches = stats["batches"]
+        return {
+            **stats,
+            "window_ms": round(self.window * 1000),
+            "max_batch": self.max_batch,
+            "avg_batch_size": round(stats["batched_items"] / batches, 2) if batches else 0.0,
+        }
@@ -0,0 +1,220 @@
+"""
+Sidekick — On-disk HTTP Page Cache for Scrapers
+=========================================
+LinkedIn / Yahoo result pages for the same query and offset are requested
+many times a day across users and title variants. `PageCache.get()` sits
+under the scrapers:
+
+  1. key          → sha256 of the normalised URL + sorted query params
+  2. fresh hit    → body served from disk (gzip), no upstream request
+  3. stale hit    → revalidated with If-None-Match / If-Modified-Since (304 → reuse)
+  4. negative     → non-200s and empty result pages cached briefly, so paging
+                    stops at dead ends instead of re-requesting them
+  5. stale-if-error → a network failure falls back to the last good copy
+
+Each entry is two files: <key>.json (metadata) and <key>.gz (body).
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import requests
+
+# Query parameters that never change the page content.
+_IGNORED_PARAMS = {"utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content", "fr", "fr2", "refid", "trackingid"}
+
+
+class CachedPage:
+    """The subset of `requests.Response` the scrapers use, plus cache provenance."""
+
+    __slots__ = ("status_code", "text", "url", "from_cache", "revalidated", "negative")
+
+    def __init__(self, status_code: int, text: str, url: str, from_cache: bool = False, revalidated: bool = False,
+                 negative: bool = False):
+        self.status_code = status_code
+        self.text = text
+        self.url = url
+        self.from_cache = from_cache
+        self.revalidated = revalidated
+        self.negative = negative  # served from a cached dead end (error or empty page)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+
+def normalize_url(url: str, params: Optional[Dict] = None) -> str:
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    query = sorted((k, v.strip()) for k, v in query if k.lower() not in _IGNORED_PARAMS)
+    return urllib.parse.urlunsplit((
+        parts.scheme.lower(), parts.netloc.lower(), parts.path or "/",
+        urllib.parse.urlencode(query), "",
+    ))
+
+
+class PageCache:
+    def __init__(
+        self,
+        root: str = ".cache/pages",
+        ttl: float = 1800,
+        negative_ttl: float = 300,
+        max_bytes: int = 256 * 1024 * 1024,
+        session=None,
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        # Module-level requests.get by default: scrapers call in from many threads at once.
+        self._http = session or requests
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats = {"hits": 0, "negative_hits": 0, "revalidated": 0, "misses": 0, "stale_on_error": 0}
+
+    def _count(self, name: str) -> None:
+        # Scrapers call get() from many threads at once; += on a dict item is not atomic.
+        with self._lock:
+            self.stats[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    # ── Paths / IO ───────────────────────────────
+    def _paths(self, key: str):
+        d = self.root / key[:2]
+        return d / f"{key}.json", d / f"{key}.gz"
+
+    def _read(self, key: str):
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = gzip.decompress(body_path.read_bytes()).decode("utf-8")
+            return meta, body
+        except (OSError, ValueError):  # includes a body pruned from under its metadata
+            return None, None
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _write(self, key: str, meta: Dict, body: Optional[str]) -> None:
+        meta_path, body_path = self._paths(key)
+        if body is not None:
+            self._atomic_write(body_path, gzip.compress(body.encode("utf-8"), compresslevel=6))
+        self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        with self._lock:
+            self._writes += 1
+            should_prune = self._writes % 200 == 0
+        if should_prune:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop the least recently stored entries once the cache exceeds max_bytes."""
+        files = []
+        total = 0
+        for p in self.root.rglob("*.gz"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, p in sorted(files):
+            p.unlink(missing_ok=True)
+            p.with_suffix(".json").unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes * 0.8:
+                break
+
+    # ── Fetch ────────────────────────────────────
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: float = 10,
+        ttl: Optional[float] = None,
+        max_age: Optional[float] = None,
+        negative_if: Optional[Callable[[str], bool]] = None,
+    ) -> CachedPage:
+        """GET through the cache.
+
+        `ttl` sets how long a new entry stays fresh; `max_age` lets a caller that
+        needs newer data treat older entries as stale (they are then revalidated).
+        `negative_if(body)` marks a 200 page as an empty dead end.
+        """
+        full_url = normalize_url(url, params)
+        key = hashlib.sha256(full_url.encode("utf-8")).hexdigest()
+        now = time.time()
+        meta, body = self._read(key)
+
+        if meta and now < meta["expires_at"] and (max_age is None or now - meta["stored_at"] <= max_age):
+            self._count("negative_hits" if meta.get("negative") else "hits")
+            return CachedPage(meta["status"], body or "", full_url, from_cache=True,
+                              negative=bool(meta.get("negative")))
+
+        req_headers = dict(headers or {})
+        conditional = bool(meta and meta["status"] == 200 and not meta.get("negative")
+                           and (meta.get("etag") or meta.get("last_modified")))
+        if conditional:
+            if meta.get("etag"):
+                req_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                req_headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            res = self._http.get(full_url, headers=req_headers, timeout=timeout)
+        except requests.RequestException:
+            if meta and meta["status"] == 200 and not meta.get("negative"):
+                self._count("stale_on_error")
+                return CachedPage(200, body or "", full_url, from_cache=True)
+            raise
+
+        if res.status_code == 304 and conditional:
+            try:
+                os.utime(self._paths(key)[1], None)  # keep revalidated bodies out of the LRU prune
+            except FileNotFoundError:
+                # The body was pruned since it was read: treat the entry as a miss and fetch it in full.
+                res = self._http.get(full_url, headers=headers or {}, timeout=timeout)
+            else:
+                meta["expires_at"] = now + (ttl if ttl is not None else self.ttl)
+                meta["stored_at"] = now
+                self._write(key, meta, None)
+                self._count("revalidated")
+                return CachedPage(200, body or "", full_url, from_cache=True, revalidated=True)
+
+        self._count("misses")
+        text = res.text
+        negative = res.status_code != 200 or bool(negative_if and negative_if(text))
+        life = self.negative_ttl if negative else (ttl if ttl is not None else self.ttl)
+        self._write(key, {
+            "url": full_url,
+            "status": res.status_code,
+            "etag": res.headers.get("ETag", ""),
+            "last_modified": res.headers.get("Last-Modified", ""),
+            "negative": negative,
+            "stored_at": now,
+            "expires_at": now + life,
+        }, text if res.status_code == 200 else "")
+        return CachedPage(res.status_code, text, full_url)
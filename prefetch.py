@@ -0,0 +1,151 @@
+"""
+Sidekick — Predictive Search Prefetch
+=========================================
+Refreshes saved searches for recently active sessions before they come back,
+so the dashboard opens on warm results instead of a cold search:
+
+  1. candidates → sessions seen within the activity window whose results are
+                  older than the refresh interval, most recently seen first
+                  (supplied by the server, which owns sessions and caches)
+  2. pause      → nothing is scheduled while foreground load is above the
+                  threshold (admission-controlled requests in flight)
+  3. rate limit → each refresh takes one token from every source it scrapes
+                  and from the model budget when it needs an LLM call; token
+                  buckets refill per minute, so refreshes spread out instead
+                  of bursting at upstream sites or the Gemini quota
+  4. submit     → at most `per_tick` low-priority search tasks per tick; the
+                  task queue runs them behind any interactive work
+
+Sessions that cannot get tokens this tick are simply retried on the next one.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, burst: float):
+        self.rate = per_minute / 60.0
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, now: float) -> float:
+        self._refill(now)
+        return self.tokens
+
+
+class RateLimits:
+    """Named token buckets; `try_acquire` takes one token from each key or none at all."""
+
+    def __init__(self, per_minute: Dict[str, float], default_per_minute: float, burst: float = 2.0):
+        self.per_minute = dict(per_minute)
+        self.default_per_minute = default_per_minute
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: str) -> TokenBucket:
+        b = self._buckets.get(key)
+        if b is None:
+            b = self._buckets[key] = TokenBucket(self.per_minute.get(key, self.default_per_minute), self.burst)
+        return b
+
+    def try_acquire(self, keys: Iterable[str]) -> bool:
+        keys = list(dict.fromkeys(keys))
+        with self._lock:
+            now = time.monotonic()
+            buckets = [self._bucket(k) for k in keys]
+            if any(b.available(now) < 1.0 for b in buckets):
+                return False
+            for b in buckets:
+                b.tokens -= 1.0
+            return True
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            now = time.monotonic()
+            return {k: round(b.available(now), 2) for k, b in self._buckets.items()}
+
+
+class PrefetchScheduler:
+    """Background thread that turns prefetch candidates into low-priority search tasks.
+
+    `candidates()` returns dicts with "sid", "sources" and "needs_model";
+    `submit(candidate)` queues the refresh and returns its task id (or None);
+    `busy()` reports foreground load.
+    """
+
+    def __init__(self, candidates: Callable[[], List[Dict[str, Any]]],
+                 submit: Callable[[Dict[str, Any]], Optional[str]],
+                 busy: Callable[[], bool], limits: RateLimits,
+                 interval: float = 60.0, per_tick: int = 5, model_key: str = "model:gemini"):
+        self.candidates = candidates
+        self.submit = submit
+        self.busy = busy
+        self.limits = limits
+        self.interval = interval
+        self.per_tick = per_tick
+        self.model_key = model_key
+        self.stats = {"ticks": 0, "paused": 0, "submitted": 0, "deferred": 0, "errors": 0, "last_tick": None}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="search-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def _loop(self) -> None:
+        # Random start offset so several workers do not tick in lockstep.
+        if self._stop.wait(random.uniform(0, self.interval)):
+            return
+        while True:
+            try:
+                self.tick()
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"Prefetch tick failed: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def tick(self) -> Dict[str, int]:
+        self.stats["ticks"] += 1
+        self.stats["last_tick"] = time.time()
+        if self.busy():
+            self.stats["paused"] += 1
+            return {"submitted": 0, "deferred": 0, "paused": 1}
+        submitted = deferred = 0
+        for cand in self.candidates():
+            if submitted >= self.per_tick:
+                break
+            keys = [f"source:{s}" for s in cand.get("sources", [])]
+            if cand.get("needs_model"):
+                keys.append(self.model_key)
+            if not self.limits.try_acquire(keys):
+                deferred += 1
+                continue
+            if self.submit(cand):
+                submitted += 1
+            if self.busy():
+                break
+        self.stats["submitted"] += submitted
+        self.stats["deferred"] += deferred
+        return {"submitted": submitted, "deferred": deferred, "paused": 0}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "running": self._thread is not None, "tokens": self.limits.snapshot()}
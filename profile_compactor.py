@@ -0,0 +1,229 @@
+"""
+Sidekick — Compact Profile for AI Prompts
+=========================================
+The AI endpoints used to paste the whole profile JSON into every prompt,
+including UI state, API keys and EEO answers that never help the model.
+This module turns the stored profile plus the extracted resume text into a
+ranked, deduplicated summary that fits a token budget:
+
+  1. flatten     → nested profile dicts/lists become "label: value" facts
+  2. rank        → facts scored by how much they matter for job fit
+  3. dedupe      → resume lines already covered by profile facts are dropped
+  4. pack        → greedy fill up to the budget using a local token estimator
+
+Results are cached per profile version (a content hash), so every AI
+endpoint reuses the same compact text until the profile changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+DEFAULT_TOKEN_BUDGET = 600
+
+# Keys that never belong in a prompt (secrets, identifiers, UI state, EEO data).
+_DROP_KEY_PATTERNS = [
+    r"key$", r"token", r"password", r"secret", r"session", r"^sid$", r"theme",
+    r"^eeo", r"email", r"phone", r"zip", r"^target_sources$", r"^resume_",
+    r"backgroundcheck", r"contactemployer", r"noncompete", r"prevemployment",
+]
+
+# Higher weight → earlier in the summary. First matching pattern wins.
+_KEY_WEIGHTS = [
+    (r"firstname|lastname|full_?name|^name$", 100),
+    (r"base_job_role|headline|current_?title|^title$|^role$", 95),
+    (r"yearsexp|years_?exp|experience_?years", 90),
+    (r"skill|stack|tech", 85),
+    (r"experience", 80),
+    (r"project", 70),
+    (r"degree|education|university|gradyear", 60),
+    (r"cert", 55),
+    (r"summary|about|bio", 50),
+    (r"city|state|country|metro|location|relocate", 40),
+    (r"workauth|visa|notice|salary", 30),
+    (r"github|portfolio|linkedin", 20),
+]
+
+_DEFAULT_WEIGHT = 10
+_RESUME_SKILL_WEIGHT = 75
+_RESUME_LINE_WEIGHT = 45
+
+_WORD_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_SECTION_RE = re.compile(r"^\s*(technical\s+)?(skills|technologies|tech stack|core competencies)\b", re.I)
+_HEADING_RE = re.compile(r"^\s*[A-Z][A-Za-z &/]{2,40}:?\s*$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate, close to SentencePiece/BPE counts for English resumes.
+
+    Words cost one token per ~7 characters, digit runs one per 3 digits and
+    every punctuation mark one token.
+    """
+    total = 0
+    for piece in _WORD_RE.findall(text or ""):
+        if piece[0].isalpha():
+            total += 1 + (len(piece) - 1) // 7
+        elif piece[0].isdigit():
+            total += (len(piece) + 2) // 3
+        else:
+            total += 1
+    return total
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"[^a-z0-9+#]+", " ", text.lower()).strip()
+
+
+def _key_dropped(key: str) -> bool:
+    k = key.lower()
+    return any(re.search(p, k) for p in _DROP_KEY_PATTERNS)
+
+
+def _key_weight(path: str) -> int:
+    k = path.lower()
+    for pattern, weight in _KEY_WEIGHTS:
+        if re.search(pattern, k):
+            return weight
+    return _DEFAULT_WEIGHT
+
+
+def _label(key: str) -> str:
+    # camelCase / snake_case → "camel case"
+    key = re.sub(r"(?<=[a-z])(?=[A-Z])", " ", key)
+    return key.replace("_", " ").strip().lower()
+
+
+def _flatten(value: Any, path: str = "") -> Iterable[Tuple[str, str]]:
+    """Yield (key_path, text) facts, skipping dropped keys and empty values."""
+    if isinstance(value, dict):
+        # A list item like {"company": .., "title": .., "start": ..} reads best on one line.
+        if path and all(not isinstance(v, (dict, list)) for v in value.values()):
+            parts = [f"{_label(k)} {v}".strip() for k, v in value.items()
+                     if not _key_dropped(k) and str(v).strip()]
+            if parts:
+                yield path, "; ".join(parts)
+            return
+        for k, v in value.items():
+            if _key_dropped(k):
+                continue
+            # Wrappers such as the extension's {"profileData": {...}} add no meaning.
+            sub = path if k in ("profileData", "profile", "data") else (f"{path}.{k}" if path else k)
+            yield from _flatten(v, sub)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _flatten(item, path)
+    elif value is not None and str(value).strip():
+        yield path, str(value).strip()
+
+
+def _resume_facts(resume_text: str) -> List[Tuple[int, str]]:
+    """Rank resume lines: skill sections first, then quantified bullets, then the rest."""
+    facts = []
+    in_skills = False
+    for raw in resume_text.splitlines():
+        line = raw.strip(" \t•·-*▪●")
+        if len(line) < 3:
+            continue
+        if _SECTION_RE.match(line):
+            in_skills = True
+            rest = line.split(":", 1)[1].strip() if ":" in line else ""
+            if rest:
+                facts.append((_RESUME_SKILL_WEIGHT, f"skills: {rest}"))
+            continue
+        if _HEADING_RE.match(line):
+            in_skills = False
+            continue
+        if in_skills:
+            facts.append((_RESUME_SKILL_WEIGHT, f"skills: {line}"))
+        elif re.search(r"\d", line) and len(line) > 25:
+            facts.append((_RESUME_LINE_WEIGHT + 5, line))
+        elif len(line) > 25:
+            facts.append((_RESUME_LINE_WEIGHT, line))
+    return facts
+
+
+def profile_version(profile: Dict[str, Any], resume_text: str = "") -> str:
+    """Content hash used as the cache key; changes whenever the profile or resume changes."""
+    h = hashlib.sha1(json.dumps(profile, sort_keys=True, default=str).encode("utf-8"))
+    h.update(b"\0")
+    h.update((resume_text or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+def compact_profile(profile: Dict[str, Any], resume_text: str = "", budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Build the compact summary without caching. Prefer `ProfileCompactor.compact`."""
+    candidates: List[Tuple[int, int, str]] = []
+    order = 0
+    merged: "OrderedDict[str, List[str]]" = OrderedDict()
+    for path, text in _flatten(profile):
+        merged.setdefault(path, []).append(text)
+    for path, values in merged.items():
+        label = _label(path.split(".")[-1])
+        candidates.append((_key_weight(path), order, f"{label}: {', '.join(values)}"))
+        order += 1
+    for weight, line in _resume_facts(resume_text or ""):
+        candidates.append((weight, order, line))
+        order += 1
+
+    candidates.sort(key=lambda c: (-c[0], c[1]))
+
+    seen_norms: List[str] = []
+    out: List[str] = []
+    used = 0
+    for _, _, line in candidates:
+        n = _norm(line)
+        if not n or any(n in s or s in n for s in seen_norms if len(s) > 12 or s == n):
+            continue
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            # Try a truncated version of long lines before giving up on them.
+            room = budget - used - 1
+            if room < 12:
+                continue
+            words = line.split()
+            while words and estimate_tokens(" ".join(words)) > room - 1:
+                words.pop()
+            if len(words) < 4:
+                continue
+            line = " ".join(words) + " …"
+            cost = estimate_tokens(line) + 1
+        seen_norms.append(n)
+        out.append(line)
+        used += cost
+    return "\n".join(out)
+
+
+class ProfileCompactor:
+    """Thread-safe LRU of compact profiles keyed by (profile version, budget)."""
+
+    def __init__(self, max_entries: int = 256):
+        self._cache: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        self._max = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compact(self, profile: Dict[str, Any], resume_text: str = "", budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+        key = (profile_version(profile, resume_text), budget)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+        text = compact_profile(profile, resume_text, budget)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max:
+                self._cache.popitem(last=False)
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
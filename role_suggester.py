@@ -0,0 +1,246 @@
+"""
+Sidekick — Local Role Suggestions
+=========================================
+Suggests job titles for a resume without an LLM round trip:
+
+  1. vocabulary → ROLE_PROFILES: common Indian tech job titles, each with a
+                  family and the skills that typically appear on a matching resume
+  2. features   → character 3–5-grams inside word boundaries, hashed (crc32) into
+                  N_FEATURES buckets, sublinear TF × smoothed IDF, L2-normalised
+  3. index      → one float32 row per title; built once with
+                  `python role_suggester.py --build` into data/role_index.npy
+                  (+ .idf.npy and .json) and memory-mapped at startup
+  4. query      → resume (and optional target role) vectorised the same way,
+                  cosine = index @ query, top-k with at most two titles per family
+
+If the built files are missing or stale, the index is built in memory on
+first use (a few milliseconds for this vocabulary).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+N_FEATURES = 1 << 14
+NGRAM_RANGE = (3, 5)
+TITLE_WEIGHT = 3          # the title is repeated so its n-grams outweigh any single skill
+INDEX_PATH = Path(__file__).parent / "data" / "role_index.npy"
+
+# (title, family, skills)
+ROLE_PROFILES: List[Tuple[str, str, str]] = [
+    ("Software Development Engineer", "general", "java python c++ data structures algorithms system design oops rest api microservices git sql"),
+    ("Software Engineer", "general", "java python javascript data structures algorithms oops git sql rest api unit testing agile"),
+    ("Associate Software Engineer", "general", "java c python sql oops data structures fresher internship git html css"),
+    ("Senior Software Engineer", "general", "system design microservices java python distributed systems mentoring code review kafka aws"),
+    ("Backend Developer", "backend", "rest api microservices databases sql postgresql mysql redis caching node.js java python go"),
+    ("Java Developer", "backend", "java spring boot hibernate jpa microservices rest maven junit mysql kafka"),
+    ("Python Developer", "backend", "python django flask fastapi rest api sqlalchemy postgresql celery pandas pytest"),
+    ("Node.js Developer", "backend", "node.js express javascript typescript mongodb rest api nestjs npm redis"),
+    ("Golang Developer", "backend", "go golang goroutines grpc microservices kubernetes docker postgresql"),
+    (".NET Developer", "backend", "c# .net core asp.net mvc entity framework sql server azure linq web api"),
+    ("PHP Developer", "backend", "php laravel codeigniter mysql wordpress javascript jquery rest api"),
+    ("Frontend Developer", "frontend", "javascript typescript html css react angular vue responsive design webpack redux"),
+    ("React Developer", "frontend", "react redux javascript typescript hooks next.js html css jest tailwind"),
+    ("Angular Developer", "frontend", "angular typescript rxjs ngrx html css javascript karma jasmine"),
+    ("UI Developer", "frontend", "html css javascript sass bootstrap figma responsive design jquery accessibility"),
+    ("Full Stack Developer", "fullstack", "react node.js javascript typescript mongodb express rest api html css sql"),
+    ("MERN Stack Developer", "fullstack", "mongodb express react node.js javascript redux rest api jwt"),
+    ("Java Full Stack Developer", "fullstack", "java spring boot angular react rest api mysql hibernate html css"),
+    ("Python Full Stack Developer", "fullstack", "python django react javascript postgresql rest api html css"),
+    ("Android Developer", "mobile", "android kotlin java jetpack compose mvvm retrofit room firebase gradle"),
+    ("iOS Developer", "mobile", "ios swift swiftui objective-c xcode uikit core data cocoapods"),
+    ("Flutter Developer", "mobile", "flutter dart firebase bloc provider android ios rest api"),
+    ("React Native Developer", "mobile", "react native javascript typescript redux android ios expo"),
+    ("Data Scientist", "data_science", "python machine learning statistics pandas numpy scikit-learn sql regression classification deep learning"),
+    ("Data Analyst", "data_analytics", "sql excel power bi tableau python pandas statistics dashboards reporting data visualization"),
+    ("Business Analyst", "data_analytics", "requirements gathering sql excel stakeholder management jira brd frd process mapping power bi"),
+    ("Data Engineer", "data_engineering", "python sql spark pyspark airflow etl kafka hadoop data warehouse snowflake databricks aws glue"),
+    ("Big Data Engineer", "data_engineering", "hadoop spark hive scala kafka hdfs pyspark sqoop"),
+    ("ETL Developer", "data_engineering", "etl informatica ssis talend sql data warehouse oracle stored procedures"),
+    ("Power BI Developer", "data_analytics", "power bi dax power query sql data modeling ssas excel reporting"),
+    ("Machine Learning Engineer", "ml", "python machine learning tensorflow pytorch mlops model deployment scikit-learn feature engineering docker"),
+    ("AI Engineer", "ml", "python llm generative ai langchain rag prompt engineering openai pytorch transformers vector database"),
+    ("Generative AI Engineer", "ml", "generative ai llm langchain llamaindex rag fine-tuning hugging face openai prompt engineering"),
+    ("Deep Learning Engineer", "ml", "deep learning pytorch tensorflow cnn rnn transformers computer vision gpu cuda"),
+    ("NLP Engineer", "ml", "nlp transformers bert spacy nltk text classification named entity recognition hugging face python"),
+    ("Computer Vision Engineer", "ml", "computer vision opencv yolo cnn image processing pytorch object detection segmentation"),
+    ("MLOps Engineer", "ml", "mlops kubeflow mlflow docker kubernetes model deployment ci/cd sagemaker monitoring"),
+    ("DevOps Engineer", "devops", "devops ci/cd jenkins docker kubernetes terraform ansible aws linux git bash monitoring"),
+    ("Site Reliability Engineer", "devops", "sre monitoring prometheus grafana kubernetes linux incident management slo automation python go"),
+    ("Cloud Engineer", "cloud", "aws azure gcp cloud ec2 s3 iam vpc terraform cloudformation linux networking"),
+    ("AWS Cloud Engineer", "cloud", "aws ec2 s3 lambda iam vpc cloudformation rds cloudwatch eks"),
+    ("Azure Cloud Engineer", "cloud", "azure arm templates azure devops aks azure functions active directory"),
+    ("Platform Engineer", "devops", "kubernetes internal platform developer tooling terraform helm gitops argocd"),
+    ("QA Engineer", "qa", "manual testing test cases bug tracking jira regression testing sdlc stlc functional testing"),
+    ("Automation Test Engineer", "qa", "selenium java testng cucumber api testing postman rest assured automation framework jenkins"),
+    ("SDET", "qa", "sdet selenium java python test automation framework api testing ci/cd unit testing"),
+    ("Performance Test Engineer", "qa", "jmeter loadrunner performance testing load testing gatling monitoring"),
+    ("Cyber Security Analyst", "security", "security soc siem splunk incident response vulnerability assessment firewall network security"),
+    ("Penetration Tester", "security", "penetration testing vapt burp suite owasp kali linux metasploit ethical hacking"),
+    ("Network Engineer", "infra", "networking ccna routing switching tcp/ip firewall cisco lan wan vpn"),
+    ("System Administrator", "infra", "linux windows server active directory vmware shell scripting backup troubleshooting"),
+    ("Database Administrator", "infra", "dba oracle mysql postgresql sql server backup recovery performance tuning replication"),
+    ("Embedded Software Engineer", "embedded", "embedded c c++ microcontrollers rtos arm firmware i2c spi uart linux device drivers"),
+    ("Firmware Engineer", "embedded", "firmware embedded c microcontroller bootloader rtos debugging jtag"),
+    ("VLSI Design Engineer", "embedded", "vlsi verilog systemverilog rtl asic fpga uvm verification synthesis"),
+    ("Salesforce Developer", "enterprise", "salesforce apex visualforce lightning soql crm lwc"),
+    ("SAP ABAP Consultant", "enterprise", "sap abap hana s/4hana odata bapi smartforms"),
+    ("ServiceNow Developer", "enterprise", "servicenow itsm javascript glide workflows cmdb"),
+    ("Blockchain Developer", "niche", "blockchain solidity ethereum smart contracts web3 hardhat"),
+    ("Game Developer", "niche", "unity c# unreal engine c++ game design 3d"),
+    ("Technical Support Engineer", "support", "technical support troubleshooting customer support ticketing windows networking sql"),
+    ("Product Manager", "product", "product management roadmap user research stakeholders agile prd analytics a/b testing"),
+    ("Scrum Master", "product", "scrum agile sprint planning jira kanban retrospectives safe"),
+    ("UI/UX Designer", "design", "ui ux figma adobe xd wireframes prototyping user research design systems"),
+    ("Solutions Architect", "architecture", "solution architecture cloud aws azure microservices system design integration"),
+    ("Engineering Manager", "management", "engineering management team leadership hiring delivery system design mentoring agile"),
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#./]+")
+
+
+def _ngrams(text: str) -> List[str]:
+    grams = []
+    lo, hi = NGRAM_RANGE
+    for tok in _TOKEN_RE.findall(text.lower()):
+        w = f" {tok} "
+        for n in range(lo, hi + 1):
+            if len(w) < n:
+                break
+            grams.extend(w[i:i + n] for i in range(len(w) - n + 1))
+    return grams
+
+
+def term_frequencies(text: str) -> np.ndarray:
+    """Hashed, sublinear (1 + log tf) n-gram counts as a dense float32 vector."""
+    idx = np.fromiter((zlib.crc32(g.encode("utf-8")) % N_FEATURES for g in _ngrams(text)), dtype=np.int64)
+    counts = np.bincount(idx, minlength=N_FEATURES).astype(np.float32)
+    nz = counts > 0
+    counts[nz] = 1.0 + np.log(counts[nz])
+    return counts
+
+
+def _profile_document(title: str, skills: str) -> str:
+    return " ".join([title] * TITLE_WEIGHT + [skills])
+
+
+def vocabulary_version() -> str:
+    blob = json.dumps([ROLE_PROFILES, N_FEATURES, NGRAM_RANGE, TITLE_WEIGHT]).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+def build_index() -> Tuple[np.ndarray, np.ndarray]:
+    """(L2-normalised TF-IDF matrix [roles × features], idf vector)."""
+    tf = np.vstack([term_frequencies(_profile_document(t, s)) for t, _, s in ROLE_PROFILES])
+    df = (tf > 0).sum(axis=0)
+    idf = (np.log((1 + len(ROLE_PROFILES)) / (1 + df)) + 1.0).astype(np.float32)
+    matrix = tf * idf
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    return matrix.astype(np.float32), idf
+
+
+def write_index(path: Path = INDEX_PATH) -> Path:
+    matrix, idf = build_index()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, matrix)
+    np.save(path.with_suffix(".idf.npy"), idf)
+    path.with_suffix(".json").write_text(json.dumps({
+        "version": vocabulary_version(),
+        "titles": [t for t, _, _ in ROLE_PROFILES],
+        "families": [f for _, f, _ in ROLE_PROFILES],
+    }))
+    return path
+
+
+class RoleSuggester:
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.source = ""   # "mmap" or "memory", for stats
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            meta_path = self.path.with_suffix(".json")
+            try:
+                meta = json.loads(meta_path.read_text())
+                if meta.get("version") != vocabulary_version():
+                    raise ValueError("stale role index")
+                self.matrix = np.load(self.path, mmap_mode="r")
+                self.idf = np.load(self.path.with_suffix(".idf.npy"))
+                self.titles = meta["titles"]
+                self.families = meta["families"]
+                self.source = "mmap"
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Role index not loaded from {self.path} ({e}); building in memory. "
+                      "Run `python role_suggester.py --build` to precompute it.")
+                self.matrix, self.idf = build_index()
+                self.titles = [t for t, _, _ in ROLE_PROFILES]
+                self.families = [f for _, f, _ in ROLE_PROFILES]
+                self.source = "memory"
+            self._loaded = True
+
+    def vectorize(self, text: str) -> np.ndarray:
+        self._load()
+        v = term_frequencies(text) * self.idf
+        return v / max(float(np.linalg.norm(v)), 1e-12)
+
+    def suggest(self, resume_text: str, target_role: Optional[str] = None, k: int = 8,
+                per_family: int = 2, min_score: float = 0.02, relative_cutoff: float = 0.3) -> List[Dict[str, object]]:
+        """Top-k titles by cosine similarity, at most `per_family` from each role family.
+
+        Titles scoring below `relative_cutoff` × the best score are dropped, so a
+        short resume yields a few strong titles instead of eight weak ones.
+
+        A target role the user already searches for is blended into the query
+        so nearby titles rank higher when the resume supports them.
+        """
+        q = self.vectorize(resume_text)
+        if target_role:
+            q = q + 0.5 * self.vectorize(target_role)
+            q /= max(float(np.linalg.norm(q)), 1e-12)
+        scores = np.asarray(self.matrix @ q)
+        floor = max(min_score, relative_cutoff * float(scores.max(initial=0.0)))
+        picked: List[Dict[str, object]] = []
+        per = {}
+        for i in np.argsort(-scores):
+            if scores[i] < floor or len(picked) >= k:
+                break
+            fam = self.families[i]
+            if per.get(fam, 0) >= per_family:
+                continue
+            per[fam] = per.get(fam, 0) + 1
+            picked.append({"title": self.titles[i], "family": fam, "score": round(float(scores[i]), 4)})
+        return picked
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build or query the local role-suggestion index.")
+    parser.add_argument("--build", action="store_true", help=f"write the index to {INDEX_PATH}")
+    parser.add_argument("--query", help="resume text (or @path to a text file) to suggest roles for")
+    args = parser.parse_args()
+
+    if args.build:
+        out = write_index()
+        print(f"Wrote {out} ({len(ROLE_PROFILES)} roles × {N_FEATURES} features, version {vocabulary_version()})")
+    if args.query:
+        text = Path(args.query[1:]).read_text() if args.query.startswith("@") else args.query
+        suggester = RoleSuggester()
+        started = time.perf_counter()
+        results = suggester.suggest(text)
+        print(f"{(time.perf_counter() - started) * 1000:.1f} ms ({suggester.source})")
+        for r in results:
+            print(f"  {r['score']:.3f}  {r['title']}  [{r['family']}]")
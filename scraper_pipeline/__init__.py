@@ -0,0 +1,10 @@
+"""
+Sidekick — Scraper Pipeline
+=========================================
+  extractors/  → one module per job source, all returning raw records
+  runner.py    → runs extractors concurrently with per-source deadlines and reports yield / timing
+"""
+
+from .runner import format_report, run_extractors
+
+__all__ = ["format_report", "run_extractors"]
@@ -0,0 +1,46 @@
+"""
+Per-source job extractors. Each module exposes an `Extractor` subclass and an
+`extract_<source>_jobs(keyword, location, limit=None, **settings)` helper that
+returns raw records (see base.py).
+"""
+
+from .apna import ApnaExtractor, extract_apna_jobs
+from .base import Extractor, raw_record
+from .careersites import CareerSitesExtractor, extract_careersites_jobs
+from .cutshort import CutshortExtractor, extract_cutshort_jobs
+from .glassdoor import GlassdoorExtractor, extract_glassdoor_jobs
+from .hirist import HiristExtractor, extract_hirist_jobs
+from .indeed import IndeedExtractor, extract_indeed_jobs
+from .linkedin import LinkedInExtractor, extract_linkedin_jobs, parse_linkedin_cards
+from .naukri import NaukriExtractor, extract_naukri_jobs
+from .wellfound import WellfoundExtractor, extract_wellfound_jobs
+from .workindia import WorkIndiaExtractor, extract_workindia_jobs
+from .yahoo import YahooSiteExtractor, parse_yahoo_results
+
+# Registry key → extractor class, in the order sources are listed on the dashboard.
+EXTRACTORS = {
+    cls.name: cls
+    for cls in (
+        LinkedInExtractor, NaukriExtractor, IndeedExtractor, HiristExtractor, GlassdoorExtractor,
+        CutshortExtractor, WellfoundExtractor, ApnaExtractor, WorkIndiaExtractor, CareerSitesExtractor,
+    )
+}
+
+
+def get_extractor(name: str, http=None, **settings) -> Extractor:
+    try:
+        cls = EXTRACTORS[name.lower()]
+    except KeyError:
+        raise KeyError(f"Unknown extractor {name!r}; expected one of {', '.join(EXTRACTORS)}") from None
+    return cls(http=http, **settings)
+
+
+__all__ = [
+    "EXTRACTORS", "Extractor", "YahooSiteExtractor", "get_extractor", "raw_record",
+    "parse_linkedin_cards", "parse_yahoo_results",
+    "LinkedInExtractor", "NaukriExtractor", "IndeedExtractor", "HiristExtractor", "GlassdoorExtractor",
+    "CutshortExtractor", "WellfoundExtractor", "ApnaExtractor", "WorkIndiaExtractor", "CareerSitesExtractor",
+    "extract_linkedin_jobs", "extract_naukri_jobs", "extract_indeed_jobs", "extract_hirist_jobs",
+    "extract_glassdoor_jobs", "extract_cutshort_jobs", "extract_wellfound_jobs", "extract_apna_jobs",
+    "extract_workindia_jobs", "extract_careersites_jobs",
+]
@@ -0,0 +1,19 @@
+"""Apna listings (mostly entry-level and blue-collar roles)."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .base import extract_with
+from .yahoo import YahooSiteExtractor
+
+
+class ApnaExtractor(YahooSiteExtractor):
+    name = "apna"
+    source = "Apna"
+    site = "apna.co"
+    max_pages = 3
+
+
+def extract_apna_jobs(keyword: str, location: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    return extract_with(ApnaExtractor, keyword, location, limit=limit, **kwargs)
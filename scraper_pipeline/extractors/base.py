@@ -0,0 +1,151 @@
+"""
+Sidekick — Extractor Interface
+=========================================
+Every job source is an `Extractor` subclass with two source-specific parts:
+
+  page_request(keyword, location, page) → URL, params, headers for one results page
+  parse(html, location)                 → raw records, or None past the last page
+
+`fetch_page()` and `extract()` are shared: pages go through the HTTP page
+cache, paging stops at the limit, an empty page or the deadline, and a
+courtesy delay separates upstream requests to the same source.
+
+Raw records are plain dicts, before any API shaping:
+
+  raw_title, raw_company, raw_location, link, snippet, posted, posted_at, source
+
+Missing values are "" (callers pick their own placeholders).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+}
+
+_default_http = None
+_default_http_lock = threading.Lock()
+
+
+def default_http():
+    """Shared on-disk page cache for callers that do not pass their own (e.g. test scripts)."""
+    global _default_http
+    with _default_http_lock:
+        if _default_http is None:
+            from page_cache import PageCache
+            _default_http = PageCache()
+        return _default_http
+
+
+def raw_record(**fields: Any) -> Dict[str, Any]:
+    record = {
+        "raw_title": "", "raw_company": "", "raw_location": "",
+        "link": "", "snippet": "", "posted": "", "posted_at": "", "source": "",
+    }
+    record.update({k: v for k, v in fields.items() if v is not None})
+    return record
+
+
+class Extractor:
+    """One job source. Class attributes are the per-source tuning knobs."""
+
+    name = "abstract"        # registry key
+    source = ""              # display name written into records
+    page_size = 10           # results per page, used for offsets
+    max_pages = 5
+    limit = 50               # default record cap per extract()
+    page_delay = 0.5         # seconds between upstream pages of this source
+    time_budget = 20.0       # seconds allowed per extract() (runner / extract_with default)
+    timeout = 10             # per-request timeout
+
+    def __init__(self, http=None, **overrides: Any):
+        """`http` is anything with PageCache.get()'s signature; `overrides` replace the tuning knobs."""
+        self.http = http or default_http()
+        for k, v in overrides.items():
+            if not hasattr(type(self), k):
+                raise AttributeError(f"{type(self).__name__} has no setting {k!r}")
+            setattr(self, k, v)
+
+    # ── Source-specific ──────────────────────────
+    def page_request(self, keyword: str, location: str, page: int,
+                     recent_first: bool = False) -> Tuple[str, Optional[Dict], Dict]:
+        raise NotImplementedError
+
+    def parse(self, html: str, location: str) -> Optional[List[Dict[str, Any]]]:
+        raise NotImplementedError
+
+    def is_empty(self, body: str) -> bool:
+        """True for a 200 page with no results (cached briefly as a dead end)."""
+        return False
+
+    # ── Shared ───────────────────────────────────
+    def fetch_page(self, keyword: str, location: str, page: int, recent_first: bool = False,
+                   max_age: Optional[float] = None):
+        """Fetch and parse one page → (records or None when paging should stop, response)."""
+        url, params, headers = self.page_request(keyword, location, page, recent_first=recent_first)
+        res = self.http.get(url, params=params, headers=headers, timeout=self.timeout,
+                            max_age=max_age, negative_if=self.is_empty)
+        if res.status_code != 200:
+            return None, res
+        return self.parse(res.text, location), res
+
+    def extract(
+        self,
+        keyword: str,
+        location: str,
+        limit: Optional[int] = None,
+        deadline: Optional[float] = None,
+        out: Optional[List[Dict[str, Any]]] = None,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Page through results until `limit` records, the last page, or `deadline`.
+
+        `deadline` is a time.monotonic() value. Records are appended to `out` as
+        each page is parsed, so a caller that gives up early still sees them;
+        `stats` (if given) is filled with pages / cached_pages / raw / error.
+        """
+        limit = limit or self.limit
+        out = [] if out is None else out
+        stats = {} if stats is None else stats
+        stats.update(pages=0, cached_pages=0, raw=0, error="")
+        seen = set()
+        for page in range(self.max_pages):
+            if len(out) >= limit or (deadline is not None and time.monotonic() >= deadline):
+                break
+            try:
+                records, res = self.fetch_page(keyword, location, page)
+            except Exception as e:
+                stats["error"] = str(e)
+                print(f"[{self.name}] page {page} error: {e}")
+                break
+            stats["pages"] += 1
+            from_cache = getattr(res, "from_cache", False)
+            if from_cache:
+                stats["cached_pages"] += 1
+            if records is None:
+                break
+            stats["raw"] += len(records)
+            for r in records:
+                if r["link"] and r["link"] in seen:
+                    continue
+                seen.add(r["link"])
+                out.append(r)
+                if len(out) >= limit:
+                    break
+            if not from_cache and self.page_delay:
+                remaining = self.page_delay if deadline is None else min(self.page_delay, deadline - time.monotonic())
+                if remaining > 0:
+                    time.sleep(remaining)
+        return out
+
+
+def extract_with(cls: type, keyword: str, location: str, limit: Optional[int] = None,
+                 deadline: Optional[float] = None, http=None, **overrides: Any) -> List[Dict[str, Any]]:
+    """Module-level `extract_<source>_jobs()` helpers all delegate here."""
+    if deadline is None:
+        deadline = time.monotonic() + overrides.get("time_budget", cls.time_budget)
+    return cls(http=http, **overrides).extract(keyword, location, limit=limit, deadline=deadline)
@@ -0,0 +1,41 @@
+"""
+Company career sites hosted on applicant-tracking systems (Lever, Greenhouse,
+Workable, Ashby). Each ATS host is a separate Yahoo `site:` search; pages are
+taken host by host, `pages_per_site` deep.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .base import extract_with
+from .yahoo import YahooSiteExtractor, parse_yahoo_results
+
+CAREER_SITES = ["jobs.lever.co", "boards.greenhouse.io", "apply.workable.com", "jobs.ashbyhq.com"]
+
+
+class CareerSitesExtractor(YahooSiteExtractor):
+    name = "careersites"
+    source = "Career Site"
+    site = CAREER_SITES[0]
+    sites = CAREER_SITES
+    pages_per_site = 2
+    max_pages = len(CAREER_SITES) * 2
+
+    def fetch_page(self, keyword: str, location: str, page: int, recent_first: bool = False,
+                   max_age: Optional[float] = None):
+        site = self.sites[(page // self.pages_per_site) % len(self.sites)]
+        url, params, headers = self.site_request(site, keyword, location, page % self.pages_per_site)
+        res = self.http.get(url, params=params, headers=headers, timeout=self.timeout,
+                            max_age=max_age, negative_if=self.is_empty)
+        # One host running dry must not end the whole extraction, so never return None.
+        if res.status_code != 200:
+            return [], res
+        records = parse_yahoo_results(res.text, location, site) or []
+        for r in records:
+            r["source"] = self.source
+        return records, res
+
+
+def extract_careersites_jobs(keyword: str, location: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    return extract_with(CareerSitesExtractor, keyword, location, limit=limit, **kwargs)
@@ -0,0 +1,20 @@
+"""Cutshort startup listings (small board: few pages are worth fetching)."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .base import extract_with
+from .yahoo import YahooSiteExtractor
+
+
+class CutshortExtractor(YahooSiteExtractor):
+    name = "cutshort"
+    source = "Cutshort"
+    site = "cutshort.io"
+    max_pages = 2
+    time_budget = 10.0
+
+
+def extract_cutshort_jobs(keyword: str, location: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    return extract_with(CutshortExtractor, keyword, location, limit=limit, **kwargs)
@@ -0,0 +1,19 @@
+"""Glassdoor India listings."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .base import extract_with
+from .yahoo import YahooSiteExtractor
+
+
+class GlassdoorExtractor(YahooSiteExtractor):
+    name = "glassdoor"
+    source = "Glassdoor"
+    site = "glassdoor.co.in"
+    max_pages = 3
+
+
+def extract_glassdoor_jobs(keyword: str, location: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    return extract_with(GlassdoorExtractor, keyword, location, limit=limit, **kwargs)
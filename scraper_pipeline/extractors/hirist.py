@@ -0,0 +1,19 @@
+"""Hirist (tech-only board)."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .base import extract_with
+from .yahoo import YahooSiteExtractor
+
+
+class HiristExtractor(YahooSiteExtractor):
+    name = "hirist"
+    source = "Hirist"
+    site = "hirist.tech"
+    max_pages = 3
+
+
+def extract_hirist_jobs(keyword: str, location: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    return extract_with(HiristExtractor, keyword, location, limit=limit, **kwargs)
@@ -0,0 +1,18 @@
+"""Indeed listings on any regional host (in.indeed.com, www.indeed.com, …)."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .base import extract_with
+from .yahoo import YahooSiteExtractor
+
+
+class IndeedExtractor(YahooSiteExtractor):
+    name = "indeed"
+    source = "Indeed"
+    site = "indeed.com"
+
+
+def extract_indeed_jobs(keyword: str, location: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    return extract_with(IndeedExtractor, keyword, location, limit=limit, **kwargs)
@@ -0,0 +1,71 @@
+"""
+Sidekick — LinkedIn Extractor
+=========================================
+LinkedIn's guest jobs API returns 25 result cards per page as an HTML
+fragment (`start` = 0, 25, 50, …). `sortBy=DD` orders newest first, which
+incremental refreshes rely on.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from .base import DEFAULT_HEADERS, Extractor, extract_with, raw_record
+
+SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+
+
+def parse_linkedin_cards(html: str, location: str) -> Optional[List[Dict[str, Any]]]:
+    """Parse one guest-API page into raw records. Returns None when the page has no cards."""
+    soup = BeautifulSoup(html, 'html.parser')
+    cards = soup.find_all('li')
+    if not cards:
+        return None
+
+    records = []
+    for card in cards:
+        title_elem = card.find('h3', class_='base-search-card__title')
+        if not title_elem:
+            continue
+
+        company_elem = card.find('h4', class_='base-search-card__subtitle')
+        location_elem = card.find('span', class_='job-search-card__location')
+        link_elem = card.find('a', class_='base-card__full-link')
+        time_elem = card.find('time')
+
+        records.append(raw_record(
+            raw_title=title_elem.text.strip(),
+            raw_company=company_elem.text.strip() if company_elem else "",
+            raw_location=location_elem.text.strip() if location_elem else "",
+            link=link_elem['href'].split('?')[0] if link_elem and 'href' in link_elem.attrs else "",
+            posted=time_elem.text.strip() if time_elem else "",
+            posted_at=time_elem.get("datetime", "") if time_elem else "",
+            source="LinkedIn",
+        ))
+    return records
+
+
+class LinkedInExtractor(Extractor):
+    name = "linkedin"
+    source = "LinkedIn"
+    page_size = 25
+    max_pages = 4
+    limit = 40
+
+    def page_request(self, keyword: str, location: str, page: int, recent_first: bool = False):
+        params = {"keywords": keyword, "location": location, "start": page * self.page_size}
+        if recent_first:
+            params["sortBy"] = "DD"  # date descending, so known listings mark the end of new ones
+        return SEARCH_URL, params, {**DEFAULT_HEADERS, "X-Requested-With": "XMLHttpRequest"}
+
+    def is_empty(self, body: str) -> bool:
+        return "base-search-card__title" not in body
+
+    def parse(self, html: str, location: str) -> Optional[List[Dict[str, Any]]]:
+        return parse_linkedin_cards(html, location)
+
+
+def extract_linkedin_jobs(keyword: str, location: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    return extract_with(LinkedInExtractor, keyword, location, limit=limit, **kwargs)
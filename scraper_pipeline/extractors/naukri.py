@@ -0,0 +1,18 @@
+"""Naukri.com listings (job-listings-* pages; category pages are skipped)."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .base import extract_with
+from .yahoo import YahooSiteExtractor
+
+
+class NaukriExtractor(YahooSiteExtractor):
+    name = "naukri"
+    source = "Naukri"
+    site = "naukri.com"
+
+
+def extract_naukri_jobs(keyword: str, location: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    return extract_with(NaukriExtractor, keyword, location, limit=limit, **kwargs)
@@ -0,0 +1,20 @@
+"""Wellfound (formerly AngelList Talent) startup listings."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .base import extract_with
+from .yahoo import YahooSiteExtractor
+
+
+class WellfoundExtractor(YahooSiteExtractor):
+    name = "wellfound"
+    source = "Wellfound"
+    site = "wellfound.com"
+    max_pages = 2
+    time_budget = 10.0
+
+
+def extract_wellfound_jobs(keyword: str, location: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    return extract_with(WellfoundExtractor, keyword, location, limit=limit, **kwargs)
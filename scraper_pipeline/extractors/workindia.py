@@ -0,0 +1,19 @@
+"""WorkIndia listings."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .base import extract_with
+from .yahoo import YahooSiteExtractor
+
+
+class WorkIndiaExtractor(YahooSiteExtractor):
+    name = "workindia"
+    source = "Workindia"
+    site = "workindia.in"
+    max_pages = 3
+
+
+def extract_workindia_jobs(keyword: str, location: str, limit: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+    return extract_with(WorkIndiaExtractor, keyword, location, limit=limit, **kwargs)
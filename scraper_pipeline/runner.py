@@ -0,0 +1,102 @@
+"""
+Sidekick — Concurrent Extractor Runner
+=========================================
+Runs every selected extractor at once, each under its own deadline:
+
+  1. start     → one thread per extractor, deadline = now + its time budget
+  2. soft stop → extractors stop paging on their own once the deadline passes
+  3. hard stop → an extractor still blocked in a request `grace` seconds after
+                 its deadline is reported as timed out with whatever records
+                 it had already parsed
+  4. report    → per source: records, unique links, pages (upstream / cached),
+                 raw results, elapsed time, jobs per page, errors
+
+Per-source settings (max_pages, limit, time_budget, page_delay, …) can be
+overridden per run, so each source is tuned separately.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .extractors import EXTRACTORS, get_extractor
+
+
+def run_extractors(
+    keyword: str,
+    location: str,
+    names: Optional[Iterable[str]] = None,
+    limit: Optional[int] = None,
+    settings: Optional[Dict[str, Dict[str, Any]]] = None,
+    http=None,
+    grace: float = 5.0,
+) -> List[Dict[str, Any]]:
+    """Run extractors concurrently and return one report dict per source (input order).
+
+    `settings` maps extractor name → overrides, e.g. {"linkedin": {"max_pages": 2, "time_budget": 8}}.
+    """
+    names = [n.lower() for n in (names or EXTRACTORS)]
+    settings = settings or {}
+    extractors = {n: get_extractor(n, http=http, **settings.get(n, {})) for n in names}
+
+    started = time.monotonic()
+    state: Dict[str, Dict[str, Any]] = {}
+    for n, ex in extractors.items():
+        state[n] = {"records": [], "stats": {}, "deadline": started + ex.time_budget, "finished_at": None}
+
+    def run_one(n: str) -> None:
+        s = state[n]
+        try:
+            extractors[n].extract(keyword, location, limit=limit, deadline=s["deadline"],
+                                  out=s["records"], stats=s["stats"])
+        finally:
+            s["finished_at"] = time.monotonic()
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(names)), thread_name_prefix="extractor")
+    futures = {executor.submit(run_one, n): n for n in names}
+    hard_stop = max(s["deadline"] for s in state.values()) + grace if state else started
+    done, not_done = concurrent.futures.wait(futures, timeout=max(0.0, hard_stop - time.monotonic()))
+    # Stragglers keep their thread until the blocking request returns; nothing waits for them.
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    reports = []
+    for n in names:
+        s = state[n]
+        stats = s["stats"]
+        future = next(f for f, name in futures.items() if name == n)
+        error = stats.get("error", "")
+        if future in done and future.exception() is not None:
+            error = str(future.exception())
+        finished = s["finished_at"]
+        records = list(s["records"])
+        pages = stats.get("pages", 0)
+        reports.append({
+            "source": extractors[n].source or n,
+            "name": n,
+            "count": len(records),
+            "unique": len({r["link"] for r in records if r.get("link")}),
+            "pages": pages,
+            "cached_pages": stats.get("cached_pages", 0),
+            "raw": stats.get("raw", 0),
+            "elapsed": round((finished or time.monotonic()) - started, 2),
+            "jobs_per_page": round(len(records) / pages, 2) if pages else 0.0,
+            "timed_out": finished is None or finished > s["deadline"] + grace,
+            "error": error,
+            "jobs": records,
+        })
+    return reports
+
+
+def format_report(reports: List[Dict[str, Any]]) -> str:
+    lines = [f"{'source':<12} {'jobs':>5} {'unique':>6} {'pages':>5} {'cached':>6} {'raw':>5} "
+             f"{'jobs/pg':>7} {'time s':>7}  status"]
+    for r in reports:
+        status = "timeout" if r["timed_out"] else ("error: " + r["error"][:40] if r["error"] else "ok")
+        lines.append(f"{r['source']:<12} {r['count']:>5} {r['unique']:>6} {r['pages']:>5} {r['cached_pages']:>6} "
+                     f"{r['raw']:>5} {r['jobs_per_page']:>7.2f} {r['elapsed']:>7.2f}  {status}")
+    total = sum(r["count"] for r in reports)
+    wall = max((r["elapsed"] for r in reports), default=0.0)
+    lines.append(f"{'total':<12} {total:>5}   wall {wall:.2f}s")
+    return "\n".join(lines)
@@ -16,20 +16,41 @@ import re
 import uuid
 import datetime
 import csv
+import hashlib
+import hmac
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from fastapi import FastAPI, File, Form, HTTPException, UploadFile, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, EmailStr, HttpUrl, validator, Field
-from sqlalchemy import create_engine, Column, String, Integer, DateTime
+from sqlalchemy import create_engine, event, inspect, text as sql_text, Column, String, Integer, DateTime, Text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from pypdf import PdfReader
 import requests
-from bs4 import BeautifulSoup
+
+from admission import AdmissionController, AdmissionMiddleware, RouteClass
+from diagnostics import RequestTracker, StallWatchdog, sample_profile
+from fanout_planner import Branch, FanoutPlanner, YieldStats
+from http_utils import (
+    CompressionMiddleware, FastJSONResponse, PrecompressedStaticFiles, dumps_bytes, etag_json_response,
+)
+from jd_digest import JDDigestStore
+from micro_batcher import MicroBatcher
+from job_records import pack_jobs, unpack_jobs
+from page_cache import CachedPage, PageCache
+from prefetch import PrefetchScheduler, RateLimits
+from profile_compactor import DEFAULT_TOKEN_BUDGET, ProfileCompactor
+from role_suggester import RoleSuggester
+from scraper_pipeline.extractors import EXTRACTORS, LinkedInExtractor, YahooSiteExtractor
+from state_backend import make_backend
+from task_queue import (
+    PRIORITY_LOW, PRIORITY_NORMAL, TaskCancelled, TaskContext, TaskQueue,
+)
 
 import os
 from dotenv import load_dotenv
@@ -50,6 +71,14 @@ except ImportError:
 # ─────────────────────────────────────────────
 DATABASE_URL = "sqlite:///./database.db"
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+@event.listens_for(engine, "connect")
+def _sqlite_pragmas(dbapi_conn, _record):
+    # WAL + busy timeout so several uvicorn workers can share database.db.
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA busy_timeout=5000")
+    cur.close()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -59,24 +88,137 @@ class DBProfile(Base):
     profile_json = Column(String, default="{}")
     resume_filename = Column(String, default="")
     resume_char_count = Column(Integer, default=0)
+    resume_text = Column(Text, default="")
     apollo_key = Column(String, default="")
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
 Base.metadata.create_all(bind=engine)
 
+def _ensure_columns():
+    """create_all() never alters existing tables; add columns introduced after first release."""
+    existing = {c["name"] for c in inspect(engine).get_columns("profiles")}
+    with engine.begin() as conn:
+        if "resume_text" not in existing:
+            conn.execute(sql_text("ALTER TABLE profiles ADD COLUMN resume_text TEXT DEFAULT ''"))
+
+_ensure_columns()
+
 # ─────────────────────────────────────────────
 #  Config
 # ─────────────────────────────────────────────
 ENV_PATH   = Path(".env")
 STATIC_DIR = Path("static")
+# build_assets.py output: fingerprinted / precompressed assets and the rewritten index.html
+DIST_DIR = STATIC_DIR / "dist"
+TASK_WORKERS = int(os.environ.get("SIDEKICK_TASK_WORKERS", "2"))
+# Finished task rows (each holds its full result) are deleted this long after they finish
+TASK_RETENTION_HOURS = float(os.environ.get("SIDEKICK_TASK_RETENTION_HOURS", "24"))
+SERVER_WORKERS = int(os.environ.get("SIDEKICK_WORKERS", "1"))
+# memory:// for a single process; sqlite:///./state.db (or any shared URL) when SERVER_WORKERS > 1
+STATE_URL = os.environ.get("SIDEKICK_STATE_URL", "memory://" if SERVER_WORKERS == 1 else "sqlite:///./state.db")
+# Bounds for session caches: entry caps and TTLs (seconds since an entry was last written)
+JOBS_CACHE_MAX_SESSIONS = int(os.environ.get("SIDEKICK_JOBS_CACHE_MAX_SESSIONS", "500"))
+JOBS_CACHE_TTL = float(os.environ.get("SIDEKICK_JOBS_CACHE_TTL", str(24 * 3600)))
+JOBS_CACHE_MAX_JOBS = int(os.environ.get("SIDEKICK_JOBS_CACHE_MAX_JOBS", "300"))  # per session, Applied jobs excluded
+APPLIED_LOG_MAX_SESSIONS = int(os.environ.get("SIDEKICK_APPLIED_LOG_MAX_SESSIONS", "2000"))
+APPLIED_LOG_TTL = float(os.environ.get("SIDEKICK_APPLIED_LOG_TTL", str(7 * 24 * 3600)))
+WATERMARK_MAX_KEYS = int(os.environ.get("SIDEKICK_WATERMARK_MAX_KEYS", "5000"))
+WATERMARK_TTL = float(os.environ.get("SIDEKICK_WATERMARK_TTL", str(30 * 24 * 3600)))
+PAGE_CACHE_DIR = os.environ.get("SIDEKICK_PAGE_CACHE_DIR", ".cache/pages")
+PAGE_CACHE_TTL = float(os.environ.get("SIDEKICK_PAGE_CACHE_TTL", "1800"))
+PAGE_CACHE_NEGATIVE_TTL = float(os.environ.get("SIDEKICK_PAGE_CACHE_NEGATIVE_TTL", "300"))
+# Incremental refreshes look for new postings, so they accept only recently fetched pages
+PAGE_CACHE_INCREMENTAL_MAX_AGE = float(os.environ.get("SIDEKICK_PAGE_CACHE_INCREMENTAL_MAX_AGE", "300"))
+WATERMARK_MAX_LINKS = int(os.environ.get("SIDEKICK_WATERMARK_MAX_LINKS", "500"))
+COMPRESS_MIN_BYTES = int(os.environ.get("SIDEKICK_COMPRESS_MIN_BYTES", "1024"))
+PROFILE_TOKEN_BUDGET = int(os.environ.get("SIDEKICK_PROFILE_TOKEN_BUDGET", str(DEFAULT_TOKEN_BUDGET)))
+# Live scraping search: upstream page fetches per search, unique jobs wanted, concurrent fetches
+SEARCH_FETCH_BUDGET = int(os.environ.get("SIDEKICK_SEARCH_FETCH_BUDGET", "40"))
+SEARCH_TARGET_JOBS = int(os.environ.get("SIDEKICK_SEARCH_TARGET_JOBS", "100"))
+SEARCH_PARALLELISM = int(os.environ.get("SIDEKICK_SEARCH_PARALLELISM", "10"))
+# Local role suggestions: precomputed index (python role_suggester.py --build) and titles returned
+ROLE_INDEX_PATH = os.environ.get("SIDEKICK_ROLE_INDEX", "data/role_index.npy")
+ROLE_SUGGESTIONS = int(os.environ.get("SIDEKICK_ROLE_SUGGESTIONS", "8"))
+# analyze-job micro-batching: hold requests this long to pack up to MAX of them into one Gemini prompt (0 = off)
+ANALYZE_BATCH_WINDOW_MS = float(os.environ.get("SIDEKICK_ANALYZE_BATCH_WINDOW_MS", "40"))
+ANALYZE_BATCH_MAX = int(os.environ.get("SIDEKICK_ANALYZE_BATCH_MAX", "8"))
+# Admission control: concurrent requests per route class (process-wide / per session), overall cap,
+# and slots of that cap only interactive (extension / suggest) requests may use
+AI_CONCURRENCY = int(os.environ.get("SIDEKICK_AI_CONCURRENCY", "8"))
+AI_PER_SESSION = int(os.environ.get("SIDEKICK_AI_PER_SESSION", "3"))
+SUGGEST_CONCURRENCY = int(os.environ.get("SIDEKICK_SUGGEST_CONCURRENCY", "4"))
+SEARCH_CONCURRENCY = int(os.environ.get("SIDEKICK_SEARCH_CONCURRENCY", "4"))
+ADMISSION_TOTAL = int(os.environ.get("SIDEKICK_ADMISSION_TOTAL", "12"))
+ADMISSION_INTERACTIVE_RESERVE = int(os.environ.get("SIDEKICK_ADMISSION_INTERACTIVE_RESERVE", "4"))
+# Diagnostics: loop stalls longer than this are logged; /api/diagnostics/* needs X-Admin-Token (disabled when unset)
+STALL_THRESHOLD_MS = float(os.environ.get("SIDEKICK_STALL_THRESHOLD_MS", "250"))
+ADMIN_TOKEN = os.environ.get("SIDEKICK_ADMIN_TOKEN", "")
+PROFILE_MAX_SECONDS = float(os.environ.get("SIDEKICK_PROFILE_MAX_SECONDS", "60"))
+# Background prefetch of saved searches: sessions seen within the window get results refreshed once
+# they are older than REFRESH_AFTER; refreshes per minute (each one is a model-backed search); paused
+# while this many admission-controlled requests plus interactive search tasks are in flight
+PREFETCH_ENABLED = os.environ.get("SIDEKICK_PREFETCH", "1") != "0"
+PREFETCH_INTERVAL = float(os.environ.get("SIDEKICK_PREFETCH_INTERVAL", "60"))
+PREFETCH_ACTIVE_WINDOW = float(os.environ.get("SIDEKICK_PREFETCH_ACTIVE_WINDOW", str(3 * 24 * 3600)))
+PREFETCH_REFRESH_AFTER = float(os.environ.get("SIDEKICK_PREFETCH_REFRESH_AFTER", "1800"))
+PREFETCH_PER_TICK = int(os.environ.get("SIDEKICK_PREFETCH_PER_TICK", "5"))
+PREFETCH_MODEL_RPM = float(os.environ.get("SIDEKICK_PREFETCH_MODEL_RPM", "2"))
+PREFETCH_PAUSE_INFLIGHT = int(os.environ.get("SIDEKICK_PREFETCH_PAUSE_INFLIGHT", "2"))
+
+app = FastAPI(title="Sidekick", version="2.0.0", default_response_class=FastJSONResponse)
+# Innermost, so stall reports list only requests whose handlers are actually running
+watchdog = StallWatchdog(threshold=STALL_THRESHOLD_MS / 1000)
+app.add_middleware(RequestTracker, watchdog=watchdog)
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESS_MIN_BYTES)
+
+# Gemini- and scraper-backed routes go through admission control; everything else is unmetered.
+admission = AdmissionController([
+    RouteClass("ai", limit=AI_CONCURRENCY, per_session=AI_PER_SESSION, priority=0, max_wait=15.0),
+    RouteClass("suggest", limit=SUGGEST_CONCURRENCY, per_session=1, priority=1, queue_limit=16, max_wait=5.0),
+    RouteClass("search", limit=SEARCH_CONCURRENCY, per_session=1, priority=5, interactive=False,
+               queue_limit=8, session_queue=0, max_wait=5.0),
+], total_limit=ADMISSION_TOTAL, interactive_reserve=ADMISSION_INTERACTIVE_RESERVE)
+
+_ADMISSION_ROUTES = [
+    (re.compile(r"^/api/ai/[^/]+/(?P<sid>[^/]+)$"), "ai"),
+    (re.compile(r"^/api/suggest-roles$"), "suggest"),
+    (re.compile(r"^/api/jobs/search/(?P<sid>[^/]+)$"), "search"),
+    (re.compile(r"^/api/tasks/search/(?P<sid>[^/]+)$"), "search"),
+]
 
-app = FastAPI(title="Sidekick", version="2.0.0")
-app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+def _admission_route(scope):
+    """(route class, session key) for admission-controlled requests; sessionless routes key on client IP."""
+    if scope.get("method") != "POST":
+        return None
+    for pattern, name in _ADMISSION_ROUTES:
+        m = pattern.match(scope["path"])
+        if m:
+            sid = m.groupdict().get("sid") or (scope.get("client") or ("",))[0]
+            return name, sid
+    return None
+
+app.add_middleware(AdmissionMiddleware, controller=admission, classify=_admission_route)
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"],
+                   expose_headers=["ETag", "Retry-After"])
+_dist_files = PrecompressedStaticFiles(directory=DIST_DIR, check_dir=False)
+app.mount("/static/dist", _dist_files, name="dist")
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-# Memory caches for job fetching / logs
-_applied_log = {}
-_jobs_cache = {}
+# Session-scoped caches for job fetching / logs (visible to every worker when the backend is shared)
+state = make_backend(STATE_URL)
+_applied_log = state.namespace("applied_log", max_entries=APPLIED_LOG_MAX_SESSIONS, ttl_seconds=APPLIED_LOG_TTL,
+                               pack=pack_jobs, unpack=unpack_jobs)
+_jobs_cache = state.namespace("jobs", max_entries=JOBS_CACHE_MAX_SESSIONS, ttl_seconds=JOBS_CACHE_TTL,
+                              pack=pack_jobs, unpack=unpack_jobs)
+# Incremental-search watermarks, keyed "{sid}|{source}|{title}"
+_search_watermarks = state.namespace("search_watermarks", max_entries=WATERMARK_MAX_KEYS, ttl_seconds=WATERMARK_TTL)
+# Fan-out planner yield history, keyed "{source}|t{title_rank}|p{depth}" (shared across sessions)
+_fanout_stats = state.namespace("fanout_stats", max_entries=2000)
+# Last dashboard visit and last completed search per session: {"seen": ts, "refreshed": ts}
+_session_activity = state.namespace("session_activity", max_entries=JOBS_CACHE_MAX_SESSIONS,
+                                    ttl_seconds=PREFETCH_ACTIVE_WINDOW)
+# Title-similarity index for /api/suggest-roles (memory-mapped, loaded on first use)
+_role_suggester = RoleSuggester(ROLE_INDEX_PATH)
 
 # ---------------------------------------------------------
 # Pydantic Schemas with Validation
@@ -100,13 +242,24 @@ class SyncTrackerRequest(BaseModel):
 class InterviewPrepRequest(BaseModel):
     job_description: str
 
+class BundleRequest(BaseModel):
+    job_description: str
+    profile_data: Dict[str, Any] = {}
+    parts: List[str] = ["analysis", "interview_prep", "cover_letter", "recruiter_dm"]
+
+class ApplyJobsRequest(BaseModel):
+    job_ids: List[Any] = []
+
 # Pydantic schema validation removed in favor of dynamic JSON storage
 
 # ─────────────────────────────────────────────
 #  Routes — static
 # ─────────────────────────────────────────────
 @app.get("/", response_class=FileResponse)
-async def root():
+async def root(request: Request):
+    # Built index.html references fingerprinted assets; fall back to the source page when not built.
+    if (DIST_DIR / "index.html").is_file():
+        return await _dist_files.get_response("index.html", request.scope)
     return FileResponse("index.html")
 
 # ─────────────────────────────────────────────
@@ -135,6 +288,7 @@ def get_session(sid: str):
             profile_data = json.loads(prof.profile_json) if prof.profile_json else {}
         except:
             profile_data = {}
+        _touch_session(sid)
 
         return {
             "apollo_key_set": bool(prof.apollo_key),
@@ -201,7 +355,7 @@ async def upload_resume(sid: str, file: UploadFile = File(...)):
         raise HTTPException(400, "Only PDF files accepted.")
     content = await file.read()
     try:
-        text = extract_text_from_pdf(io.BytesIO(content))
+        text = await asyncio.to_thread(extract_text_from_pdf, io.BytesIO(content))
     except Exception as exc:
         raise HTTPException(422, f"PDF parse error: {exc}")
         
@@ -212,19 +366,20 @@ async def upload_resume(sid: str, file: UploadFile = File(...)):
             raise HTTPException(status_code=404, detail="Session not found")
         prof.resume_filename = file.filename
         prof.resume_char_count = len(text)
+        prof.resume_text = text
         db.commit()
         return {"ok": True, "filename": file.filename, "char_count": len(text), "preview": text[:800]}
     finally:
         db.close()
 
 @app.post("/api/suggest-roles")
-async def suggest_roles(target_role: str = Form(None), file: UploadFile = File(...)):
-    """Stateless endpoint: Extract text from resume and ask Gemini for role suggestions."""
+async def suggest_roles(target_role: str = Form(None), refine: bool = Form(False), file: UploadFile = File(...)):
+    """Stateless endpoint: suggest roles from the local title index, optionally refined by Gemini in the background."""
         
     content = await file.read()
     try:
         if file.filename.lower().endswith('.pdf'):
-            text = extract_text_from_pdf(io.BytesIO(content))
+            text = await asyncio.to_thread(extract_text_from_pdf, io.BytesIO(content))
         else:
             text = content.decode('utf-8', errors='ignore')
     except Exception as exc:
@@ -232,17 +387,31 @@ async def suggest_roles(target_role: str = Form(None), file: UploadFile = File(.
         
     if not text.strip():
         raise HTTPException(status_code=400, detail="Could not extract text from document.")
-        
 
+    matches = await asyncio.to_thread(_role_suggester.suggest, text[:5000], target_role, ROLE_SUGGESTIONS)
+    roles = [m["title"] for m in matches]
+    result = {"roles": roles, "matches": matches, "source": "local"}
+
+    if refine and _api_key:
+        result["refine_task_id"] = task_queue.submit(
+            "refine_roles", {"text": text[:5000], "target_role": target_role or "", "candidates": roles},
+            priority=PRIORITY_LOW,
+        )
+    return result
+
+
+def _refine_roles(payload: Dict[str, Any], ctx: TaskContext) -> Dict[str, Any]:
+    """Background task: let Gemini re-rank / adjust the locally suggested roles."""
     context_instruction = ""
-    if target_role:
-        context_instruction = f"The user frequently searches for '{target_role}'. Consider aligning some suggestions closer to this domain if their experience warrants it."
+    if payload.get("target_role"):
+        context_instruction = f"The user frequently searches for '{payload['target_role']}'. Consider aligning some suggestions closer to this domain if their experience warrants it."
 
     prompt = f"""
     You are an expert technical recruiter and career coach for the Indian Tech Job Market. Review the following resume text and suggest 5 to 10 highly specific, actionable job titles the candidate is qualified for. 
     
     Important Guidelines:
     {context_instruction}
+    - A keyword matcher already proposed these titles: {json.dumps(payload.get("candidates", []))}. Keep the ones that fit, drop the ones that don't, and add any that are missing.
     - Tailor the suggestions to prevalent job titles in India (e.g. prioritize 'Data Scientist', 'AI Developer', 'Software Development Engineer' over niche terms like 'LLM Engineer' unless their resume is exclusively focused on it).
     - Deduplicate similar titles (e.g., provide either 'AI Engineer' or 'AI Developer', not both).
     - Ensure practicality. Suggest roles they can realistically search and find on typical job boards like Naukri or Indeed.
@@ -252,24 +421,13 @@ async def suggest_roles(target_role: str = Form(None), file: UploadFile = File(.
     ["Senior Frontend Engineer", "React Developer", "UI/UX Developer"]
     
     Resume text:
-    {text[:5000]}
+    {payload["text"]}
     """
-    
-    models = ["gemini-2.0-flash-lite", "gemini-2.5-flash-lite", "gemini-2.0-flash"]
-    for m in models:
-        try:
-            model = genai.GenerativeModel(m)
-            response = model.generate_content(prompt)
-            raw_json = response.text.replace("```json", "").replace("```", "").strip()
-            import json
-            roles = json.loads(raw_json)
-            return {"roles": roles}
-        except Exception as e:
-            if "429" in str(e):
-                continue
-            print(f"Model {m} failed for suggestions: {e}")
-            
-    raise HTTPException(status_code=500, detail="Failed to parse suggestions from Gemini.")
+    ctx.report(0.1, "Asking Gemini")
+    roles = json.loads(_strip_json_fence(_ask_gemini(prompt, api_key=_api_key)))
+    if not isinstance(roles, list) or not roles:
+        raise ValueError("Gemini returned no roles")
+    return {"roles": [str(r) for r in roles], "source": "gemini"}
 
 # ─────────────────────────────────────────────
 #  Job Search  (Gemini-powered)
@@ -338,321 +496,187 @@ def _ask_gemini(prompt: str, api_key: str) -> str:
     raise RuntimeError(f"All Gemini models failed: {last_err}")
 
 
-def _scrape_linkedin_jobs(role: str, location: str, limit: int = 40) -> list[dict]:
-    """Scrape real jobs from LinkedIn public API."""
-    url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "X-Requested-With": "XMLHttpRequest"
+# Shared by every scraper: identical result pages are fetched once per TTL across users
+_page_cache = PageCache(PAGE_CACHE_DIR, ttl=PAGE_CACHE_TTL, negative_ttl=PAGE_CACHE_NEGATIVE_TTL)
+
+
+def _stable_job_id(prefix: str, link: str) -> str:
+    """Job id derived from the link, identical across runs and workers (unlike hash())."""
+    return f"{prefix}_{hashlib.sha1(link.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _advance_watermark(watermark: dict | None, new_links: list[str]) -> None:
+    """Record what a scrape saw so the next incremental run can stop at it."""
+    if watermark is None:
+        return
+    watermark["links"] = (new_links + watermark.get("links", []))[:WATERMARK_MAX_LINKS]
+
+
+# Page fetching and parsing live in scraper_pipeline.extractors; the helpers below
+# turn one page of raw records into API job dicts.
+_linkedin_extractor = LinkedInExtractor(http=_page_cache)
+_yahoo_extractors: dict[str, YahooSiteExtractor] = {}
+
+def _job_from_record(r: dict, location: str, id_prefix: str, default_description: str, fallback_id: str = "") -> dict:
+    job = {
+        "id": _stable_job_id(id_prefix, r["link"]) if r["link"] else fallback_id,
+        "job_title": r["raw_title"],
+        "company": r["raw_company"] or "Unknown",
+        "location": r["raw_location"] or location,
+        "source": r["source"],
+        "link": r["link"],
+        "description": r["snippet"] or default_description,
+        "salary": "Not disclosed",
+        "posted": r["posted"] or "Recently",
+        "status": "Not Applied"
     }
+    if r["posted_at"]:
+        job["posted_at"] = r["posted_at"]
+    return job
+
+def _fetch_linkedin_page(role: str, location: str, start: int, recent_first: bool = False,
+                         max_age: float | None = None) -> tuple[list[dict] | None, CachedPage]:
+    """Fetch and parse one page (25 cards) of LinkedIn results at offset `start`.
+
+    The job list is None when paging should stop (non-200 or an empty page).
+    """
+    records, res = _linkedin_extractor.fetch_page(role, location, start // LinkedInExtractor.page_size,
+                                                  recent_first=recent_first, max_age=max_age)
+    if records is None:
+        return None, res
+    return [
+        _job_from_record(r, location, "job_li", "View on LinkedIn for full details and application requirements.",
+                         fallback_id=f"job_li_{start + i}")
+        for i, r in enumerate(records)
+    ], res
+
+def _scrape_linkedin_jobs(role: str, location: str, limit: int = 40, watermark: dict | None = None) -> list[dict]:
+    """Scrape real jobs from LinkedIn public API.
+
+    With a `watermark` the scrape is incremental: results are requested newest
+    first and paging stops at the first listing already seen on a previous run.
+    The watermark is updated in place.
+    """
     jobs = []
     start = 0
+    known = set(watermark.get("links", [])) if watermark is not None else set()
+    reached_known = False
     # Add a small delay between requests to avoid blocking
     import time
     
-    while len(jobs) < limit:
-        params = {"keywords": role, "location": location, "start": start}
+    while len(jobs) < limit and not reached_known:
         try:
-            res = requests.get(url, params=params, headers=headers, timeout=10)
-            if res.status_code != 200:
+            page, res = _fetch_linkedin_page(role, location, start, recent_first=watermark is not None,
+                                             max_age=PAGE_CACHE_INCREMENTAL_MAX_AGE if watermark is not None else None)
+            if page is None:
                 break
                 
-            soup = BeautifulSoup(res.text, 'html.parser')
-            cards = soup.find_all('li')
-            if not cards:
-                break
-                
-            for card in cards:
-                title_elem = card.find('h3', class_='base-search-card__title')
-                if not title_elem:
-                    continue
-                    
-                company_elem = card.find('h4', class_='base-search-card__subtitle')
-                location_elem = card.find('span', class_='job-search-card__location')
-                link_elem = card.find('a', class_='base-card__full-link')
-                time_elem = card.find('time')
-                
-                link = link_elem['href'].split('?')[0] if link_elem and 'href' in link_elem.attrs else ""
-                
-                # We need a unique ID based on the link or use index
-                job_id = f"job_li_{len(jobs)}_{hash(link) % 10000}" if link else f"job_li_{len(jobs)}"
-                
-                jobs.append({
-                    "id": job_id,
-                    "job_title": title_elem.text.strip(),
-                    "company": company_elem.text.strip() if company_elem else "Unknown",
-                    "location": location_elem.text.strip() if location_elem else location,
-                    "source": "LinkedIn",
-                    "link": link,
-                    "description": "View on LinkedIn for full details and application requirements.",
-                    "salary": "Not disclosed",
-                    "posted": time_elem.text.strip() if time_elem else "Recently",
-                    "status": "Not Applied"
-                })
-                
+            for job in page:
+                if job["link"] and job["link"] in known:
+                    reached_known = True
+                    break
+                jobs.append(job)
                 if len(jobs) >= limit:
                     break
             
             start += 25
-            time.sleep(0.5)
+            if not reached_known and not res.from_cache:
+                time.sleep(0.5)
         except Exception as e:
             print(f"Scraper error: {e}")
             break
             
+    _advance_watermark(watermark, [j["link"] for j in jobs if j["link"]])
     return jobs
 
-def _scrape_jobs_via_yahoo(role: str, location: str, site: str, limit: int = 50) -> list[dict]:
-    """Scrape real jobs from various platforms by searching Yahoo with deep pagination."""
-    import urllib.parse
-    
-    query = f'site:{site} "{role}" "{location}" intitle:"job"'
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-    }
-    
+def _yahoo_extractor(site: str) -> YahooSiteExtractor:
+    ex = _yahoo_extractors.get(site)
+    if ex is None:
+        cls = next((c for c in EXTRACTORS.values() if getattr(c, "site", None) == site), YahooSiteExtractor)
+        ex = _yahoo_extractors[site] = cls(http=_page_cache, site=site)
+    return ex
+
+def _fetch_yahoo_page(role: str, location: str, site: str, b_offset: int,
+                      max_age: float | None = None) -> tuple[list[dict] | None, CachedPage]:
+    """Fetch and parse one Yahoo `site:` results page (offsets 1, 11, 21, …).
+
+    The job list is None when paging should stop (non-200 or no results).
+    """
+    ex = _yahoo_extractor(site)
+    records, res = ex.fetch_page(role, location, (b_offset - 1) // ex.page_size, max_age=max_age)
+    if records is None:
+        return None, res
+    return [_job_from_record(r, location, "job_y", "View listing for full details.") for r in records], res
+
+def _scrape_jobs_via_yahoo(role: str, location: str, site: str, limit: int = 50, watermark: dict | None = None) -> list[dict]:
+    """Scrape real jobs from various platforms by searching Yahoo with deep pagination.
+
+    With a `watermark`, links seen on previous runs are skipped and paging stops
+    at the first page that contributes nothing new. The watermark is updated in place.
+    """
     jobs = []
-    seen = set()
+    seen = set(watermark.get("links", [])) if watermark is not None else set()
     b_offset = 1 # Yahoo pagination offset starts at 1, then 11, 21, etc.
     
     while len(jobs) < limit and b_offset <= 41: # Scrape up to 5 pages per domain
-        url = f"https://search.yahoo.com/search?p={urllib.parse.quote(query)}&b={b_offset}"
+        jobs_before_page = len(jobs)
         try:
-            res = requests.get(url, headers=headers, timeout=10)
-            if res.status_code != 200:
-                break
-                
-            soup = BeautifulSoup(res.text, 'html.parser')
-            
-            results = soup.find_all('div', class_='compTitle')
-            if not results:
+            page, res = _fetch_yahoo_page(role, location, site, b_offset,
+                                          max_age=PAGE_CACHE_INCREMENTAL_MAX_AGE if watermark is not None else None)
+            if page is None:
                 break # No more pages
                 
-            for div in results:
-                a = div.find('a')
-                if a and 'href' in a.attrs:
-                    link = a['href']
-                    title = a.text.strip()
-                    
-                    # Clean up tracking redirect
-                    if 'RU=' in link:
-                        try:
-                            link = urllib.parse.unquote(link.split('RU=')[1].split('/')[0])
-                        except:
-                            pass
-                            
-                    if site.replace('www.', '').split('.')[0] in link:
-                        # Enforce valid individual job links, skip category/search pages
-                        if "indeed.com" in site:
-                            # Indeed can be in.indeed.com, www.indeed.com etc.
-                            if "/q-" in link or "/jobs" in link or "job-vacancies" in link:
-                                continue
-                        if "naukri.com" in site:
-                            if "-jobs" in link and "job-listings" not in link:
-                                continue
-                                
-                        snippet_div = div.find_next_sibling('div', class_='compText')
-                        snippet = snippet_div.text.strip() if snippet_div else "View listing for full details."
-
-                        # Deep Clean Title and Extract Company
-                        clean_title = title
-                        company = "Unknown"
-                        
-                        # Fix Yahoo's weird concatenation "Naukri.comwww.naukri.com › python-developer"
-                        if '›' in clean_title:
-                            parts = clean_title.split('›')
-                            clean_title = parts[-1].strip()
-                            clean_title = clean_title.replace('-', ' ').title()
-                            
-                        # Strip "Job Listings" and "Job At" immediately after any potential `.title()` conversions
-                        clean_title = re.sub(r'(?i)\bJob Listings\b\s*', '', clean_title).strip()
-                        clean_title = re.sub(r'(?i)Job At\s+', '', clean_title).strip()
-                            
-                        # Fix Yahoo's Location Concatenation: e.g. "Mumbaisoftware Engineer" or "Bangaloresenior Developer"
-                        loc_match = location.replace(" ", "").lower()
-                        if clean_title.lower().startswith(loc_match):
-                            clean_title = clean_title[len(loc_match):].strip(" -|")
-                        # Aggressive Brute-Force Deduplication (Fixes Naukri URL slug prefixes)
-                        # e.g., "Ai Ml Backendai/Ml Backend Developer" -> "Ai/Ml Backend Developer"
-                        # e.g., "Azure Gen Aiazure Gen Ai Developer" -> "Azure Gen Ai Developer"
-                        
-                        # First try a simple regex for exact alphameric duplication
-                        match_nospace = re.match(r'^([a-zA-Z\s]{4,})([a-zA-Z\s]{4,}.*)$', clean_title, flags=re.IGNORECASE)
-                        if match_nospace:
-                            part1 = match_nospace.group(1).replace(" ", "").lower()
-                            part2 = match_nospace.group(2).replace(" ", "").lower()
-                            if part2.startswith(part1):
-                                clean_title = match_nospace.group(2).strip().title()
-                                
-                        # Hardcoded Known Buggy Prefixes
-                        known_prefixes = [
-                            ("Ai Ml Backendai/Ml", "Ai/Ml"), 
-                            ("Azure Gen Aiazure Gen", "Azure Gen"),
-                            ("Artificialartificial", "Artificial"),
-                            ("Gen Ai Developergen Ai", "Gen Ai")
-                        ]
-                        
-                        for bad, good in known_prefixes:
-                             if clean_title.lower().startswith(bad.lower()):
-                                 clean_title = good + clean_title[len(bad):]
-                                 if clean_title.lower().startswith(good.lower() + " " + good.lower()):
-                                     clean_title = good + clean_title[len(good)*2 + 1:]
-                                 
-                        # We will literally test every potential midpoint of the string.
-                        # If the left half (ignoring spaces/punctuation) matches the start of the right half,
-                        # we cut the string at that midpoint.
-                        cleaned_alpha = lambda s: ''.join(c.lower() for c in s if c.isalnum())
-                        
-                        best_cut_idx = 0
-                        # Test prefixes up to half the length of the string
-                        for i in range(5, len(clean_title) // 2 + 5):
-
-                            left_raw = clean_title[:i]
-                            left_clean = cleaned_alpha(left_raw)
-                            if len(left_clean) < 4:
-                                continue # Too short to be a reliable prefix
-                                
-                            right_raw = clean_title[i:]
-                            right_clean = cleaned_alpha(right_raw)
-                            
-                            if right_clean.startswith(left_clean):
-                                # Ensure we aren't cutting a single word in half
-                                if i < len(clean_title) and clean_title[i].isalpha() and clean_title[i-1].isalpha():
-                                    continue # False positive cut inside a word
-                                best_cut_idx = i
-                        
-                        if best_cut_idx > 0:
-                            # Re-run the word break check just to be safe
-                            if best_cut_idx < len(clean_title) and clean_title[best_cut_idx].isalpha() and clean_title[best_cut_idx-1].isalpha():
-                                pass
-                            else:
-                                clean_title = clean_title[best_cut_idx:].strip().title()
-                                if "/" in clean_title:
-                                    clean_title = clean_title.replace(" / ", "/").replace("/", " / ")
-
-                            
-                        # Handle standard delimiters: "Python Developer - TechCorp - Indeed.com"
-                        delimiters = [' - ', ' | ', ' at ', ' in ']
-                        for delim in delimiters:
-                            if delim in clean_title or delim.lower() in clean_title.lower():
-                                lower_title = clean_title.lower()
-                                idx = lower_title.rfind(delim.lower())
-                                if idx != -1:
-                                    potential_company = clean_title[idx + len(delim):].strip()
-                                    site_names = ['naukri', 'indeed', 'glassdoor', 'wellfound', 'apna', 'cutshort', 'workindia', 'hirist']
-                                    is_site = any(s in potential_company.lower() for s in site_names)
-                                    
-                                    if is_site:
-                                        clean_title = clean_title[:idx].strip()
-                                        idx2 = clean_title.lower().rfind(delim.lower())
-                                        if idx2 != -1:
-                                            company = clean_title[idx2 + len(delim):].strip()
-                                            clean_title = clean_title[:idx2].strip()
-                                    else:
-                                        if len(potential_company) < 40:
-                                            company = potential_company
-                                            clean_title = clean_title[:idx].strip()
-                                break
-                                
-                        # Aggressive Final Stripping
-                        clean_title = re.sub(r'(?i)\s*[-|]\s*[a-z0-9]+\.(com|in|co).*$', '', clean_title)
-                        clean_title = re.sub(r'(?i)\s*[-|]\s*(naukri|indeed|glassdoor|wellfound|apna|cutshort|workindia|hirist).*$', '', clean_title)
-                        clean_title = re.sub(r'(?i)\bJob Listings\b\s*', '', clean_title).strip()
-                        clean_title = re.sub(r'(?i)Job At\s+', '', clean_title).strip()
-                        clean_title = clean_title.replace("...", "").strip()
-                        
-                        # Extract company heuristic
-                        if company == "Unknown":
-                            if " at " in clean_title.lower():
-                                try:
-                                    parts = re.split(r'(?i)\s+at\s+', clean_title)
-                                    clean_title = parts[0].strip()
-                                    company = parts[1].split(' ')[0].strip("-,|")
-                                except:
-                                    pass
-                            elif snippet:
-                                snip_match = re.match(r'^([A-Z][a-zA-Z0-9\s\,\.&]{2,25})\b\s+(is hiring|is looking|requires|is urgently looking)', snippet)
-                                if snip_match:
-                                    company = snip_match.group(1).strip()
-                                    
-                        if not clean_title or "Jobs In" in clean_title.title() or "Job Search" in clean_title.title() or "Job Alerts" in clean_title.title():
-                            continue
-                            
-                        # If the entire title is the site name (Yahoo glitch) or a category search page
-                        site_names_glitch = ['naukri', 'indeed', 'apna.co', 'apnaapna.cosearch', 'glassdoor', 'wellfound', 'jobs online']
-                        if any(s.lower() == clean_title.replace(" ", "").lower() for s in site_names_glitch):
-                            continue
-                        if clean_title.lower().startswith("search jobs") or clean_title.lower().startswith("hire") or clean_title.lower().startswith("job application"): # Skip category pages
-                            continue
-                            
-                        # Format Source Name nicely
-                        source_name = site.split('.')[0].title()
-                        if source_name.lower() in ["join", "careers", "jobs", "lever", "greenhouse"]:
-                            source_name = "Career Site"
-                            
-                        job_id = f"job_y_{len(jobs)}_{hash(link) % 10000}"
-                        
-                        if link not in seen:
-                            seen.add(link)
-                            jobs.append({
-                                "id": job_id,
-                                "job_title": clean_title,
-                                "company": company,
-                                "location": location,
-                                "source": site.split('.')[0].title(),
-                                "link": link,
-                                "description": snippet,
-                                "salary": "Not disclosed",
-                                "posted": "Recently",
-                                "status": "Not Applied"
-                            })
-                        
-                        if len(jobs) >= limit:
-                            break
+            for job in page:
+                if job["link"] not in seen:
+                    seen.add(job["link"])
+                    jobs.append(job)
+                if len(jobs) >= limit:
+                    break
             
             b_offset += 10
-            import time
-            time.sleep(0.5) # Courtesy delay between pages
+            if watermark is not None and len(jobs) == jobs_before_page:
+                break # Page held only listings we already know about
+            if not res.from_cache:
+                import time
+                time.sleep(0.5) # Courtesy delay between pages
             
         except Exception as e:
             print(f"Yahoo Scraper error ({site} page offset {b_offset}): {e}")
             break
         
+    _advance_watermark(watermark, [j["link"] for j in jobs])
     return jobs
 
-def _gemini_search_jobs(api_key: str, role: str, location: str, sources: list[str]) -> dict:
-    """Use Gemini to expand titles, then SCAPE REAL JOBS based on requested sources."""
-    client = None
+def _gemini_search_jobs(api_key: str, role: str, location: str, sources: list[str],
+                        ctx: TaskContext | None = None) -> dict:
+    """Use Gemini to expand titles, then SCRAPE REAL JOBS based on requested sources.
+
+    Every (source, title) pair is a branch; the fan-out planner decides which
+    branch gets the next page fetch from the recorded yield of each source,
+    title variant and page depth, and stops once the target or budget is hit.
+    """
     titles = [role]
     
     if _GENAI_OK and api_key:
         try:
-            client = genai.Client(api_key=api_key)
-            raw = _ask_gemini(client, 
+            raw = _ask_gemini(
                 f'Generate 5 job title variants for "{role}". '
-                'Return ONLY a JSON array of strings, no markdown.'
+                'Return ONLY a JSON array of strings, no markdown.',
+                api_key=api_key,
             )
             raw = re.sub(r'^```(?:json)?\s*', '', raw)
             raw = re.sub(r'\s*```$', '', raw).strip()
             parsed_titles = json.loads(raw)
-            if isinstance(parsed_titles, list) and parsed_titles:
-                titles = [str(t) for t in parsed_titles[:4]]
+            if isinstance(parsed_titles, list):
+                for t in parsed_titles:
+                    t = str(t).strip()
+                    if t and t.lower() not in {x.lower() for x in titles}:
+                        titles.append(t)
+                titles = titles[:4]
         except Exception as e:
             print(f"Title expansion failed, using base role: {e}")
 
-    # Map sources to domains for search engines
-    domain_map = {
-        "Naukri.com": "naukri.com",
-        "Indeed": "indeed.com",
-        "Hirist": "hirist.tech",
-        "Glassdoor": "glassdoor.co.in",
-        "Cutshort": "cutshort.io",
-        "Wellfound": "wellfound.com",
-        "Apna": "apna.co",
-        "WorkIndia": "workindia.in",
-    }
-    
+    # Accept both dashboard ids ("Naukri") and display names ("Naukri.com")
     selected_domains = []
     use_linkedin = False
     
@@ -663,65 +687,55 @@ def _gemini_search_jobs(api_key: str, role: str, location: str, sources: list[st
         if "LinkedIn" in sources:
             use_linkedin = True
         for src in sources:
-            if src in domain_map:
-                selected_domains.append(domain_map[src])
-
-    all_jobs = []
-    seen_links = set()
-    
-    # Calculate targets - significantly multiply the return limits
-    total_sources = len(selected_domains) + (1 if use_linkedin else 0)
-    target_per_source = max(20, 100 // max(1, total_sources))
-    target_per_title = max(5, target_per_source // len(titles[:3]))
-
-    import concurrent.futures
-
-    def fetch_linkedin_task(t):
-        return _scrape_linkedin_jobs(t, location, limit=target_per_title * 2)
+            domain = _SOURCE_DOMAINS.get(src) or _SOURCE_DOMAINS.get(src.replace(".com", ""))
+            if domain and domain not in selected_domains:
+                selected_domains.append(domain)
 
-    def fetch_yahoo_task(t, domain):
-        return _scrape_jobs_via_yahoo(t, location, domain, limit=target_per_title * 2)
-
-    # Launch all scrapers concurrently
-    futures = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+    branches = []
+    for rank, t in enumerate(titles):
         if use_linkedin:
-            for t in titles[:3]:
-                futures.append(executor.submit(fetch_linkedin_task, t))
-                
+            branches.append(Branch("LinkedIn", t, rank, max_depth=_linkedin_extractor.max_pages))
         for domain in selected_domains:
-            for t in titles[:2]:
-                futures.append(executor.submit(fetch_yahoo_task, t, domain))
+            branches.append(Branch(domain, t, rank, max_depth=_yahoo_extractor(domain).max_pages))
 
-        # Collect results as they complete
-        for future in concurrent.futures.as_completed(futures):
-            try:
-                fetched = future.result()
-                for j in fetched:
-                    if j['link'] and j['link'] not in seen_links:
-                        seen_links.add(j['link'])
-                        all_jobs.append(j)
-            except Exception as e:
-                print(f"Concurrent thread error: {e}")
-
-    # If we still didn't get a huge batch, fallback safety scrape
-    if len(all_jobs) < 20 and use_linkedin:
-        more_jobs = _scrape_linkedin_jobs(role, location, limit=50)
-        for j in more_jobs:
-            if j['link'] and j['link'] not in seen_links:
-                seen_links.add(j['link'])
-                all_jobs.append(j)
+    def fetch_page(branch: Branch, depth: int) -> tuple[list[dict] | None, bool]:
+        if branch.source == "LinkedIn":
+            page, res = _fetch_linkedin_page(branch.title, location, depth * 25)
+        else:
+            page, res = _fetch_yahoo_page(branch.title, location, branch.source, 1 + depth * 10)
+        # Error pages and cached dead ends say nothing new about the branch's yield;
+        # a freshly fetched empty page does (the branch has run dry).
+        if res.status_code != 200 or res.negative:
+            return None, res.from_cache
+        return page or [], res.from_cache
+
+    def on_progress(found: int, fetches: int) -> None:
+        if ctx is not None:
+            ctx.report(min(1.0, max(found / SEARCH_TARGET_JOBS, fetches / SEARCH_FETCH_BUDGET)),
+                       f"{found} jobs from {fetches} page fetches")
+
+    planner = FanoutPlanner(YieldStats(_fanout_stats), fetch_budget=SEARCH_FETCH_BUDGET,
+                            target=SEARCH_TARGET_JOBS, parallelism=SEARCH_PARALLELISM)
+    plan = planner.run(branches, fetch_page, key=lambda j: j.get("link", ""),
+                       should_stop=ctx.cancelled if ctx is not None else None, on_progress=on_progress)
+    if plan["stopped"] == "cancelled":
+        raise TaskCancelled(ctx.task_id)
+    all_jobs = plan.pop("items")
+    print(f"Fan-out search: {len(all_jobs)} jobs, {plan['fetches']} fetches "
+          f"({plan['cached_fetches']} cached), stopped on {plan['stopped']}")
                 
     import random
     random.shuffle(all_jobs)
 
-    # Remove the artificial 40 job cap entirely to return massive datasets
-    return {"titles": titles, "jobs": all_jobs}
+    return {"titles": titles, "jobs": all_jobs, "plan": plan}
 
 
-@app.post("/api/jobs/search/{sid}")
-async def search_jobs(sid: str):
-    """Search jobs: Gemini expands titles and generates realistic listings."""
+def _run_job_search(sid: str, ctx: TaskContext | None = None) -> dict:
+    """Search jobs: Gemini expands titles and generates realistic listings.
+
+    Runs on a worker thread (task queue or threadpool). When `ctx` is given,
+    progress is reported per platform and cancellation is honoured between them.
+    """
     db = SessionLocal()
     try:
         prof = db.query(DBProfile).filter(DBProfile.session_id == sid).first()
@@ -745,10 +759,6 @@ async def search_jobs(sid: str):
     if not region or region.strip() == "":
         region = "Pune"
         
-    import uuid
-    import json
-    import re
-    import os
     import concurrent.futures
     import random
     
@@ -813,14 +823,20 @@ async def search_jobs(sid: str):
 
     with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
         future_to_platform = {executor.submit(generate_platform_jobs, p): p for p in target_platforms}
-        for future in concurrent.futures.as_completed(future_to_platform):
+        for done, future in enumerate(concurrent.futures.as_completed(future_to_platform), start=1):
             results = future.result()
             if results:
                 all_mock_jobs.extend(results)
+            if ctx is not None:
+                ctx.report(done / len(target_platforms), f"{future_to_platform[future]} done")
+                if ctx.cancelled():
+                    for f in future_to_platform:
+                        f.cancel()
+                    raise TaskCancelled(ctx.task_id)
             
     random.shuffle(all_mock_jobs)
     
-    _jobs_cache[sid] = all_mock_jobs
+    _jobs_cache.update_item(sid, lambda existing: _merge_jobs(existing, all_mock_jobs, keep_existing=False), default=[])
     
     return {
         "ok":     True,
@@ -830,41 +846,381 @@ async def search_jobs(sid: str):
     }
 
 
+# Dashboard source ids → domains searched through Yahoo (LinkedIn is scraped directly)
+_SOURCE_DOMAINS = {
+    "Naukri": "naukri.com",
+    "Indeed": "indeed.com",
+    "Hirist": "hirist.tech",
+    "Glassdoor": "glassdoor.co.in",
+    "Cutshort": "cutshort.io",
+    "Wellfound": "wellfound.com",
+    "Apna": "apna.co",
+    "WorkIndia": "workindia.in",
+}
+
+
+def _job_name_key(job: dict) -> str:
+    """Title + company, the identity of a listing whose link is not stable (generated listings)."""
+    return f"{job.get('job_title', '').strip().lower()}|{job.get('company', '').strip().lower()}"
+
+
+def _merge_jobs(existing: list[dict] | None, fresh: list[dict], keep_existing: bool) -> list[dict]:
+    """Combine a new batch with the cached list, keyed by link, then by title + company.
+
+    User state (id, status) always carries over from the cached copy, and
+    Applied jobs are never dropped. With `keep_existing`, other cached jobs
+    missing from `fresh` are kept after the new ones. The result holds at most
+    JOBS_CACHE_MAX_JOBS jobs besides the Applied ones, newest first.
+    """
+    existing = existing or []
+    by_link = {j["link"]: j for j in existing if j.get("link")}
+    by_name = {}
+    for j in existing:
+        by_name.setdefault(_job_name_key(j), j)
+    merged = []
+    matched = set()
+    for j in fresh:
+        old = by_link.get(j.get("link")) or by_name.get(_job_name_key(j))
+        # A cached copy carries over to one listing only; same-named postings stay separate.
+        if old is not None and id(old) not in matched:
+            matched.add(id(old))
+            j = {**j, "id": old["id"], "status": old.get("status", j.get("status"))}
+        merged.append(j)
+    merged.extend(j for j in existing
+                  if id(j) not in matched and (keep_existing or j.get("status") == "Applied"))
+    kept = 0
+    capped = []
+    for j in merged:
+        if j.get("status") != "Applied":
+            if kept >= JOBS_CACHE_MAX_JOBS:
+                continue
+            kept += 1
+        capped.append(j)
+    return capped
+
+
+def _run_incremental_search(sid: str, ctx: TaskContext | None = None) -> dict:
+    """Refresh a session's jobs with only the postings newer than the last run.
+
+    A watermark per (session, source, title) holds the links already seen.
+    Scrapers request newest-first and stop paging once they reach known
+    listings, and the new jobs are merged into the cached set.
+    """
+    db = SessionLocal()
+    try:
+        prof = db.query(DBProfile).filter(DBProfile.session_id == sid).first()
+        if not prof:
+            raise HTTPException(status_code=404, detail="Session not found")
+        try:
+            pdata = json.loads(prof.profile_json) if prof.profile_json else {}
+        except:
+            pdata = {}
+    finally:
+        db.close()
+
+    role = (pdata.get("base_job_role") or "").strip() or "Software Engineer"
+    region = (pdata.get("target_metro_region") or "").strip() or "Pune"
+    sources = pdata.get("target_sources") or ["LinkedIn", "Naukri", "Indeed"]
+    titles = [role]
+
+    branches = []
+    for src in sources:
+        if src != "LinkedIn" and src not in _SOURCE_DOMAINS:
+            continue
+        for t in titles:
+            branches.append((src, t))
+
+    def run_branch(src: str, title: str) -> list[dict]:
+        key = f"{sid}|{src}|{title.lower()}"
+        watermark = _search_watermarks.get(key, {})
+        if src == "LinkedIn":
+            found = _scrape_linkedin_jobs(title, region, limit=50, watermark=watermark)
+        else:
+            found = _scrape_jobs_via_yahoo(title, region, _SOURCE_DOMAINS[src], limit=50, watermark=watermark)
+        _search_watermarks[key] = watermark
+        return found
+
+    import concurrent.futures
+
+    new_jobs = []
+    seen_links = set()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(8, len(branches)))) as executor:
+        futures = {executor.submit(run_branch, src, t): src for src, t in branches}
+        for done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+            try:
+                for j in future.result():
+                    if j["link"] and j["link"] not in seen_links:
+                        seen_links.add(j["link"])
+                        new_jobs.append(j)
+            except Exception as e:
+                print(f"Incremental branch error ({futures[future]}): {e}")
+            if ctx is not None:
+                ctx.report(done / len(futures), f"{futures[future]} done")
+                if ctx.cancelled():
+                    for f in futures:
+                        f.cancel()
+                    raise TaskCancelled(ctx.task_id)
+
+    added = []
+
+    def merge(existing):
+        # Counted inside the atomic update: a concurrent write cannot skew it, and at the
+        # job cap new jobs replace old ones without changing the list length.
+        merged = _merge_jobs(existing, new_jobs, keep_existing=True)
+        known = {j["id"] for j in existing or []}
+        added[:] = [j for j in merged if j["id"] not in known]
+        return merged
+
+    merged = _jobs_cache.update_item(sid, merge, default=[])
+    return {
+        "ok":        True,
+        "titles":    titles,
+        "jobs":      merged,
+        "count":     len(merged),
+        "new_count": len(added),
+    }
+
+
+def _run_live_search(sid: str, ctx: TaskContext | None = None) -> dict:
+    """Scrape real listings for the session's role/region across its sources.
+
+    The fan-out planner spreads a fixed page-fetch budget over sources and
+    title variants; results replace the cached set (applied status carries over).
+    """
+    db = SessionLocal()
+    try:
+        prof = db.query(DBProfile).filter(DBProfile.session_id == sid).first()
+        if not prof:
+            raise HTTPException(status_code=404, detail="Session not found")
+        try:
+            pdata = json.loads(prof.profile_json) if prof.profile_json else {}
+        except:
+            pdata = {}
+    finally:
+        db.close()
+
+    role = (pdata.get("base_job_role") or "").strip() or "Software Engineer"
+    region = (pdata.get("target_metro_region") or "").strip() or "Pune"
+    found = _gemini_search_jobs(_api_key, role, region, pdata.get("target_sources") or [], ctx)
+
+    merged = _jobs_cache.update_item(sid, lambda existing: _merge_jobs(existing, found["jobs"], keep_existing=False), default=[])
+    return {
+        "ok":     True,
+        "titles": found["titles"],
+        "jobs":   merged,
+        "count":  len(merged),
+        "plan":   found["plan"],
+    }
+
+
+def _dispatch_search(sid: str, incremental: bool = False, live: bool = False, ctx: TaskContext | None = None) -> dict:
+    if incremental:
+        result = _run_incremental_search(sid, ctx)
+    elif live:
+        result = _run_live_search(sid, ctx)
+    else:
+        result = _run_job_search(sid, ctx)
+    _touch_session(sid, refreshed=True)
+    return result
+
+
+@app.post("/api/jobs/search/{sid}")
+def search_jobs(sid: str, incremental: bool = False, live: bool = False):
+    """Synchronous search, kept for older clients. Runs on the threadpool, not the event loop."""
+    return _dispatch_search(sid, incremental=incremental, live=live)
+
+
 @app.get("/api/jobs/{sid}")
-async def get_fetched_jobs(sid: str):
-    """Return the last fetched job list for this session."""
-    return _jobs_cache.get(sid, [])
+def get_fetched_jobs(sid: str, request: Request):
+    """Return the last fetched job list for this session (304 when unchanged)."""
+    return etag_json_response(request, _jobs_cache.get(sid, []))
+
+
+# ─────────────────────────────────────────────
+#  Background Tasks
+# ─────────────────────────────────────────────
+task_queue = TaskQueue(engine, workers=TASK_WORKERS, retention_seconds=TASK_RETENTION_HOURS * 3600)
+task_queue.register("job_search", lambda payload, ctx: _dispatch_search(
+    payload["sid"], incremental=payload.get("incremental", False), live=payload.get("live", False), ctx=ctx,
+))
+task_queue.register("refine_roles", _refine_roles)
+
+@app.on_event("startup")
+def _start_task_workers():
+    task_queue.start()
+
+@app.on_event("shutdown")
+def _stop_task_workers():
+    task_queue.stop()
+
+def _pending_search_task(sid: str) -> dict | None:
+    for task in task_queue.list_for_session(sid, limit=5):
+        if task["kind"] == "job_search" and task["status"] in ("queued", "running"):
+            return task
+    return None
+
+def _require_session(sid: str) -> None:
+    db = SessionLocal()
+    try:
+        if not db.query(DBProfile.session_id).filter(DBProfile.session_id == sid).first():
+            raise HTTPException(status_code=404, detail="Session not found")
+    finally:
+        db.close()
+
+@app.post("/api/tasks/search/{sid}")
+def submit_search_task(sid: str, incremental: bool = False, live: bool = False):
+    """Queue a job search and return its task id immediately (the already pending one, if any).
+
+    Client searches always run at PRIORITY_NORMAL; only the server's own
+    background work (prefetch) is queued at PRIORITY_LOW.
+    """
+    _require_session(sid)
+    pending = _pending_search_task(sid)
+    if pending and pending["status"] == "queued" and pending["priority"] > PRIORITY_NORMAL:
+        # A background prefetch still waiting in the queue: replace it with this interactive search.
+        task_queue.cancel(pending["task_id"])
+    elif pending:
+        return {"task_id": pending["task_id"], "status": pending["status"], "deduplicated": True}
+    task_id = task_queue.submit("job_search", {"sid": sid, "incremental": incremental, "live": live},
+                                session_id=sid, priority=PRIORITY_NORMAL)
+    return {"task_id": task_id, "status": "queued"}
+
+@app.get("/api/tasks/session/{sid}")
+def list_session_tasks(sid: str):
+    return task_queue.list_for_session(sid)
+
+@app.get("/api/tasks/{task_id}")
+def get_task(task_id: str):
+    task = task_queue.get(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+@app.delete("/api/tasks/{task_id}")
+def cancel_task(task_id: str):
+    if not task_queue.cancel(task_id):
+        raise HTTPException(status_code=409, detail="Task is not queued or running")
+    return {"ok": True}
+
+
+# ─────────────────────────────────────────────
+#  Search Prefetch
+# ─────────────────────────────────────────────
+def _touch_session(sid: str, refreshed: bool = False) -> None:
+    """Record a dashboard visit (or, with refreshed=True, a completed search) for the prefetcher."""
+    now = _time.time()
+    activity = _session_activity.get(sid) or {}
+    if refreshed:
+        activity["refreshed"] = now
+    elif now - activity.get("seen", 0) < 60:
+        return
+    else:
+        activity["seen"] = now
+    _session_activity[sid] = activity
+
+def _prefetch_candidates() -> list[dict]:
+    """Recently seen sessions with a saved search and stale results, most recently seen first.
+
+    Refreshes run the same search the dashboard submits (the default Gemini path),
+    so what the user sees on return is what "Find Jobs" would have produced.
+    """
+    if not (_GENAI_OK and _api_key):
+        return []  # the default search has nothing to generate without a model
+    now = _time.time()
+    stale = []
+    for sid in list(_session_activity):
+        # Reads do not extend an entry's TTL, but a completed refresh rewrites it, so the
+        # namespace TTL alone would keep a refreshed session alive: check the visit itself.
+        activity = _session_activity.get(sid) or {}
+        seen = activity.get("seen")
+        if not seen or now - seen > PREFETCH_ACTIVE_WINDOW:
+            continue
+        if now - activity.get("refreshed", 0) >= PREFETCH_REFRESH_AFTER:
+            stale.append((activity["seen"], sid))
+    stale.sort(reverse=True)
+    sids = [sid for _, sid in stale[:PREFETCH_PER_TICK * 4]]
+    if not sids:
+        return []
+
+    db = SessionLocal()
+    try:
+        rows = dict(db.query(DBProfile.session_id, DBProfile.profile_json).filter(DBProfile.session_id.in_(sids)).all())
+    finally:
+        db.close()
+
+    candidates = []
+    for sid in sids:
+        try:
+            pdata = json.loads(rows.get(sid) or "{}")
+        except ValueError:
+            continue
+        if not (pdata.get("base_job_role") or "").strip():
+            continue
+        # The default search scrapes nothing; it only spends the model budget.
+        candidates.append({"sid": sid, "sources": [], "needs_model": True})
+    return candidates
+
+def _submit_prefetch(candidate: dict) -> str | None:
+    sid = candidate["sid"]
+    if _pending_search_task(sid):
+        return None
+    return task_queue.submit("job_search", {"sid": sid, "incremental": False, "live": False, "prefetch": True},
+                             session_id=sid, priority=PRIORITY_LOW)
+
+prefetcher = PrefetchScheduler(
+    _prefetch_candidates, _submit_prefetch,
+    # Dashboard searches run on the task queue after their request returns, so count those too.
+    busy=lambda: admission.busy() + task_queue.count_active("job_search", PRIORITY_NORMAL) >= PREFETCH_PAUSE_INFLIGHT,
+    limits=RateLimits({}, default_per_minute=PREFETCH_MODEL_RPM),
+    interval=PREFETCH_INTERVAL, per_tick=PREFETCH_PER_TICK,
+)
+
+@app.on_event("startup")
+def _start_prefetch():
+    if PREFETCH_ENABLED:
+        prefetcher.start()
+
+@app.on_event("shutdown")
+def _stop_prefetch():
+    prefetcher.stop()
+
+@app.get("/api/stats/prefetch")
+def prefetch_stats():
+    return prefetcher.snapshot()
 
 
 # ─────────────────────────────────────────────
 #  Apply to selected jobs
 # ─────────────────────────────────────────────
 @app.post("/api/jobs/apply/{sid}")
-async def apply_jobs(sid: str, req: Request):
+def apply_jobs(sid: str, req: ApplyJobsRequest):
     db = SessionLocal()
     try:
         prof = db.query(DBProfile).filter(DBProfile.session_id == sid).first()
         if not prof:
             raise HTTPException(status_code=404, detail="Session not found")
             
-        data = await req.json()
-        job_ids = set(data.get("job_ids", []))
+        job_ids = set(req.job_ids)
         if not job_ids:
             return {"applied_count": 0, "applied": []}
             
         if sid not in _jobs_cache:
             raise HTTPException(400, "No cached jobs. Search first.")
             
-        if sid not in _applied_log:
-            _applied_log[sid] = []
-            
         applied_now = []
-        for j in _jobs_cache.get(sid, []):
-            if j["id"] in job_ids and j.get("status") != "Applied":
-                j["status"] = "Applied"
-                log_entry = {**j, "applied_via": "Manual Link"}
-                _applied_log[sid].append(log_entry)
-                applied_now.append(log_entry)
+
+        def mark_applied(jobs):
+            # Runs inside the backend's atomic update; another worker may be applying concurrently.
+            applied_now.clear()
+            for j in jobs or []:
+                if j["id"] in job_ids and j.get("status") != "Applied":
+                    j["status"] = "Applied"
+                    applied_now.append({**j, "applied_via": "Manual Link"})
+            return jobs
+
+        _jobs_cache.update_item(sid, mark_applied, default=[])
+        if applied_now:
+            _applied_log.update_item(sid, lambda log: (log or []) + applied_now, default=[])
                 
         return {"applied_count": len(applied_now), "applied": applied_now}
     finally:
@@ -875,13 +1231,13 @@ async def apply_jobs(sid: str, req: Request):
 #  Application Log Data
 # ─────────────────────────────────────────────
 @app.get("/api/log/{sid}")
-def get_log(sid: str):
+def get_log(sid: str, request: Request):
     db = SessionLocal()
     try:
         prof = db.query(DBProfile).filter(DBProfile.session_id == sid).first()
         if not prof:
             raise HTTPException(status_code=404, detail="Session not found")
-        return _applied_log.get(sid, [])
+        return etag_json_response(request, _applied_log.get(sid, []))
     finally:
         db.close()
 
@@ -897,43 +1253,215 @@ def clear_log(sid: str):
     finally:
         db.close()
 
+@app.get("/api/stats/memory")
+def memory_stats():
+    """Entry counts, approximate sizes and evictions for every cache."""
+    return {
+        "state": state.memory_report(),
+        "profile_compactor": _profile_compactor.stats(),
+        "page_cache": _page_cache.snapshot(),
+    }
+
+@app.get("/api/stats/fanout")
+def fanout_stats():
+    """Recorded yield, duplicate rate and latency per (source, title rank, page depth)."""
+    return YieldStats(_fanout_stats).snapshot(_fanout_stats)
+
+
+@app.get("/api/stats/ai-batching")
+def ai_batching_stats():
+    """analyze-job micro-batching: calls, batches, average batch size, single-call fallbacks."""
+    return _analysis_batcher.snapshot()
+
+
+@app.get("/api/stats/admission")
+def admission_stats():
+    """In-flight / queued requests and shed counts per admission-controlled route class."""
+    return admission.snapshot()
+
+
+# ─────────────────────────────────────────────
+#  Diagnostics (admin only)
+# ─────────────────────────────────────────────
+_profile_lock = threading.Lock()
+
+@app.on_event("startup")
+async def _start_watchdog():
+    watchdog.start()
+
+@app.on_event("shutdown")
+async def _stop_watchdog():
+    watchdog.stop()
+
+def _require_admin(request: Request) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(request.headers.get("x-admin-token", ""), ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@app.get("/api/diagnostics/stalls")
+def loop_stalls(request: Request):
+    """Recent event-loop stalls with the routes in flight and the loop thread's stack."""
+    _require_admin(request)
+    return watchdog.snapshot()
+
+@app.get("/api/diagnostics/profile")
+def profile_process(request: Request, seconds: float = 10.0, interval_ms: float = 5.0, idle: bool = False):
+    """Sample all threads for `seconds` and return collapsed stacks (flamegraph.pl / speedscope input)."""
+    _require_admin(request)
+    seconds = min(max(seconds, 0.1), PROFILE_MAX_SECONDS)
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    try:
+        collapsed = sample_profile(seconds, interval=max(interval_ms, 1.0) / 1000, include_idle=idle)
+    finally:
+        _profile_lock.release()
+    filename = f"sidekick-{datetime.datetime.utcnow():%Y%m%dT%H%M%S}.collapsed"
+    return PlainTextResponse(collapsed, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
 # ─────────────────────────────────────────────
 #  Advanced AI Endpoints (Phase 13)
 # ─────────────────────────────────────────────
 
-@app.post("/api/ai/analyze-job/{sid}")
-def analyze_job(sid: str, req: JobScoreRequest):
-    """ATS Vibe Check & Red Flag Scanner"""
-    db = SessionLocal()
-    try:
-        prof = db.query(DBProfile).filter(DBProfile.session_id == sid).first()
-        if not prof:
-            raise HTTPException(status_code=400, detail="Missing session")
+_profile_compactor = ProfileCompactor()
+_jd_digests = JDDigestStore(engine, llm=lambda prompt: _ask_gemini(prompt, api_key=_api_key))
 
-        prompt = f"""You are an expert technical recruiter and career coach.
+def _jd_for_prompt(job_description: str) -> str:
+    """Digest of the JD (built once per distinct description) in place of the raw page text."""
+    return _jd_digests.render(_jd_digests.get(job_description))
+
+def _compact_profile_for(prof: DBProfile, request_profile: Dict[str, Any]) -> str:
+    """Stored profile + the caller's profile + resume, compacted to the prompt token budget."""
+    try:
+        stored = json.loads(prof.profile_json) if prof.profile_json else {}
+    except:
+        stored = {}
+    merged = {**stored, **(request_profile or {})}
+    return _profile_compactor.compact(merged, prof.resume_text or "", PROFILE_TOKEN_BUDGET)
+
+
+def _gemini_flash(prompt: str) -> str:
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={os.environ.get('GEMINI_API_KEY')}"
+    res = requests.post(url, json={"contents": [{"parts": [{"text": prompt}]}]}, timeout=60)
+    if not res.ok:
+        raise HTTPException(500, "Gemini call failed")
+    return res.json()["candidates"][0]["content"]["parts"][0]["text"]
+
+def _strip_json_fence(text: str) -> str:
+    text = re.sub(r'```json\s*', '', text)
+    return re.sub(r'```\s*$', '', text).strip()
+
+# Each generation takes the compact profile and the JD digest, so the bundle
+# endpoint can prepare both once and run every part against them.
+def _analysis_part(profile_text: str, jd_text: str) -> dict:
+    prompt = f"""You are an expert technical recruiter and career coach.
 I am sending you a candidate's profile data and a job description.
 Your job is to analyze their fit and return EXACTLY valid JSON with these keys:
 - match_score: (Integer 0-100 indicating fit)
 - missing_keywords: (List of string keywords/skills in the JD but not in the profile)
 - red_flags: (List of string warnings about toxic language like 'wear many hats', 'fast-paced', 'work hard play hard', demanding hours, or unrealistic requirements)
 
-Profile JSON: {json.dumps(req.profile_data)}
+Candidate profile (compact):
+{profile_text}
 
-Job Description: {req.job_description}
+Job Description (digest):
+{jd_text}
 
 Return ONLY standard JSON. No markdown formatting blocks."""
-        
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={os.environ.get('GEMINI_API_KEY')}"
-        res = requests.post(url, json={"contents": [{"parts": [{"text": prompt}]}]})
-        if not res.ok:
-            raise HTTPException(500, "Gemini call failed")
-            
-        text = res.json()["candidates"][0]["content"]["parts"][0]["text"]
-        
-        text = re.sub(r'```json\s*', '', text)
-        text = re.sub(r'```\s*$', '', text).strip()
-        
-        return json.loads(text)
+    return json.loads(_strip_json_fence(_gemini_flash(prompt)))
+
+def _valid_analysis(obj: Any) -> dict | None:
+    """The analysis keys with sane types, or None if the model's answer doesn't fit."""
+    if not isinstance(obj, dict):
+        return None
+    try:
+        score = int(obj.get("match_score"))
+    except (TypeError, ValueError):
+        return None
+    keywords, flags = obj.get("missing_keywords", []), obj.get("red_flags", [])
+    if not 0 <= score <= 100 or not isinstance(keywords, list) or not isinstance(flags, list):
+        return None
+    return {"match_score": score, "missing_keywords": [str(k) for k in keywords], "red_flags": [str(f) for f in flags]}
+
+def _analysis_batch(items: list[tuple[str, str]]) -> list[dict | None]:
+    """One Gemini call for several (profile, JD) analyses; None for any item missing or invalid in the answer."""
+    sections = "\n\n".join(
+        f"### Item {i}\nCandidate profile (compact):\n{profile_text}\n\nJob Description (digest):\n{jd_text}"
+        for i, (profile_text, jd_text) in enumerate(items, start=1)
+    )
+    prompt = f"""You are an expert technical recruiter and career coach.
+Below are {len(items)} independent items, each a candidate's profile and a job description. Analyze every item on its own; never mix information between items.
+For each item return an object with these keys:
+- item: (the item number)
+- match_score: (Integer 0-100 indicating fit)
+- missing_keywords: (List of string keywords/skills in the JD but not in the profile)
+- red_flags: (List of string warnings about toxic language like 'wear many hats', 'fast-paced', 'work hard play hard', demanding hours, or unrealistic requirements)
+
+{sections}
+
+Return ONLY a standard JSON array with exactly {len(items)} objects, one per item. No markdown formatting blocks."""
+    answer = json.loads(_strip_json_fence(_gemini_flash(prompt)))
+    if not isinstance(answer, list):
+        raise ValueError("batch answer is not a JSON array")
+    results: list[dict | None] = [None] * len(items)
+    for pos, obj in enumerate(answer):
+        n = str(obj.get("item", "")) if isinstance(obj, dict) else ""
+        idx = int(n) - 1 if n.isdigit() else (pos if len(answer) == len(items) else -1)
+        if 0 <= idx < len(items) and results[idx] is None:
+            results[idx] = _valid_analysis(obj)
+    return results
+
+def _analysis_single(item: tuple[str, str]) -> dict:
+    """_analysis_part for one item, held to the same shape check as batched answers."""
+    return _valid_analysis(_analysis_part(*item)) or {"match_score": 0, "missing_keywords": [], "red_flags": []}
+
+_analysis_batcher = MicroBatcher(
+    run_batch=_analysis_batch,
+    run_single=_analysis_single,
+    window=ANALYZE_BATCH_WINDOW_MS / 1000, max_batch=ANALYZE_BATCH_MAX,
+)
+
+def _analysis_batched(profile_text: str, jd_text: str) -> dict:
+    """_analysis_part, sharing a Gemini request with analyses arriving in the same short window."""
+    return _analysis_batcher.submit((profile_text, jd_text))
+
+def _outreach_part(prompt_context: str, profile_text: str, jd_text: str) -> dict:
+    prompt = f"""You are a brilliant career coach generating a {prompt_context}.
+Here is the candidate's profile (compact):
+{profile_text}
+Here is the job description (digest):
+{jd_text}
+
+Instructions for {prompt_context}:
+If it is a Cover Letter: Write a concise, energetic 3-paragraph letter matching their skills to the JD perfectly. 
+If it is a Recruiter DM: Write a short, punchy 3-sentence connection request mentioning something specific from the JD.
+
+Return ONLY the raw text, no intro, no emojis, no asterisks."""
+    return {"text": _gemini_flash(prompt).strip()}
+
+def _interview_part(jd_text: str) -> dict:
+    prompt = f"""Based entirely on the technical requirements and stack mentioned in this Job Description, generate exactly 5 highly probable technical interview questions that the candidate should expect. For each question, provide a brief, excellent 1-paragraph summary of how they should answer it.
+
+Job Description (digest):
+{jd_text}
+
+Return ONLY valid JSON with this format:
+[{{ "question": "Question text", "answer_guide": "Guide text" }}]
+"""
+    return {"questions": json.loads(_strip_json_fence(_gemini_flash(prompt)))}
+
+
+@app.post("/api/ai/analyze-job/{sid}")
+def analyze_job(sid: str, req: JobScoreRequest):
+    """ATS Vibe Check & Red Flag Scanner"""
+    db = SessionLocal()
+    try:
+        prof = db.query(DBProfile).filter(DBProfile.session_id == sid).first()
+        if not prof:
+            raise HTTPException(status_code=400, detail="Missing session")
+
+        return _analysis_batched(_compact_profile_for(prof, req.profile_data), _jd_for_prompt(req.job_description))
     except Exception as e:
         print(f"Error in analyze_job: {e}")
         return {"match_score": 0, "missing_keywords": [], "red_flags": []}
@@ -963,22 +1491,8 @@ def generate_text(sid: str, req: GenerateTextRequest):
         if not prof:
             raise HTTPException(status_code=400, detail="Missing session")
 
-        prompt = f"""You are a brilliant career coach generating a {req.prompt_context}.
-Here is the candidate's profile data: {json.dumps(req.profile_data)}
-Here is the job description: {req.job_description}
-
-Instructions for {req.prompt_context}:
-If it is a Cover Letter: Write a concise, energetic 3-paragraph letter matching their skills to the JD perfectly. 
-If it is a Recruiter DM: Write a short, punchy 3-sentence connection request mentioning something specific from the JD.
-
-Return ONLY the raw text, no intro, no emojis, no asterisks."""
-
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={os.environ.get('GEMINI_API_KEY')}"
-        res = requests.post(url, json={"contents": [{"parts": [{"text": prompt}]}]})
-        if not res.ok:
-            raise HTTPException(500, "Gemini call failed")
-            
-        return {"text": res.json()["candidates"][0]["content"]["parts"][0]["text"].strip()}
+        return _outreach_part(req.prompt_context, _compact_profile_for(prof, req.profile_data),
+                              _jd_for_prompt(req.job_description))
     except Exception as e:
         print(f"Error in generate_text: {e}")
         return {"text": "Generation failed."}
@@ -995,23 +1509,7 @@ def interview_prep(sid: str, req: InterviewPrepRequest):
         if not prof:
             raise HTTPException(status_code=400, detail="Missing session")
 
-        prompt = f"""Based entirely on the technical requirements and stack mentioned in this Job Description, generate exactly 5 highly probable technical interview questions that the candidate should expect. For each question, provide a brief, excellent 1-paragraph summary of how they should answer it.
-
-Job Description: {req.job_description}
-
-Return ONLY valid JSON with this format:
-[{{ "question": "Question text", "answer_guide": "Guide text" }}]
-"""
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={os.environ.get('GEMINI_API_KEY')}"
-        res = requests.post(url, json={"contents": [{"parts": [{"text": prompt}]}]})
-        if not res.ok:
-            raise HTTPException(500, "Gemini call failed")
-            
-        text = res.json()["candidates"][0]["content"]["parts"][0]["text"]
-        text = re.sub(r'```json\s*', '', text)
-        text = re.sub(r'```\s*$', '', text).strip()
-        
-        return {"questions": json.loads(text)}
+        return _interview_part(_jd_for_prompt(req.job_description))
     except Exception as e:
         print(f"Error in interview_prep: {e}")
         return {"questions": []}
@@ -1019,9 +1517,81 @@ Return ONLY valid JSON with this format:
         db.close()
 
 
+# part name → (generator(profile_text, jd_text), payload sent when it fails)
+_BUNDLE_PARTS = {
+    "analysis":       (_analysis_batched, {"match_score": 0, "missing_keywords": [], "red_flags": []}),
+    "interview_prep": (lambda profile_text, jd_text: _interview_part(jd_text), {"questions": []}),
+    "cover_letter":   (lambda profile_text, jd_text: _outreach_part("Cover Letter", profile_text, jd_text),
+                       {"text": "Generation failed."}),
+    "recruiter_dm":   (lambda profile_text, jd_text: _outreach_part("Recruiter DM", profile_text, jd_text),
+                       {"text": "Generation failed."}),
+}
+
+@app.post("/api/ai/bundle/{sid}")
+async def ai_bundle(sid: str, req: BundleRequest):
+    """Every AI feature for one job page in a single request.
+
+    The session is checked and the profile/JD prepared once; the requested
+    parts then run concurrently and are streamed back as NDJSON lines,
+    {"part", "ok", "data", "ms"}, in completion order, ending with {"done": true}.
+
+    Each part is one Gemini call, so each is admitted like a single AI
+    request: the first runs on this request's own "ai" slot, the others
+    take extra slots when the class and session limits allow and otherwise
+    wait for the request's slot, so a bundle never exceeds AI_PER_SESSION.
+    """
+    parts = [p for p in dict.fromkeys(req.parts) if p in _BUNDLE_PARTS]
+    if not parts:
+        raise HTTPException(400, f"No known parts requested (expected any of {', '.join(_BUNDLE_PARTS)})")
+
+    def prepare() -> tuple[str, str]:
+        db = SessionLocal()
+        try:
+            prof = db.query(DBProfile).filter(DBProfile.session_id == sid).first()
+            if not prof:
+                raise HTTPException(status_code=400, detail="Missing session")
+            return _compact_profile_for(prof, req.profile_data), _jd_for_prompt(req.job_description)
+        finally:
+            db.close()
+
+    started = _time.monotonic()
+    profile_text, jd_text = await asyncio.to_thread(prepare)
+
+    own_slot = asyncio.Semaphore(1)
+
+    async def run_part(name: str) -> dict:
+        generate, fallback = _BUNDLE_PARTS[name]
+        admitted_at = admission.try_acquire("ai", sid) if own_slot.locked() else None
+        if admitted_at is None:
+            await own_slot.acquire()
+        try:
+            data, ok = await asyncio.to_thread(generate, profile_text, jd_text), True
+        except Exception as e:
+            print(f"Error in bundle part {name}: {e}")
+            data, ok = fallback, False
+        finally:
+            if admitted_at is None:
+                own_slot.release()
+            else:
+                admission.release("ai", sid, admitted_at)
+        return {"part": name, "ok": ok, "data": data, "ms": round((_time.monotonic() - started) * 1000)}
+
+    async def stream():
+        for next_done in asyncio.as_completed([run_part(p) for p in parts]):
+            yield dumps_bytes(await next_done) + b"\n"
+        yield dumps_bytes({"done": True, "ms": round((_time.monotonic() - started) * 1000)}) + b"\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson", headers={"Cache-Control": "no-store"})
+
+
 # ─────────────────────────────────────────────
 #  Entry-point
 # ─────────────────────────────────────────────
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True)
+    if SERVER_WORKERS > 1:
+        if not state.shared:
+            raise SystemExit("SIDEKICK_WORKERS > 1 needs a shared SIDEKICK_STATE_URL (e.g. sqlite:///./state.db).")
+        uvicorn.run("server:app", host="0.0.0.0", port=8000, workers=SERVER_WORKERS)
+    else:
+        uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,168 @@
+"""
+Sidekick — Fan-out Planner Simulation
+=========================================
+Offline harness for `fanout_planner.py`: no network, no server.
+
+Synthetic sources stand in for LinkedIn and the Yahoo `site:` searches. Each
+(source, title variant) query returns a fixed ordering of listings drawn from
+that source's pool, so variants of the same title overlap the way real
+searches do, small boards run dry after a page or two, and every page has its
+own latency. Two strategies are replayed against the same world:
+
+  baseline → the old fixed arithmetic (3 titles on LinkedIn, 2 per domain,
+             pages until `max(5, target_per_source // 3) * 2` jobs, then a
+             fallback LinkedIn scrape under 20 jobs)
+  planner  → FanoutPlanner with a request budget, after `--warmup` runs
+             so its yield history is populated
+
+Usage:
+    python simulate_fanout.py --runs 5 --budget 40 --target 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import random
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+from fanout_planner import Branch, FanoutPlanner, YieldStats
+from state_backend import InProcessBackend
+
+# name → (listings in pool, page size, fraction of results dropped as junk, mean latency s, max pages)
+SOURCES: Dict[str, Tuple[int, int, float, float, int]] = {
+    "LinkedIn":        (220, 25, 0.05, 1.4, 4),
+    "naukri.com":      (160, 10, 0.30, 0.9, 5),
+    "indeed.com":      (90, 10, 0.40, 0.9, 5),
+    "glassdoor.co.in": (40, 10, 0.50, 1.0, 5),
+    "hirist.tech":     (30, 10, 0.35, 0.8, 5),
+    "cutshort.io":     (12, 10, 0.50, 0.8, 5),
+    "wellfound.com":   (18, 10, 0.55, 1.1, 5),
+    "apna.co":         (60, 10, 0.60, 0.9, 5),
+    "workindia.in":    (25, 10, 0.60, 0.9, 5),
+}
+TITLES = ["Python Developer", "Backend Engineer", "Software Engineer - Python", "Django Developer"]
+
+
+class World:
+    """Deterministic listings per (source, title rank); latency is the only randomness per fetch."""
+
+    def __init__(self, seed: int, speed: float):
+        self.seed = seed
+        self.speed = speed
+        self.rng = random.Random(seed)
+        self._results: Dict[Tuple[str, int], List[str]] = {}
+        self.requests = 0
+
+    def results(self, source: str, rank: int) -> List[str]:
+        key = (source, rank)
+        if key not in self._results:
+            pool, _, junk, _, _ = SOURCES[source]
+            r = random.Random(f"{self.seed}:{source}:{rank}")
+            # Variants share the source's pool; later variants match fewer listings.
+            listing = [f"https://{source}/job/{i}" for i in range(pool)]
+            r.shuffle(listing)
+            listing = listing[: max(1, int(pool * (1.0 - 0.15 * rank)))]
+            self._results[key] = [None if r.random() < junk else link for link in listing]
+        return self._results[key]
+
+    def page(self, source: str, rank: int, depth: int) -> List[dict]:
+        _, size, _, latency, _ = SOURCES[source]
+        self.requests += 1
+        time.sleep(max(0.0, self.rng.gauss(latency, latency * 0.3)) * self.speed)
+        chunk = self.results(source, rank)[depth * size:(depth + 1) * size]
+        return [{"link": link} for link in chunk if link]
+
+
+def run_baseline(world: World, sources: List[str], titles: List[str]) -> Dict:
+    """The fixed-arithmetic fan-out `_gemini_search_jobs` used before the planner."""
+    domains = [s for s in sources if s != "LinkedIn"]
+    use_linkedin = "LinkedIn" in sources
+    total_sources = len(domains) + (1 if use_linkedin else 0)
+    target_per_source = max(20, 100 // max(1, total_sources))
+    target_per_title = max(5, target_per_source // len(titles[:3]))
+
+    def scrape(source: str, rank: int, limit: int) -> List[dict]:
+        jobs = []
+        for depth in range(SOURCES[source][4]):
+            page = world.page(source, rank, depth)
+            if not page:
+                break
+            jobs.extend(page)
+            if len(jobs) >= limit:
+                break
+            time.sleep(0.5 * world.speed)
+        return jobs[:limit]
+
+    started = time.monotonic()
+    futures = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        if use_linkedin:
+            for rank in range(len(titles[:3])):
+                futures.append(executor.submit(scrape, "LinkedIn", rank, target_per_title * 2))
+        for d in domains:
+            for rank in range(len(titles[:2])):
+                futures.append(executor.submit(scrape, d, rank, target_per_title * 2))
+        seen = set()
+        for f in concurrent.futures.as_completed(futures):
+            seen.update(j["link"] for j in f.result())
+    if len(seen) < 20 and use_linkedin:
+        seen.update(j["link"] for j in scrape("LinkedIn", 0, 50))
+    return {"unique": len(seen), "elapsed": time.monotonic() - started}
+
+
+def run_planner(world: World, stats: YieldStats, sources: List[str], titles: List[str],
+                budget: int, target: int) -> Dict:
+    branches = [Branch(s, t, rank, max_depth=SOURCES[s][4]) for rank, t in enumerate(titles) for s in sources]
+    planner = FanoutPlanner(stats, fetch_budget=budget, target=target, parallelism=10,
+                            page_delay=0.5 * world.speed)
+    started = time.monotonic()
+    plan = planner.run(branches, lambda b, depth: (world.page(b.source, b.rank, depth), False))
+    return {"unique": len(plan["items"]), "elapsed": time.monotonic() - started, "stopped": plan["stopped"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay the search fan-out against synthetic sources.")
+    parser.add_argument("--runs", type=int, default=5, help="measured runs per strategy")
+    parser.add_argument("--warmup", type=int, default=3, help="planner runs used only to build yield history")
+    parser.add_argument("--budget", type=int, default=40, help="planner page-fetch budget")
+    parser.add_argument("--target", type=int, default=100, help="planner unique-job target")
+    parser.add_argument("--speed", type=float, default=0.01, help="latency multiplier (1.0 = real time)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--sources", default=",".join(SOURCES), help="comma-separated subset of sources")
+    args = parser.parse_args()
+
+    sources = [s.strip() for s in args.sources.split(",") if s.strip() in SOURCES]
+    stats = YieldStats(InProcessBackend().namespace("fanout_stats"))
+
+    rows = {"baseline": [], "planner": []}
+    for run in range(args.warmup + args.runs):
+        world = World(args.seed + run, args.speed)
+        res = run_planner(world, stats, sources, TITLES, args.budget, args.target)
+        if run >= args.warmup:
+            rows["planner"].append({**res, "fetches": world.requests})
+    for run in range(args.runs):
+        world = World(args.seed + args.warmup + run, args.speed)
+        res = run_baseline(world, sources, TITLES)
+        rows["baseline"].append({**res, "fetches": world.requests})
+
+    print(f"{len(sources)} sources × {len(TITLES)} titles, {args.runs} runs "
+          f"(planner budget {args.budget}, target {args.target}, warm-up {args.warmup})\n")
+    print(f"{'strategy':<10} {'fetches':>8} {'unique':>8} {'jobs/fetch':>11} {'time (s)':>9}")
+    for name, results in rows.items():
+        fetches = statistics.mean(r["fetches"] for r in results)
+        unique = statistics.mean(r["unique"] for r in results)
+        elapsed = statistics.mean(r["elapsed"] for r in results) / args.speed
+        print(f"{name:<10} {fetches:>8.1f} {unique:>8.1f} {unique / max(1, fetches):>11.2f} {elapsed:>9.1f}")
+
+    print("\nLearned yield (unique jobs per fetch) by source and depth, title rank 0:")
+    for row in stats.snapshot(stats.store):
+        if row["title_rank"] == 0:
+            print(f"  {row['source']:<16} p{row['depth']}  {row['unique_per_fetch']:>5.2f}"
+                  f"  dup {row['duplicate_rate'] if row['duplicate_rate'] is not None else '-':>5}")
+
+
+if __name__ == "__main__":
+    main()
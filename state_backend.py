@@ -0,0 +1,389 @@
+"""
+Sidekick — Shared State Backend
+=========================================
+Session-scoped caches (fetched jobs, applied log, …) used to be module-level
+dicts, so every uvicorn worker saw its own copy. They now live behind a small
+key/value interface with two implementations:
+
+  memory://                 → InProcessBackend  (single process, default)
+  sqlite:///path/state.db   → SQLiteBackend     (WAL; shared by all workers/processes on a host)
+
+Values must be JSON-serialisable. Callers never mutate a value in place;
+read-modify-write goes through `update()`, which is atomic in both backends.
+
+Each namespace can be bounded (`max_entries`, `ttl_seconds`) and, in the
+in-process backend, stored in a compact form through a pack/unpack codec.
+In both backends an entry's age is the time since it was last written (reads
+do not extend it), and the size cap drops the oldest writes first.
+`memory_report()` gives per-namespace entry counts, sizes and evictions.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from job_records import deep_sizeof
+
+_MISSING = object()
+
+
+@dataclass
+class NamespaceConfig:
+    max_entries: Optional[int] = None
+    ttl_seconds: Optional[float] = None
+    pack: Optional[Callable[[Any], Any]] = None
+    unpack: Optional[Callable[[Any], Any]] = None
+
+
+class StateBackend:
+    """Namespaced key/value store. Subclasses implement the five primitives below."""
+
+    name = "abstract"
+    shared = False  # True when other processes see the same data
+
+    def __init__(self):
+        self._configs: Dict[str, NamespaceConfig] = {}
+
+    def configure(self, namespace: str, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                  pack: Optional[Callable[[Any], Any]] = None, unpack: Optional[Callable[[Any], Any]] = None) -> None:
+        """Bound a namespace by entry count / age, and optionally give it a compact in-memory codec."""
+        self._configs[namespace] = NamespaceConfig(max_entries, ttl_seconds, pack, unpack)
+
+    def _config(self, namespace: str) -> NamespaceConfig:
+        return self._configs.get(namespace) or NamespaceConfig()
+
+    def memory_report(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    def update(self, namespace: str, key: str, fn: Callable[[Any], Any], default: Any = None) -> Any:
+        """Atomically replace the value with `fn(current_or_default)` and return the new value."""
+        raise NotImplementedError
+
+    def keys(self, namespace: str) -> List[str]:
+        raise NotImplementedError
+
+    def namespace(self, name: str, **config: Any) -> "Namespace":
+        if config:
+            self.configure(name, **config)
+        return Namespace(self, name)
+
+    def close(self) -> None:
+        pass
+
+
+class Namespace:
+    """Dict-like view over one namespace, so call sites read like the old module-level dicts."""
+
+    def __init__(self, backend: StateBackend, name: str):
+        self.backend = backend
+        self.name = name
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.backend.get(self.name, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.backend.get(self.name, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.backend.set(self.name, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self.backend.delete(self.name, key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.backend.get(self.name, key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.backend.keys(self.name))
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        value = self.get(key, default)
+        self.backend.delete(self.name, key)
+        return value
+
+    def update_item(self, key: str, fn: Callable[[Any], Any], default: Any = None) -> Any:
+        return self.backend.update(self.name, key, fn, default)
+
+
+# ─────────────────────────────────────────────
+#  In-process
+# ─────────────────────────────────────────────
+class InProcessBackend(StateBackend):
+    """Per-namespace LRU dicts guarded by a lock.
+
+    Values are packed/copied on the way in and unpacked/copied on the way out,
+    so behaviour matches the shared backend (no accidental in-place mutation).
+    Entries not written for longer than the namespace TTL, or beyond its size
+    cap (oldest writes first), are evicted, exactly as in SQLiteBackend.
+    """
+
+    name = "memory"
+    shared = False
+
+    def __init__(self):
+        super().__init__()
+        # namespace → OrderedDict[key, (stored_value, written_at)], oldest write first
+        self._data: Dict[str, "OrderedDict[str, tuple]"] = {}
+        self._evictions: Dict[str, int] = {}
+        self._expirations: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def _encode(self, namespace: str, value: Any) -> Any:
+        cfg = self._config(namespace)
+        return cfg.pack(value) if cfg.pack else copy.deepcopy(value)
+
+    def _decode(self, namespace: str, stored: Any) -> Any:
+        cfg = self._config(namespace)
+        return cfg.unpack(stored) if cfg.unpack else copy.deepcopy(stored)
+
+    def _expire(self, namespace: str, ns: "OrderedDict[str, tuple]", now: float) -> None:
+        ttl = self._config(namespace).ttl_seconds
+        if not ttl:
+            return
+        while ns:
+            key, (_, written) = next(iter(ns.items()))
+            if now - written <= ttl:
+                break
+            ns.popitem(last=False)
+            self._expirations[namespace] = self._expirations.get(namespace, 0) + 1
+
+    def _store(self, namespace: str, key: str, stored: Any, now: float) -> None:
+        ns = self._data.setdefault(namespace, OrderedDict())
+        ns[key] = (stored, now)
+        ns.move_to_end(key)
+        self._expire(namespace, ns, now)
+        cap = self._config(namespace).max_entries
+        while cap and len(ns) > cap:
+            ns.popitem(last=False)
+            self._evictions[namespace] = self._evictions.get(namespace, 0) + 1
+
+    def _lookup(self, namespace: str, key: str, now: float) -> Any:
+        ns = self._data.get(namespace)
+        if not ns:
+            return _MISSING
+        self._expire(namespace, ns, now)
+        entry = ns.get(key)
+        # Reads leave the write time (and so the entry's age and eviction order) alone.
+        return _MISSING if entry is None else entry[0]
+
+    def get(self, namespace, key, default=None):
+        with self._lock:
+            stored = self._lookup(namespace, key, time.monotonic())
+            return default if stored is _MISSING else self._decode(namespace, stored)
+
+    def set(self, namespace, key, value):
+        with self._lock:
+            self._store(namespace, key, self._encode(namespace, value), time.monotonic())
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._data.get(namespace, OrderedDict()).pop(key, None)
+
+    def update(self, namespace, key, fn, default=None):
+        with self._lock:
+            now = time.monotonic()
+            stored = self._lookup(namespace, key, now)
+            current = copy.deepcopy(default) if stored is _MISSING else self._decode(namespace, stored)
+            new = fn(current)
+            self._store(namespace, key, self._encode(namespace, new), now)
+            return new
+
+    def keys(self, namespace):
+        with self._lock:
+            ns = self._data.get(namespace)
+            if not ns:
+                return []
+            self._expire(namespace, ns, time.monotonic())
+            return list(ns)
+
+    def memory_report(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {}
+            seen: set = set()  # shared across namespaces: the applied log reuses job strings
+            total = 0
+            # Hold every value list until the end so a freed list's id is never reused within `seen`.
+            values = {name: [v for v, _ in ns.values()] for name, ns in self._data.items()}
+            for name, ns in self._data.items():
+                size = deep_sizeof(values[name], seen)
+                total += size
+                cfg = self._config(name)
+                namespaces[name] = {
+                    "entries": len(ns),
+                    "approx_bytes": size,
+                    "max_entries": cfg.max_entries,
+                    "ttl_seconds": cfg.ttl_seconds,
+                    "evictions": self._evictions.get(name, 0),
+                    "expirations": self._expirations.get(name, 0),
+                }
+            return {"backend": self.name, "approx_bytes": total, "namespaces": namespaces}
+
+
+# ─────────────────────────────────────────────
+#  SQLite (WAL) — shared across processes
+# ─────────────────────────────────────────────
+class SQLiteBackend(StateBackend):
+    """One row per (namespace, key) holding a JSON value.
+
+    WAL mode lets readers proceed while a writer commits; `update()` takes the
+    write lock up front (BEGIN IMMEDIATE) so concurrent read-modify-writes from
+    different workers serialise instead of losing updates.
+    """
+
+    name = "sqlite"
+    shared = True
+
+    # Bounds are enforced by pruning every N writes to a namespace rather than on each write.
+    PRUNE_EVERY = 50
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        super().__init__()
+        self.path = str(Path(path))
+        self._writes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None → we issue BEGIN/COMMIT ourselves.
+            conn = sqlite3.connect(self.path, timeout=self._busy_timeout_ms / 1000, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout={self._busy_timeout_ms}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _fresh_after(self, namespace: str) -> float:
+        ttl = self._config(namespace).ttl_seconds
+        return time.time() - ttl if ttl else 0.0
+
+    def _after_write(self, namespace: str) -> None:
+        with self._lock:
+            n = self._writes[namespace] = self._writes.get(namespace, 0) + 1
+        if n % self.PRUNE_EVERY == 0:
+            self.prune(namespace)
+
+    def prune(self, namespace: str) -> None:
+        """Delete rows older than the namespace TTL and beyond its size cap (oldest writes first)."""
+        cfg = self._config(namespace)
+        conn = self._conn()
+        if cfg.ttl_seconds:
+            conn.execute("DELETE FROM state WHERE namespace=? AND updated_at < ?",
+                         (namespace, self._fresh_after(namespace)))
+        if cfg.max_entries:
+            conn.execute(
+                "DELETE FROM state WHERE namespace=? AND key NOT IN ("
+                " SELECT key FROM state WHERE namespace=? ORDER BY updated_at DESC LIMIT ?)",
+                (namespace, namespace, cfg.max_entries),
+            )
+
+    def get(self, namespace, key, default=None):
+        row = self._conn().execute(
+            "SELECT value FROM state WHERE namespace=? AND key=? AND updated_at >= ?",
+            (namespace, key, self._fresh_after(namespace)),
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, namespace, key, value):
+        self._conn().execute(
+            "INSERT INTO state (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(namespace, key) DO UPDATE SET value=excluded.value, updated_at=excluded.updated_at",
+            (namespace, key, json.dumps(value), time.time()),
+        )
+        self._after_write(namespace)
+
+    def delete(self, namespace, key):
+        self._conn().execute("DELETE FROM state WHERE namespace=? AND key=?", (namespace, key))
+
+    def update(self, namespace, key, fn, default=None):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM state WHERE namespace=? AND key=? AND updated_at >= ?",
+                (namespace, key, self._fresh_after(namespace)),
+            ).fetchone()
+            current = json.loads(row[0]) if row else copy.deepcopy(default)
+            new = fn(current)
+            conn.execute(
+                "INSERT INTO state (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(namespace, key) DO UPDATE SET value=excluded.value, updated_at=excluded.updated_at",
+                (namespace, key, json.dumps(new), time.time()),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._after_write(namespace)
+        return new
+
+    def keys(self, namespace):
+        rows = self._conn().execute(
+            "SELECT key FROM state WHERE namespace=? AND updated_at >= ?",
+            (namespace, self._fresh_after(namespace)),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def memory_report(self) -> Dict[str, Any]:
+        rows = self._conn().execute(
+            "SELECT namespace, COUNT(*), SUM(LENGTH(value)) FROM state GROUP BY namespace"
+        ).fetchall()
+        namespaces = {}
+        for name, count, size in rows:
+            cfg = self._config(name)
+            namespaces[name] = {
+                "entries": count,
+                "approx_bytes": size or 0,
+                "max_entries": cfg.max_entries,
+                "ttl_seconds": cfg.ttl_seconds,
+            }
+        file_bytes = sum(os.path.getsize(p) for p in (self.path, self.path + "-wal") if os.path.exists(p))
+        return {"backend": self.name, "file_bytes": file_bytes, "namespaces": namespaces}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def make_backend(url: Optional[str]) -> StateBackend:
+    """Build a backend from a URL: `memory://` (default) or `sqlite:///relative/or/absolute.db`."""
+    url = (url or "memory://").strip()
+    if url.startswith("memory://"):
+        return InProcessBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported state backend URL: {url}")
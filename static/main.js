@@ -1,4 +1,6 @@
 const $ = id => document.getElementById(id);
+// Optimised URL for a /static path when the page was built by build_assets.py (window.SK_ASSETS)
+const asset = path => (window.SK_ASSETS && window.SK_ASSETS[path]) || path;
 const esc = s => String(s).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
 
 let S = { sid: null };
@@ -75,6 +77,25 @@ async function initSession() {
   if ($('sessionBadge')) $('sessionBadge').textContent = `Session: ${sid.slice(0, 8)}`;
   loadProfile();
   renderSourcesGrid();
+  loadSavedJobs();
+}
+
+// Results from an earlier or background-prefetched search show at once, before any new search.
+async function loadSavedJobs() {
+  try {
+    const res = await fetch(`/api/jobs/${S.sid}`);
+    if (!res.ok) return;
+    const jobs = await res.json();
+    if (!jobs.length || _jobs.length) return;
+    _jobs = jobs;
+    _selectedIds.clear();
+    updateSelectionBar();
+    $('resultsContainer').classList.remove('hidden');
+    renderJobCards();
+    $('searchStatusText').textContent = `Showing ${_jobs.length} jobs from your saved search.`;
+  } catch (err) {
+    console.error(err);
+  }
 }
 
 const FIELDS = [
@@ -216,7 +237,7 @@ function renderSourcesGrid() {
             <input type="checkbox" value="${s.id}" class="peer sr-only" onchange="toggleSource(this)">
             <div class="px-4 py-3 bg-white border border-gray-200 dark:bg-gray-800 dark:border-gray-700 rounded-lg text-sm font-medium text-gray-700 dark:text-gray-300 hover:bg-gray-50 dark:hover:bg-gray-700 peer-checked:border-primary peer-checked:bg-blue-50/50 dark:peer-checked:bg-blue-900/40 peer-checked:text-primary transition-all flex flex-col items-center gap-2 text-center h-full justify-center">
                 <div class="bg-white p-1 rounded-md shadow-sm h-10 w-10 flex items-center justify-center">
-                    <img src="/static/images/logos/${s.img}" class="h-8 w-auto object-contain max-w-[32px]" alt="${s.id} Logo" onerror="this.onerror=null; this.src='/static/logowithtext.png';">
+                    <img src="${asset(`/static/images/logos/${s.img}`)}" class="h-8 w-auto object-contain max-w-[32px]" alt="${s.id} Logo" onerror="this.onerror=null; this.src='/static/logowithtext.png';">
                 </div>
                 <span class="mt-1">${s.id}</span>
             </div>
@@ -297,6 +318,65 @@ function clearSelection() {
   updateSelectionBar();
 }
 
+function renderRolePills(rolesList, roles) {
+  rolesList.innerHTML = '';
+  roles.forEach(role => {
+    const pill = document.createElement('div');
+    pill.className = 'px-4 py-2 bg-gray-100 dark:bg-gray-700 hover:bg-gray-200 dark:hover:bg-gray-600 border border-gray-200 dark:border-gray-600 rounded-full text-sm font-medium text-gray-800 dark:text-gray-200 cursor-pointer transition-colors';
+    pill.textContent = role;
+    pill.title = "Click to set as Base Role";
+    pill.addEventListener('click', async () => {
+      navigator.clipboard.writeText(role);
+      toast(`Copied "${role}"`);
+
+      // Auto-fill the search input
+      if ($('baseRole')) {
+        $('baseRole').value = role;
+        // Save to session immediately
+        const fd = new FormData();
+        fd.append("base_job_role", role);
+        await fetch(`/api/session/${S.sid}`, { method: "POST", body: fd });
+
+        toast(`Set "${role}" as your Search Target.`, 'info');
+      }
+    });
+    rolesList.appendChild(pill);
+  });
+}
+
+// Local suggestions render instantly; Gemini's refinement replaces them if it finishes in time.
+async function refineRolePills(rolesList, taskId) {
+  for (let i = 0; i < 30; i++) {
+    await new Promise(r => setTimeout(r, 2000));
+    const res = await fetch(`/api/tasks/${taskId}`);
+    if (!res.ok) return;
+    const task = await res.json();
+    if (task.status === 'done') {
+      const roles = (task.result && task.result.roles) || [];
+      if (roles.length) renderRolePills(rolesList, roles);
+      return;
+    }
+    if (task.status === 'failed' || task.status === 'cancelled') return;
+  }
+}
+
+// Searches run as background tasks: submit, then poll until the task settles.
+async function runSearchTask() {
+  const submit = await fetch(`/api/tasks/search/${S.sid}`, { method: 'POST' });
+  if (!submit.ok) throw new Error("Search failed");
+  const { task_id } = await submit.json();
+
+  while (true) {
+    await new Promise(r => setTimeout(r, 1000));
+    const res = await fetch(`/api/tasks/${task_id}`);
+    if (!res.ok) throw new Error("Search failed");
+    const task = await res.json();
+    if (task.status === 'done') return task.result;
+    if (task.status === 'failed' || task.status === 'cancelled') throw new Error(task.error || `Search ${task.status}`);
+    $('searchStatusText').textContent = `Scraping active jobs... ${Math.round(task.progress * 100)}%`;
+  }
+}
+
 async function runSearch(e) {
   if (e) e.preventDefault();
 
@@ -326,9 +406,7 @@ async function runSearch(e) {
   $('jobCards').innerHTML = '<div class="col-span-full py-12 flex justify-center"><div class="animate-pulse flex flex-col items-center"><div class="h-8 w-8 bg-primary rounded-full mb-4"></div><div class="h-4 w-48 bg-gray-200 rounded"></div></div></div>';
 
   try {
-    const res = await fetch(`/api/jobs/search/${S.sid}`, { method: 'POST' });
-    if (!res.ok) throw new Error("Search failed");
-    const data = await res.json();
+    const data = await runSearchTask();
 
     _jobs = data.jobs || [];
     _selectedIds.clear();
@@ -441,6 +519,7 @@ if (suggestFormWeb) {
     try {
       const formData = new FormData();
       formData.append('file', fileInput.files[0]);
+      formData.append('refine', 'true');
 
       // Pass the current search role as context if it exists
       const baseRoleInput = $('baseRole');
@@ -465,29 +544,8 @@ if (suggestFormWeb) {
         throw new Error("No roles could be identified.");
       }
 
-      // Render Roles
-      roles.forEach(role => {
-        const pill = document.createElement('div');
-        pill.className = 'px-4 py-2 bg-gray-100 dark:bg-gray-700 hover:bg-gray-200 dark:hover:bg-gray-600 border border-gray-200 dark:border-gray-600 rounded-full text-sm font-medium text-gray-800 dark:text-gray-200 cursor-pointer transition-colors';
-        pill.textContent = role;
-        pill.title = "Click to set as Base Role";
-        pill.addEventListener('click', async () => {
-          navigator.clipboard.writeText(role);
-          toast(`Copied "${role}"`);
-
-          // Auto-fill the search input
-          if ($('baseRole')) {
-            $('baseRole').value = role;
-            // Save to session immediately
-            const fd = new FormData();
-            fd.append("base_job_role", role);
-            await fetch(`/api/session/${S.sid}`, { method: "POST", body: fd });
-
-            toast(`Set "${role}" as your Search Target.`, 'info');
-          }
-        });
-        rolesList.appendChild(pill);
-      });
+      renderRolePills(rolesList, roles);
+      if (data.refine_task_id) refineRolePills(rolesList, data.refine_task_id);
 
       resultsContainer.classList.remove('hidden');
       toast('Roles successfully extracted!', 'success');
@@ -0,0 +1,406 @@
+"""
+Sidekick — Durable Background Tasks
+=========================================
+Long-running work (multi-source searches, bulk AI generation) is submitted
+here instead of being executed inside a request handler:
+
+  1. submit()              → row persisted in SQLite, task id returned at once
+  2. worker threads        → claim the highest-priority queued row and run it
+  3. GET /api/tasks/{id}   → status, progress and result read back from the row
+
+Rows are claimed with a lease. A row left 'running' by a process that died is
+re-queued once its lease expires, so work survives restarts. Finished rows
+(done / failed / cancelled) are deleted `retention_seconds` after they finish,
+since each one carries its full result.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+# Lower value runs first.
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+TERMINAL_STATUSES = {STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED}
+
+TaskBase = declarative_base()
+
+
+class DBTask(TaskBase):
+    __tablename__ = "tasks"
+    id = Column(String, primary_key=True, index=True)
+    kind = Column(String, index=True)
+    session_id = Column(String, index=True, default="")
+    priority = Column(Integer, index=True, default=PRIORITY_NORMAL)
+    status = Column(String, index=True, default=STATUS_QUEUED)
+    payload_json = Column(Text, default="{}")
+    result_json = Column(Text, default="")
+    error = Column(Text, default="")
+    progress = Column(Float, default=0.0)
+    message = Column(String, default="")
+    cancel_requested = Column(Boolean, default=False)
+    attempts = Column(Integer, default=0)
+    lease_owner = Column(String, default="")
+    lease_expires = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class TaskCancelled(Exception):
+    """Raised inside a handler to stop a task whose cancellation was requested."""
+
+
+class TaskContext:
+    """Handed to every task handler for progress reporting and cancellation checks."""
+
+    def __init__(self, queue: "TaskQueue", task_id: str, session_id: str):
+        self.queue = queue
+        self.task_id = task_id
+        self.session_id = session_id
+
+    def report(self, progress: float, message: str = "") -> None:
+        """Persist progress (0.0–1.0) and renew the lease."""
+        self.queue._update_running(self.task_id, progress=max(0.0, min(1.0, progress)), message=message)
+
+    def cancelled(self) -> bool:
+        return self.queue._cancel_requested(self.task_id)
+
+    def check_cancelled(self) -> None:
+        if self.cancelled():
+            raise TaskCancelled(self.task_id)
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.utcnow()
+
+
+def _iso(dt: Optional[datetime.datetime]) -> Optional[str]:
+    return dt.isoformat() + "Z" if dt else None
+
+
+class TaskQueue:
+    """SQLite-backed priority queue drained by a bounded pool of worker threads."""
+
+    def __init__(
+        self,
+        engine,
+        workers: int = 2,
+        poll_interval: float = 0.5,
+        lease_seconds: int = 60,
+        max_attempts: int = 3,
+        retention_seconds: float = 24 * 3600,
+    ):
+        TaskBase.metadata.create_all(bind=engine)
+        self._Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self._handlers: Dict[str, Callable[[Dict[str, Any], TaskContext], Any]] = {}
+        self._workers = max(1, workers)
+        self._poll_interval = poll_interval
+        self._lease = datetime.timedelta(seconds=lease_seconds)
+        self._max_attempts = max_attempts
+        self._retention = datetime.timedelta(seconds=retention_seconds)
+        self._next_purge = 0.0
+        self._owner = f"worker-{uuid.uuid4().hex[:12]}"
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._running: set[str] = set()
+        self._running_lock = threading.Lock()
+
+    # ── Registration / lifecycle ─────────────────
+    def register(self, kind: str, handler: Callable[[Dict[str, Any], TaskContext], Any]) -> None:
+        """Register `handler(payload, ctx)` for a task kind. Its return value must be JSON-serialisable."""
+        self._handlers[kind] = handler
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self._workers):
+            t = threading.Thread(target=self._worker_loop, name=f"sidekick-task-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        t = threading.Thread(target=self._maintenance_loop, name="sidekick-task-lease", daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout=timeout)
+        self._threads = []
+
+    # ── Public API ───────────────────────────────
+    def submit(self, kind: str, payload: Dict[str, Any], session_id: str = "", priority: int = PRIORITY_NORMAL) -> str:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown task kind: {kind}")
+        task_id = str(uuid.uuid4())
+        db = self._Session()
+        try:
+            db.add(DBTask(
+                id=task_id,
+                kind=kind,
+                session_id=session_id or "",
+                priority=priority,
+                status=STATUS_QUEUED,
+                payload_json=json.dumps(payload),
+            ))
+            db.commit()
+        finally:
+            db.close()
+        self._wake.set()
+        return task_id
+
+    def get(self, task_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        db = self._Session()
+        try:
+            task = db.query(DBTask).filter(DBTask.id == task_id).first()
+            return self._to_dict(task, include_result) if task else None
+        finally:
+            db.close()
+
+    def list_for_session(self, session_id: str, limit: int = 20) -> list[Dict[str, Any]]:
+        db = self._Session()
+        try:
+            rows = (db.query(DBTask)
+                    .filter(DBTask.session_id == session_id)
+                    .order_by(DBTask.created_at.desc())
+                    .limit(limit)
+                    .all())
+            return [self._to_dict(t, include_result=False) for t in rows]
+        finally:
+            db.close()
+
+    def count_active(self, kind: str, max_priority: int = PRIORITY_LOW) -> int:
+        """Queued or running tasks of `kind` at `max_priority` or more urgent."""
+        db = self._Session()
+        try:
+            return (db.query(DBTask)
+                    .filter(DBTask.kind == kind, DBTask.status.in_((STATUS_QUEUED, STATUS_RUNNING)),
+                            DBTask.priority <= max_priority)
+                    .count())
+        finally:
+            db.close()
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancel a queued task immediately; flag a running one so its handler stops at the next check."""
+        db = self._Session()
+        try:
+            now = _utcnow()
+            n = (db.query(DBTask)
+                 .filter(DBTask.id == task_id, DBTask.status == STATUS_QUEUED)
+                 .update({"status": STATUS_CANCELLED, "cancel_requested": True, "finished_at": now},
+                         synchronize_session=False))
+            if not n:
+                n = (db.query(DBTask)
+                     .filter(DBTask.id == task_id, DBTask.status == STATUS_RUNNING)
+                     .update({"cancel_requested": True}, synchronize_session=False))
+            db.commit()
+            return bool(n)
+        finally:
+            db.close()
+
+    # ── Worker internals ─────────────────────────
+    def _claim_next(self) -> Optional[DBTask]:
+        db = self._Session()
+        try:
+            kinds = list(self._handlers)
+            candidates = (db.query(DBTask.id)
+                          .filter(DBTask.status == STATUS_QUEUED, DBTask.kind.in_(kinds))
+                          .order_by(DBTask.priority.asc(), DBTask.created_at.asc())
+                          .limit(5)
+                          .all())
+            now = _utcnow()
+            for (task_id,) in candidates:
+                # Conditional update: only one worker (in any process) wins the row.
+                n = (db.query(DBTask)
+                     .filter(DBTask.id == task_id, DBTask.status == STATUS_QUEUED)
+                     .update({
+                         "status": STATUS_RUNNING,
+                         "lease_owner": self._owner,
+                         "lease_expires": now + self._lease,
+                         "started_at": now,
+                         "attempts": DBTask.attempts + 1,
+                     }, synchronize_session=False))
+                db.commit()
+                if n:
+                    task = db.query(DBTask).filter(DBTask.id == task_id).first()
+                    db.expunge(task)
+                    return task
+            return None
+        finally:
+            db.close()
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                task = self._claim_next()
+            except Exception as e:
+                print(f"Task claim error: {e}")
+                task = None
+            if task is None:
+                self._wake.wait(self._poll_interval)
+                self._wake.clear()
+                continue
+            self._run(task)
+
+    def _run(self, task: DBTask) -> None:
+        with self._running_lock:
+            self._running.add(task.id)
+        ctx = TaskContext(self, task.id, task.session_id)
+        try:
+            payload = json.loads(task.payload_json or "{}")
+            result = self._handlers[task.kind](payload, ctx)
+            if ctx.cancelled():
+                raise TaskCancelled(task.id)
+            self._finish(task.id, STATUS_DONE, result=result)
+        except TaskCancelled:
+            self._finish(task.id, STATUS_CANCELLED)
+        except Exception as e:
+            print(f"Task {task.id} ({task.kind}) failed: {e}")
+            traceback.print_exc()
+            self._finish(task.id, STATUS_FAILED, error=str(e))
+        finally:
+            with self._running_lock:
+                self._running.discard(task.id)
+
+    def _finish(self, task_id: str, status: str, result: Any = None, error: str = "") -> None:
+        values: Dict[str, Any] = {
+            "status": status,
+            "error": error,
+            "finished_at": _utcnow(),
+            "lease_owner": "",
+            "lease_expires": None,
+        }
+        if status == STATUS_DONE:
+            values["progress"] = 1.0
+            values["result_json"] = json.dumps(result)
+        db = self._Session()
+        try:
+            (db.query(DBTask)
+             .filter(DBTask.id == task_id, DBTask.lease_owner == self._owner)
+             .update(values, synchronize_session=False))
+            db.commit()
+        finally:
+            db.close()
+
+    def _update_running(self, task_id: str, **values: Any) -> None:
+        values["lease_expires"] = _utcnow() + self._lease
+        db = self._Session()
+        try:
+            (db.query(DBTask)
+             .filter(DBTask.id == task_id, DBTask.lease_owner == self._owner)
+             .update(values, synchronize_session=False))
+            db.commit()
+        finally:
+            db.close()
+
+    def _cancel_requested(self, task_id: str) -> bool:
+        db = self._Session()
+        try:
+            row = db.query(DBTask.cancel_requested).filter(DBTask.id == task_id).first()
+            return bool(row and row[0])
+        finally:
+            db.close()
+
+    def _maintenance_loop(self) -> None:
+        """Renew leases of our running tasks, re-queue rows whose owner disappeared, purge old rows."""
+        interval = max(1.0, self._lease.total_seconds() / 3)
+        while not self._stop.wait(interval):
+            try:
+                self._renew_leases()
+                self._requeue_expired()
+                if time.monotonic() >= self._next_purge:
+                    self._next_purge = time.monotonic() + 600
+                    self._purge_finished()
+            except Exception as e:
+                print(f"Task maintenance error: {e}")
+
+    def _renew_leases(self) -> None:
+        with self._running_lock:
+            ids = list(self._running)
+        if not ids:
+            return
+        db = self._Session()
+        try:
+            (db.query(DBTask)
+             .filter(DBTask.id.in_(ids), DBTask.lease_owner == self._owner)
+             .update({"lease_expires": _utcnow() + self._lease}, synchronize_session=False))
+            db.commit()
+        finally:
+            db.close()
+
+    def _purge_finished(self) -> int:
+        """Delete finished rows older than the retention period; returns how many went."""
+        db = self._Session()
+        try:
+            deleted = (db.query(DBTask)
+                       .filter(DBTask.status.in_(TERMINAL_STATUSES), DBTask.finished_at < _utcnow() - self._retention)
+                       .delete(synchronize_session=False))
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def _requeue_expired(self) -> None:
+        db = self._Session()
+        try:
+            now = _utcnow()
+            stale = (db.query(DBTask)
+                     .filter(DBTask.status == STATUS_RUNNING, DBTask.lease_expires < now)
+                     .all())
+            for task in stale:
+                if task.cancel_requested:
+                    task.status = STATUS_CANCELLED
+                    task.finished_at = now
+                elif task.attempts >= self._max_attempts:
+                    task.status = STATUS_FAILED
+                    task.error = task.error or "Worker lost too many times"
+                    task.finished_at = now
+                else:
+                    task.status = STATUS_QUEUED
+                task.lease_owner = ""
+                task.lease_expires = None
+            db.commit()
+            if stale:
+                self._wake.set()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _to_dict(task: DBTask, include_result: bool = True) -> Dict[str, Any]:
+        out = {
+            "task_id": task.id,
+            "kind": task.kind,
+            "session_id": task.session_id,
+            "priority": task.priority,
+            "status": task.status,
+            "progress": round(task.progress or 0.0, 3),
+            "message": task.message or "",
+            "error": task.error or "",
+            "attempts": task.attempts or 0,
+            "created_at": _iso(task.created_at),
+            "started_at": _iso(task.started_at),
+            "finished_at": _iso(task.finished_at),
+        }
+        if include_result and task.status == STATUS_DONE and task.result_json:
+            out["result"] = json.loads(task.result_json)
+        return out
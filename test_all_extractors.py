@@ -1,35 +1,24 @@
-import sys
-import os
+import argparse
 
-from scraper_pipeline.extractors.naukri import extract_naukri_jobs
-from scraper_pipeline.extractors.linkedin import extract_linkedin_jobs
-from scraper_pipeline.extractors.indeed import extract_indeed_jobs
-from scraper_pipeline.extractors.glassdoor import extract_glassdoor_jobs
-from scraper_pipeline.extractors.hirist import extract_hirist_jobs
-from scraper_pipeline.extractors.cutshort import extract_cutshort_jobs
-from scraper_pipeline.extractors.wellfound import extract_wellfound_jobs
-from scraper_pipeline.extractors.apna import extract_apna_jobs
-from scraper_pipeline.extractors.workindia import extract_workindia_jobs
-from scraper_pipeline.extractors.careersites import extract_careersites_jobs
-
-def test_extractor(name, func, keyword="Software Engineer", location="Pune"):
-    print(f"\n[{name}] Testing...")
-    try:
-        jobs = func(keyword, location)
-        print(f"[{name}] Done. Found {len(jobs)} jobs.")
-        for j in jobs[:2]:
-            print(f"  - {j.get('raw_title', 'No Title')} @ {j.get('raw_company', 'No Company')}")
-    except Exception as e:
-        print(f"[{name}] Error: {e}")
+from scraper_pipeline import format_report, run_extractors
+from scraper_pipeline.extractors import EXTRACTORS
 
 if __name__ == "__main__":
-    test_extractor("Naukri", extract_naukri_jobs)
-    test_extractor("LinkedIn", extract_linkedin_jobs)
-    test_extractor("Indeed", extract_indeed_jobs)
-    test_extractor("Glassdoor", extract_glassdoor_jobs)
-    test_extractor("Hirist", extract_hirist_jobs)
-    test_extractor("Cutshort", extract_cutshort_jobs)
-    test_extractor("Wellfound", extract_wellfound_jobs)
-    test_extractor("Apna", extract_apna_jobs)
-    test_extractor("WorkIndia", extract_workindia_jobs)
-    test_extractor("CareerSites", extract_careersites_jobs)
+    parser = argparse.ArgumentParser(description="Run every job extractor concurrently and report yield per source.")
+    parser.add_argument("--keyword", default="Software Engineer")
+    parser.add_argument("--location", default="Pune")
+    parser.add_argument("--only", default="", help=f"comma-separated subset of: {', '.join(EXTRACTORS)}")
+    parser.add_argument("--limit", type=int, default=None, help="max jobs per source")
+    parser.add_argument("--time-budget", type=float, default=None, help="seconds per source (overrides each source's default)")
+    args = parser.parse_args()
+
+    names = [n.strip().lower() for n in args.only.split(",") if n.strip()] or list(EXTRACTORS)
+    settings = {n: {"time_budget": args.time_budget} for n in names} if args.time_budget else None
+
+    reports = run_extractors(args.keyword, args.location, names=names, limit=args.limit, settings=settings)
+    for r in reports:
+        print(f"\n[{r['source']}] Found {r['count']} jobs.")
+        for j in r["jobs"][:2]:
+            print(f"  - {j.get('raw_title') or 'No Title'} @ {j.get('raw_company') or 'No Company'}")
+    print()
+    print(format_report(reports))